@@ -0,0 +1,83 @@
+"""
+11kV hourly load forecasting pipeline for the Al-Khabourah (KHBR01) feeders.
+
+Extracted from ``11kV_ML_Pipeline.ipynb``. Public names are resolved lazily
+so that ``import load_forecasting`` does not import pandas, XGBoost or any
+plotting/report library until a stage actually needs it.
+"""
+
+import importlib
+
+__version__ = "0.1.0"
+
+_LAZY_EXPORTS = {
+    'TimeSeriesDataLoader': 'data',
+    'load_and_merge_datasets': 'data',
+    'standardize_time_format': 'data',
+    'check_missing_hours': 'data',
+    'reindex_hourly': 'data',
+    'stream_merge_readings': 'data',
+    'screen_readings': 'quality',
+    'mask_flagged': 'quality',
+    'quality_gate': 'quality',
+    'FeatureEngineer': 'features',
+    'build_features': 'features',
+    'build_feature_matrix': 'features',
+    'OnlineFeatureState': 'features',
+    'impute_missing_values': 'features',
+    'impute_gaps': 'features',
+    'fill_gaps': 'features',
+    'select_feature_columns': 'features',
+    'add_weather_features': 'weather',
+    'load_frame': 'storage',
+    'save_frame': 'storage',
+    'load_matrix': 'storage',
+    'FeatureMatrix': 'matrix',
+    'StageCache': 'cache',
+    'run_pipeline': 'pipeline',
+    'calculate_metrics': 'training',
+    'train_xgboost': 'training',
+    'train_xgboost_matrix': 'training',
+    'cross_validate_matrix': 'training',
+    'compare_models': 'training',
+    'parallel_compare_models': 'training',
+    'parallel_cross_validate': 'training',
+    'load_model': 'inference',
+    'ModelBundle': 'bundle',
+    'needs_scaling': 'bundle',
+    'DirectMultiHorizonForecaster': 'horizon',
+    'GlobalFeederModel': 'global_model',
+    'FeederLimits': 'alerts',
+    'evaluate_overloads': 'alerts',
+    'overload_alerts': 'alerts',
+    'lttb': 'figures',
+    'render_figures': 'figures',
+    'IEEEPaperBuilder': 'paper',
+    'collect_paper_results': 'paper',
+    'render_papers': 'paper',
+    'run_benchmarks': 'benchmark',
+    'compare_to_baseline': 'benchmark',
+    'ScadaProfile': 'synthetic',
+    'write_scada_exports': 'synthetic',
+    'successive_halving': 'tuning',
+    'walk_forward': 'backtest',
+    'pinball_loss': 'intervals',
+    'interval_scores': 'intervals',
+    'conformal_offsets': 'intervals',
+    'calculate_interval_metrics': 'intervals',
+    'bootstrap_metrics': 'significance',
+    'diebold_mariano': 'significance',
+    'pairwise_comparison': 'significance',
+    'StatisticalValidityCritic': 'critics',
+}
+
+__all__ = sorted(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,261 @@
+# ============================================================
+# SCALING BENCHMARKS
+# ============================================================
+"""
+Wall time, peak RSS and throughput of every pipeline stage at synthetic
+substation sizes.
+
+Each case streams two raw NB 11kV exports from the synthetic SCADA
+generator (``synthetic.write_scada_exports`` with the default profile) and
+times, in order:
+
+* merge    - ``load_and_merge_datasets`` on the two raw exports
+* weather  - ``add_weather_features``
+* impute   - ``impute_readings``
+* features - ``build_features`` for the first feeder (on imputed readings)
+* train    - ``train_xgboost_matrix`` on the training split (``BENCH_TREES`` trees)
+* predict  - features from the merged readings plus ``ModelBundle.predict``
+  over the whole history (``predict_from_readings`` with the case's lags)
+
+Cases sweep one axis at a time around the first value of each (years,
+feeders, lag/window set), so a grid of 4 x 4 x 3 values is 1 + 3 + 3 + 2
+cases rather than 48. Every case runs in a fresh process so one case's heap
+does not inflate the next one's RSS; within a case the kernel's peak-RSS
+mark is reset before each stage (``/proc/self/clear_refs``), so
+``peak_rss_mb`` is the stage's own high-water mark. Where that is not
+available the peak is process-wide and reported as such.
+
+``compare_to_baseline`` flags stages that got slower or bigger than a stored
+results file by more than ``tolerance`` (and an absolute floor, so that
+millisecond stages do not flag on noise).
+"""
+
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from .config import (BENCH_FEATURE_SETS, BENCH_FEEDERS, BENCH_MIN_DELTA_MB,
+                     BENCH_MIN_DELTA_SECONDS, BENCH_START, BENCH_TOLERANCE, BENCH_TREES,
+                     BENCH_YEARS, DATE_FORMAT_INPUT, TEST_SIZE, TIME_COLUMN, XGBOOST_PARAMS)
+from .synthetic import feeder_name, write_scada_exports
+from .telemetry import peak_rss_mb, reset_peak_rss, rss_mb
+
+RESULTS_FORMAT = "load_forecasting.benchmark"
+RESULTS_VERSION = 1
+
+BENCH_STAGES = ['merge', 'weather', 'impute', 'features', 'train', 'predict']
+METRICS = {'seconds': BENCH_MIN_DELTA_SECONDS, 'peak_rss_mb': BENCH_MIN_DELTA_MB}
+
+
+# ------------------------------------------------------------
+# Measurement
+# ------------------------------------------------------------
+
+def measure(fn, rows: int):
+    """Run ``fn`` once; returns ``(result, metrics)`` with wall time, peak RSS and rows/s."""
+    gc.collect()
+    rss_before = rss_mb()
+    stage_scoped = reset_peak_rss()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = peak_rss_mb()
+    return result, {
+        'seconds': round(seconds, 4),
+        'peak_rss_mb': round(peak, 1),
+        'rss_growth_mb': None if rss_before is None else round(peak - rss_before, 1),
+        'peak_scope': 'stage' if stage_scoped else 'process',
+        'rows': rows,
+        'rows_per_s': round(rows / seconds, 1) if seconds > 0 else None,
+    }
+
+
+# ------------------------------------------------------------
+# Cases
+# ------------------------------------------------------------
+
+def case_name(years: float, feeders: int, feature_set: str) -> str:
+    return f"{years:g}y-{feeders}f-{feature_set}"
+
+
+def benchmark_cases(years: list = None, feeders: list = None, feature_sets: list = None) -> list:
+    """One-axis-at-a-time sweep around the first value of each axis."""
+    years = list(BENCH_YEARS if years is None else years)
+    feeders = list(BENCH_FEEDERS if feeders is None else feeders)
+    feature_sets = list(BENCH_FEATURE_SETS if feature_sets is None else feature_sets)
+    base = {'years': years[0], 'feeders': feeders[0], 'feature_set': feature_sets[0]}
+    cases = [base]
+    cases += [{**base, 'years': value} for value in years[1:]]
+    cases += [{**base, 'feeders': value} for value in feeders[1:]]
+    cases += [{**base, 'feature_set': value} for value in feature_sets[1:]]
+    return cases
+
+
+def run_case(years: float, feeders: int, feature_set: str, workdir: str,
+             stages: list = None, trees: int = BENCH_TREES) -> dict:
+    """Generate one case's data under ``workdir`` and measure each stage."""
+    # Imported here so that the train stage does not time the import
+    import xgboost  # noqa: F401
+
+    from .bundle import ModelBundle
+    from .data import TimeSeriesDataLoader, load_and_merge_datasets
+    from .features import build_features, impute_readings, select_feature_columns
+    from .matrix import FeatureMatrix
+    from .training import train_xgboost_matrix
+    from .weather import add_weather_features
+
+    stages = list(BENCH_STAGES if stages is None else stages)
+    lags = BENCH_FEATURE_SETS[feature_set]['lags']
+    windows = BENCH_FEATURE_SETS[feature_set]['windows']
+    params = {**XGBOOST_PARAMS, 'n_estimators': trees}
+
+    setup_start = time.perf_counter()
+    paths = [os.path.join(workdir, f"raw_{part}.csv") for part in (1, 2)]
+    n_rows = write_scada_exports(paths, int(round(years * 8760)), feeders, BENCH_START)['rows']
+    target_col = feeder_name(1)
+    setup_seconds = time.perf_counter() - setup_start
+
+    results = {}
+    state = {}
+
+    def stage(name, fn, rows=n_rows):
+        # Later stages need earlier outputs even when those are not measured
+        if name in stages:
+            state[name], results[name] = measure(fn, rows)
+        else:
+            state[name] = fn()
+        return state[name]
+
+    # The stages print progress like the CLI; keep the benchmark output to the table
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = TimeSeriesDataLoader(time_column=TIME_COLUMN, date_format=DATE_FORMAT_INPUT)
+        merged = stage('merge', lambda: load_and_merge_datasets(paths[0], paths[1], loader))
+        if 'weather' in stages:
+            stage('weather', lambda: add_weather_features(merged))
+            state.pop('weather')
+        imputed = stage('impute', lambda: impute_readings(merged))
+        needs_model = 'train' in stages or 'predict' in stages
+        if 'features' in stages or needs_model:
+            features = stage('features', lambda: build_features(merged, target_col, lags,
+                                                                windows, imputed=imputed))
+        if needs_model:
+            feature_columns = select_feature_columns(features, target_col)
+            fm = FeatureMatrix.from_frame(features, feature_columns, target_col).observed()
+            train, _ = fm.split(TEST_SIZE)
+            model = stage('train', lambda: train_xgboost_matrix(train, None, params),
+                          rows=train.n_rows)
+            bundle = ModelBundle(model, feature_columns, target_col)
+        if 'predict' in stages:
+            stage('predict', lambda: bundle.predict(
+                build_features(merged, target_col, lags, windows)[feature_columns]
+                .to_numpy(dtype=np.float64)))
+
+    for path in paths:
+        os.remove(path)
+    return {'case': case_name(years, feeders, feature_set), 'years': years,
+            'feeders': feeders, 'feature_set': feature_set, 'lags': lags, 'windows': windows,
+            'rows': n_rows, 'setup_seconds': round(setup_seconds, 2), 'stages': results}
+
+
+def _run_case_isolated(case: dict, workdir: str, stages: list, trees: int) -> dict:
+    """``run_case`` in a fresh spawned process."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_case, case['years'], case['feeders'], case['feature_set'],
+                           workdir, stages, trees).result()
+
+
+def environment() -> dict:
+    import xgboost
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'xgboost': xgboost.__version__,
+    }
+
+
+def run_benchmarks(cases: list, workdir: str = None, stages: list = None,
+                   trees: int = BENCH_TREES, isolate: bool = True) -> dict:
+    """Run every case (each in its own process unless ``isolate=False``)."""
+    import tempfile
+
+    results = {'format': RESULTS_FORMAT, 'version': RESULTS_VERSION,
+               'created': datetime.datetime.now().isoformat(timespec='seconds'),
+               'environment': environment(), 'trees': trees, 'cases': []}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for case in cases:
+            name = case_name(case['years'], case['feeders'], case['feature_set'])
+            print(f"⏱️ {name} ...", flush=True)
+            if isolate:
+                record = _run_case_isolated(case, tmp, stages, trees)
+            else:
+                record = run_case(case['years'], case['feeders'], case['feature_set'], tmp,
+                                  stages, trees)
+            results['cases'].append(record)
+            print("   " + ", ".join(f"{stage} {m['seconds']:.2f}s/{m['peak_rss_mb']:.0f}MB"
+                                    for stage, m in record['stages'].items()))
+    return results
+
+
+def results_table(results: dict) -> pd.DataFrame:
+    """One row per (case, stage)."""
+    rows = [{'Case': record['case'], 'Stage': stage, 'Rows': metrics['rows'],
+             'Seconds': metrics['seconds'], 'Peak_RSS_MB': metrics['peak_rss_mb'],
+             'RSS_Growth_MB': metrics['rss_growth_mb'], 'Rows_per_s': metrics['rows_per_s']}
+            for record in results['cases'] for stage, metrics in record['stages'].items()]
+    return pd.DataFrame(rows)
+
+
+def save_results(results: dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        results = json.load(f)
+    if not isinstance(results, dict) or results.get('format') != RESULTS_FORMAT:
+        raise ValueError(f"{path} is not a benchmark results file "
+                         f"(python -m load_forecasting bench writes one)")
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict,
+                        tolerance: float = BENCH_TOLERANCE) -> pd.DataFrame:
+    """
+    Stage metrics next to the baseline's for every (case, stage) in both.
+    ``Regression`` is set where the metric grew by more than ``tolerance``
+    (relative) and by more than the metric's absolute floor.
+    """
+    reference = {(record['case'], stage): metrics for record in baseline['cases']
+                 for stage, metrics in record['stages'].items()}
+    rows = []
+    for record in results['cases']:
+        for stage, metrics in record['stages'].items():
+            before = reference.get((record['case'], stage))
+            if before is None:
+                continue
+            for metric, floor in METRICS.items():
+                old, new = before[metric], metrics[metric]
+                ratio = new / old if old else np.nan
+                rows.append({'Case': record['case'], 'Stage': stage, 'Metric': metric,
+                             'Baseline': old, 'Current': new, 'Ratio': round(ratio, 3),
+                             'Regression': bool(new > old * (1 + tolerance)
+                                                and new - old > floor)})
+    return pd.DataFrame(rows, columns=['Case', 'Stage', 'Metric', 'Baseline', 'Current',
+                                       'Ratio', 'Regression'])
@@ -0,0 +1,271 @@
+# ============================================================
+# MODEL BUNDLE ARTIFACT
+# ============================================================
+"""
+One versioned artifact per trained model: the model, its feature names and
+target, and the preprocessing it actually needs.
+
+Tree ensembles (XGBoost, LightGBM, Random Forest) split on thresholds, so a
+per-feature affine map such as StandardScaler changes nothing but the
+threshold values; only scale-sensitive models (Ridge and the other linear
+models) are fitted on standardised features (``needs_scaling``). A bundle
+without a scaler scores raw feature rows directly.
+
+The artifact is a single JSON file::
+
+    {"format": "load_forecasting.model", "version": 1, "target": ...,
+     "feature_names": [...], "scaler": null | {"mean": [...], "scale": [...]},
+     "model": {"type": "xgboost", "booster": {...}}
+              | {"type": "linear", "coef": [...], "intercept": ...},
+     "intervals": null | {"method": "conformal" | "quantile",
+                          "quantiles": [0.1, 0.5, 0.9], "offsets": [...] | null},
+     "imputation": null | "gap" | "mean"}
+
+``imputation`` is the gap fill the training features were built with, so
+``serve`` builds request features the same way (absent in older bundles).
+
+With intervals, ``predict_intervals`` returns the point forecast and the
+(rows x quantiles) band from one model call: a conformal bundle adds its
+calibrated offsets to the point forecast; a ``quantile`` bundle's booster
+predicts every quantile itself (its point forecast is the median column).
+
+``ModelBundle.from_legacy`` reads the notebook's ``xgboost_11kv_model.json``
+/ ``feature_scaler.pkl`` pair and folds the scaler into the booster's split
+thresholds, so the legacy model also scores raw features.
+"""
+
+import json
+
+import numpy as np
+
+BUNDLE_FORMAT = "load_forecasting.model"
+BUNDLE_VERSION = 1
+
+# Estimator families whose fit depends on the scale of the features
+_SCALE_SENSITIVE_MODULES = ('sklearn.linear_model', 'sklearn.svm', 'sklearn.neighbors',
+                            'sklearn.neural_network')
+
+
+def needs_scaling(model) -> bool:
+    """Whether ``model`` should be fitted on standardised features."""
+    return type(model).__module__.startswith(_SCALE_SENSITIVE_MODULES)
+
+
+def _float32_key(values: np.ndarray) -> np.ndarray:
+    """Integer keys in the order of the float32 values (for bisection)."""
+    bits = values.astype(np.float32).view(np.int32).astype(np.int64)
+    return np.where(bits < 0, -(bits & 0x7FFFFFFF), bits)
+
+
+def _float32_from_key(keys: np.ndarray) -> np.ndarray:
+    bits = np.where(keys < 0, (-keys) | 0x80000000, keys).astype(np.uint32)
+    return bits.view(np.float32)
+
+
+def unscale_thresholds(thresholds: np.ndarray, mean: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """
+    Raw-feature thresholds equivalent to ``thresholds`` on standardised
+    features.
+
+    XGBoost sends a row left when ``x < threshold`` in float32, and its
+    thresholds are (scaled) training values, so rows sit exactly on them.
+    For every threshold this returns the smallest float32 ``c`` with
+    ``float32((c - mean) / scale) >= threshold``: then ``x < c`` holds
+    exactly when the scaled value is below the threshold, ties included, for
+    float32 feature values (the representation the package trains on).
+    Found by bisection over the ordered float32 bit patterns.
+    """
+    target = np.asarray(thresholds, dtype=np.float32)
+
+    def scaled(keys):
+        return ((_float32_from_key(keys).astype(np.float64) - mean) / scale).astype(np.float32)
+
+    lo = np.full(target.shape, _float32_key(np.array([-np.inf]))[0])  # scaled(lo) < target
+    hi = np.full(target.shape, _float32_key(np.array([np.inf]))[0])   # scaled(hi) >= target
+    while np.any(hi - lo > 1):
+        mid = (lo + hi) // 2
+        above = scaled(mid) >= target
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    return _float32_from_key(hi)
+
+
+def fold_scaler(booster, mean: np.ndarray, scale: np.ndarray):
+    """Copy of ``booster`` that scores raw features the way it scored scaled ones."""
+    import xgboost as xgb
+
+    payload = json.loads(bytes(booster.save_raw('json')))
+    trees = payload['learner']['gradient_booster']['model']['trees']
+    for tree in trees:
+        split = np.array(tree['left_children']) != -1  # leaves hold values, not thresholds
+        features = np.array(tree['split_indices'])[split]
+        conditions = np.array(tree['split_conditions'], dtype=np.float32)
+        conditions[split] = unscale_thresholds(conditions[split], mean[features],
+                                               scale[features])
+        tree['split_conditions'] = conditions.tolist()
+
+    folded = xgb.Booster()
+    folded.load_model(bytearray(json.dumps(payload).encode()))
+    return folded
+
+
+class ModelBundle:
+    """A trained model with its feature layout and (optional) scaler."""
+
+    def __init__(self, model, feature_names: list, target: str = None, scaler=None,
+                 quantiles: list = None, offsets=None, imputation: str = None):
+        if hasattr(model, 'get_booster'):
+            model = model.get_booster()
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.target = target
+        self.mean = None if scaler is None else np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = None if scaler is None else np.asarray(scaler.scale_, dtype=np.float64)
+        # quantiles without offsets: the model itself predicts one column per quantile
+        self.quantiles = None if quantiles is None else list(quantiles)
+        self.offsets = None if offsets is None else np.asarray(offsets, dtype=np.float64)
+        self.imputation = imputation
+
+    @property
+    def scaled(self) -> bool:
+        return self.mean is not None
+
+    @property
+    def intervals(self) -> bool:
+        return self.quantiles is not None
+
+    @property
+    def interval_method(self) -> str:
+        if not self.intervals:
+            return None
+        return 'quantile' if self.offsets is None else 'conformal'
+
+    @classmethod
+    def fit(cls, model, X, y, feature_names: list, target: str = None, **fit_kwargs):
+        """Fit ``model``, standardising ``X`` first only if ``needs_scaling(model)``."""
+        scaler = None
+        if needs_scaling(model):
+            from sklearn.preprocessing import StandardScaler
+            scaler = StandardScaler().fit(X)
+            X = scaler.transform(X)
+        model.fit(X, y, **fit_kwargs)
+        return cls(model, feature_names, target, scaler)
+
+    def transform(self, X) -> np.ndarray:
+        """Rows as the model expects them (standardised only for scaled models)."""
+        if not self.scaled:
+            return X
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def _raw_predict(self, X) -> np.ndarray:
+        X = self.transform(X)
+        if hasattr(self.model, 'inplace_predict'):
+            return self.model.inplace_predict(X)
+        return self.model.predict(X)
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_intervals(X)[0] if self.interval_method == 'quantile' \
+            else self._raw_predict(X)
+
+    def predict_intervals(self, X):
+        """``(point, bands)``: the point forecast and the (rows x quantiles) bands."""
+        if not self.intervals:
+            raise ValueError("this model bundle was trained without intervals")
+        output = self._raw_predict(X)
+        if self.offsets is not None:
+            return output, output[:, None] + self.offsets.astype(output.dtype)
+        # Sorting removes the occasional crossing of separately fitted quantiles
+        bands = np.sort(output, axis=1)
+        return bands[:, int(np.argmin(np.abs(np.asarray(self.quantiles) - 0.5)))], bands
+
+    def predict_quantiles(self, X) -> np.ndarray:
+        return self.predict_intervals(X)[1]
+
+    def save(self, path: str):
+        """Write the bundle as one JSON artifact."""
+        if hasattr(self.model, 'save_raw'):
+            model = {'type': 'xgboost', 'booster': json.loads(bytes(self.model.save_raw('json')))}
+        elif hasattr(self.model, 'coef_'):
+            model = {'type': 'linear', 'coef': np.ravel(self.model.coef_).tolist(),
+                     'intercept': float(np.ravel(self.model.intercept_)[0])}
+        else:
+            raise TypeError(f"cannot bundle a {type(self.model).__name__}; "
+                            "only XGBoost boosters and linear models are supported")
+        payload = {
+            'format': BUNDLE_FORMAT,
+            'version': BUNDLE_VERSION,
+            'target': self.target,
+            'feature_names': self.feature_names,
+            'scaler': None if not self.scaled else {'mean': self.mean.tolist(),
+                                                    'scale': self.scale.tolist()},
+            'model': model,
+            'intervals': None if not self.intervals else {
+                'method': self.interval_method, 'quantiles': self.quantiles,
+                'offsets': None if self.offsets is None else self.offsets.tolist()},
+            'imputation': self.imputation,
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'ModelBundle':
+        with open(path) as f:
+            payload = json.load(f)
+        if not isinstance(payload, dict) or payload.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"{path} is not a model bundle; a plain booster JSON needs its "
+                             f"scaler (legacy model/scaler pair)")
+        if payload['version'] > BUNDLE_VERSION:
+            raise ValueError(f"{path} is bundle version {payload['version']}; "
+                             f"this package reads up to version {BUNDLE_VERSION}")
+
+        spec = payload['model']
+        if spec['type'] == 'xgboost':
+            import xgboost as xgb
+            model = xgb.Booster()
+            model.load_model(bytearray(json.dumps(spec['booster']).encode()))
+        else:
+            from sklearn.linear_model import LinearRegression
+            model = LinearRegression()
+            model.coef_ = np.asarray(spec['coef'])
+            model.intercept_ = spec['intercept']
+            model.n_features_in_ = len(model.coef_)
+
+        intervals = payload.get('intervals') or {}
+        bundle = cls(model, payload['feature_names'], payload['target'],
+                     quantiles=intervals.get('quantiles'), offsets=intervals.get('offsets'),
+                     imputation=payload.get('imputation'))
+        if payload['scaler'] is not None:
+            bundle.mean = np.asarray(payload['scaler']['mean'], dtype=np.float64)
+            bundle.scale = np.asarray(payload['scaler']['scale'], dtype=np.float64)
+        return bundle
+
+    @classmethod
+    def from_legacy(cls, model_path: str, scaler_path: str) -> 'ModelBundle':
+        """
+        Bundle for an ``xgboost_11kv_model.json`` / ``feature_scaler.pkl`` pair
+        with the scaler folded into the booster's thresholds.
+        """
+        import joblib
+        import xgboost as xgb
+
+        from .serving import model_layout
+
+        booster = xgb.Booster()
+        booster.load_model(model_path)
+        scaler = joblib.load(scaler_path)
+        # A scaler fitted on a plain array has no names; the booster may still carry them
+        feature_names = getattr(scaler, 'feature_names_in_', None)
+        if feature_names is None:
+            feature_names = booster.feature_names
+        if feature_names is None:
+            raise ValueError(f"no feature names in {scaler_path} (fitted on an array) or "
+                             f"{model_path}; retrain with train to get a model bundle")
+        feature_names = list(feature_names)
+        if len(feature_names) != scaler.n_features_in_:
+            raise ValueError(f"{scaler_path} has {scaler.n_features_in_} features, "
+                             f"the model {len(feature_names)}")
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(len(feature_names))
+        scale = scaler.scale_ if scaler.with_std else np.ones(len(feature_names))
+        target, _, _ = model_layout(feature_names)
+        # The notebook filled gaps with the column mean
+        return cls(fold_scaler(booster, mean, scale), feature_names, target, imputation='mean')
@@ -0,0 +1,153 @@
+# ============================================================
+# CONTENT-ADDRESSED STAGE CACHE
+# ============================================================
+"""
+On-disk cache of pipeline stage outputs.
+
+Each entry is addressed by a SHA-256 key built from the stage name, its
+parameters, the package version and either the content of its input files
+or the keys of the upstream stages. Changing one parameter therefore only
+changes the keys (and recomputes) from that stage downstream. The cache is
+bounded in size; the least recently used entries are evicted first.
+
+DataFrames are stored as Parquet with their dtypes unchanged (unlike the
+float32 intermediate datasets, a cache hit must equal a fresh run);
+everything else is stored with joblib.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from . import __version__
+from .config import CACHE_DIR, CACHE_MAX_BYTES
+from .telemetry import span
+
+_HASH_INDEX = "file_hashes.json"
+
+
+def file_digest(path: str, index: dict = None) -> str:
+    """
+    SHA-256 of a file's content. ``index`` memoizes digests by absolute path,
+    size and mtime so unchanged multi-GB exports are not re-read.
+    """
+    stat = os.stat(path)
+    memo_key = os.path.abspath(path)
+    signature = [stat.st_size, stat.st_mtime_ns]
+    if index is not None and index.get(memo_key, {}).get('signature') == signature:
+        return index[memo_key]['digest']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest = digest.hexdigest()
+
+    if index is not None:
+        index[memo_key] = {'signature': signature, 'digest': digest}
+    return digest
+
+
+class StageCache:
+    """Size-bounded LRU store of stage outputs keyed by content hash."""
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._hash_index_path = os.path.join(root, _HASH_INDEX)
+        try:
+            with open(self._hash_index_path) as f:
+                self._hash_index = json.load(f)
+        except (OSError, ValueError):
+            self._hash_index = {}
+
+    def key(self, stage: str, params: dict = None, upstream: list = None,
+            files: list = None) -> str:
+        """Cache key for ``stage`` from its parameters, upstream keys and input files."""
+        payload = {
+            'stage': stage,
+            'version': __version__,
+            'params': params or {},
+            'upstream': list(upstream or []),
+            'files': [file_digest(path, self._hash_index) for path in (files or [])],
+        }
+        if files:
+            with open(self._hash_index_path, 'w') as f:
+                json.dump(self._hash_index, f)
+        blob = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def _path(self, stage: str, key: str, is_frame: bool) -> str:
+        suffix = '.parquet' if is_frame else '.joblib'
+        return os.path.join(self.root, f"{stage}-{key[:24]}{suffix}")
+
+    def _find(self, stage: str, key: str):
+        for is_frame in (True, False):
+            path = self._path(stage, key, is_frame)
+            if os.path.exists(path):
+                return path, is_frame
+        return None, None
+
+    def get(self, stage: str, key: str):
+        """Return the cached output or ``None``; a hit refreshes the entry's LRU position."""
+        path, is_frame = self._find(stage, key)
+        if path is None:
+            return None
+        os.utime(path)
+        if is_frame:
+            return pd.read_parquet(path)
+        import joblib
+        return joblib.load(path)
+
+    def put(self, stage: str, key: str, value):
+        """Store ``value`` and evict least recently used entries beyond ``max_bytes``."""
+        is_frame = isinstance(value, pd.DataFrame)
+        path = self._path(stage, key, is_frame)
+        tmp_path = path + '.tmp'
+        if is_frame:
+            value.to_parquet(tmp_path)
+        else:
+            import joblib
+            joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep: str = None) -> list:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name == _HASH_INDEX or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total -= size
+            removed.append(path)
+        return removed
+
+    def cached(self, stage: str, key: str, compute):
+        """Return the cached output for ``key`` or compute, store and return it."""
+        with span('stage.' + stage, key=key[:12]) as stage_span:
+            value = self.get(stage, key)
+            if value is not None:
+                print(f"♻️  {stage}: cache hit ({key[:12]})")
+                stage_span.set(cache='hit')
+            else:
+                print(f"⚙️  {stage}: computing ({key[:12]})")
+                stage_span.set(cache='miss')
+                value = compute()
+                self.put(stage, key, value)
+            stage_span.output(value)
+            return value
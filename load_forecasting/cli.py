@@ -0,0 +1,1062 @@
+# ============================================================
+# COMMAND LINE ENTRY POINT
+# ============================================================
+"""
+Command line interface for the 11kV forecasting pipeline.
+
+    python -m load_forecasting merge
+    python -m load_forecasting quality        # spike / flatline / range flags
+    python -m load_forecasting features
+    python -m load_forecasting train [--compare] [--cv] [--params tuned_params.json]
+    python -m load_forecasting train --intervals   # P10/P50/P90 bands in the bundle
+    python -m load_forecasting tune           # successive halving, resumable
+    python -m load_forecasting backtest       # walk-forward, daily warm-started retrains
+    python -m load_forecasting predict --last 24
+    python -m load_forecasting run            # all stages, cached
+    python -m load_forecasting train-dayahead
+    python -m load_forecasting forecast       # next 24 h for every feeder
+    python -m load_forecasting alerts         # overload / N-1 early warning on that plan
+    python -m load_forecasting figures        # notebook figures, cached and downsampled
+    python -m load_forecasting paper-results  # numbers quoted by the paper -> JSON
+    python -m load_forecasting paper --layout ieee   # IEEE DOCX from that results file
+    python -m load_forecasting train-global   # one model across all feeders
+    python -m load_forecasting predict-global --last 24
+    python -m load_forecasting serve          # batched HTTP inference
+    python -m load_forecasting bench --baseline benchmark_baseline.json   # scaling benchmarks
+    python -m load_forecasting --telemetry telemetry.jsonl run   # per-stage spans -> JSONL
+    python -m load_forecasting telemetry      # per-stage durations and SLA breaches
+    python -m load_forecasting synth-profile  # fit the SCADA generator to the merged readings
+    python -m load_forecasting synth --years 5 --feeders 2000 --parts 20   # NB 11kV exports
+
+Each subcommand imports only what it needs, so ``predict`` never pays for
+matplotlib, seaborn, LightGBM or python-docx.
+"""
+
+import argparse
+import json
+import sys
+
+from . import config
+
+
+def cmd_merge(args) -> int:
+    if args.stream:
+        from .data import stream_merge_to_file
+
+        stream_merge_to_file(args.inputs, args.output, chunksize=args.chunksize)
+        if not args.no_screen:
+            print(f"ℹ️ Quality report skipped for --stream; features screens the readings, or run "
+                  f"quality --input {args.output}")
+        return 0
+    if len(args.inputs) != 2:
+        print("❌ merge takes exactly two --inputs unless --stream is given")
+        return 2
+
+    from .data import TimeSeriesDataLoader, check_missing_hours, load_and_merge_datasets, \
+        standardize_time_format
+    from .storage import save_frame
+
+    loader = TimeSeriesDataLoader(time_column=config.TIME_COLUMN,
+                                  date_format=config.DATE_FORMAT_INPUT)
+    df_merged = load_and_merge_datasets(args.inputs[0], args.inputs[1], loader)
+    df_merged = standardize_time_format(df_merged, config.TIME_COLUMN)
+    df_merged = check_missing_hours(df_merged, config.TIME_COLUMN)
+
+    save_frame(df_merged, args.output)
+    print(f"✅ Merged dataset exported to: {args.output}")
+    print(f"   └── Total records: {len(df_merged)}")
+
+    if not args.no_screen:
+        # The merged file keeps the raw readings; features masks the flagged ones
+        _save_quality_report(df_merged, args.flags_output, args.summary_output)
+    return 0
+
+
+def _save_quality_report(df_merged, flags_output: str, summary_output: str):
+    from .quality import screen_readings
+    from .storage import save_frame
+
+    flags, summary = screen_readings(df_merged)
+    save_frame(flags, flags_output)
+    summary.to_csv(summary_output)
+
+    print("\n🔍 DATA-QUALITY SCREENING")
+    print(summary.to_string())
+    print(f"\n💾 Flag bitmap saved: {flags_output}")
+    print(f"💾 Summary saved: {summary_output}")
+    return flags
+
+
+def cmd_quality(args) -> int:
+    from .quality import mask_flagged
+    from .storage import load_frame, save_frame
+
+    df_merged = load_frame(args.input)
+    flags = _save_quality_report(df_merged, args.flags_output, args.summary_output)
+
+    if args.clean_output:
+        save_frame(mask_flagged(df_merged, flags), args.clean_output)
+        print(f"💾 Screened readings saved: {args.clean_output}")
+    return 0
+
+
+def cmd_features(args) -> int:
+    from .data import get_feeder_columns
+    from .features import build_features
+    from .storage import load_frame, save_frame
+    from .weather import add_weather_features
+
+    df_merged = load_frame(args.input)
+    target_col = args.target or get_feeder_columns(df_merged)[0]
+    if not args.no_screen:
+        from .quality import quality_gate
+
+        df_merged = quality_gate(df_merged)[0]
+
+    if args.weather_output:
+        df_weather = add_weather_features(df_merged)
+        save_frame(df_weather, args.weather_output)
+        print(f"💾 Weather features saved: {args.weather_output}")
+
+    df_imputed = None
+    if args.mask_output:
+        import pandas as pd
+
+        from .features import impute_gaps
+
+        df_gap, mask = impute_gaps(df_merged, get_feeder_columns(df_merged))
+        mask_frame = pd.DataFrame(mask, columns=get_feeder_columns(df_merged))
+        mask_frame.insert(0, config.TIME_COLUMN, df_gap[config.TIME_COLUMN].to_numpy())
+        save_frame(mask_frame, args.mask_output)
+        print(f"💾 Missing-reading mask saved: {args.mask_output}")
+        df_imputed = df_gap
+
+    df_features = build_features(df_merged, target_col, all_feeders=args.all_feeders,
+                                 imputation=args.imputation, imputed=df_imputed)
+    save_frame(df_features, args.output)
+    print(f"\n💾 FINAL PROCESSED DATA SAVED!")
+    print(f"   ├── File: {args.output}")
+    print(f"   ├── Target: {target_col}")
+    print(f"   ├── Records: {len(df_features)}")
+    print(f"   └── Features: {len(df_features.columns)}")
+    return 0
+
+
+def _tuned_xgboost_params(path: str):
+    """XGBOOST_PARAMS updated from a ``tune`` output file; None without a file, False if unusable."""
+    if not path:
+        return None
+    with open(path) as f:
+        tuned = json.load(f)
+    if tuned['model'] != 'XGBoost':
+        print(f"❌ {path} holds {tuned['model']} settings; XGBoost settings are needed")
+        return False
+    print(f"⚙️ Using tuned parameters from {path}")
+    return {**config.XGBOOST_PARAMS, **tuned['params']}
+
+
+def cmd_train(args) -> int:
+    import numpy as np
+
+    from .matrix import FeatureMatrix
+    from .bundle import ModelBundle
+    from .intervals import calculate_interval_metrics, conformal_offsets, quantile_label
+    from .training import (calculate_metrics, compare_models, cross_validate_matrix,
+                           parallel_compare_models, parallel_cross_validate,
+                           train_xgboost_matrix)
+
+    # Read only the target and its model features, straight into float32
+    fm = FeatureMatrix.from_file(args.input, args.target, observed=True)
+    print(f"📐 X shape: {fm.shape}, y shape: {fm.y.shape} "
+          f"({fm.nbytes / 1024 ** 2:.1f} MB)")
+
+    # Unscaled: trees are invariant to per-feature scaling (compare scales Ridge itself)
+    train, test = fm.split(config.TEST_SIZE)
+
+    params = _tuned_xgboost_params(args.params)
+    if params is False:
+        return 2
+
+    quantiles = config.PREDICTION_QUANTILES if args.intervals == 'quantile' else None
+    bundle = ModelBundle(train_xgboost_matrix(train, test, params, quantiles),
+                         fm.feature_names, fm.target, quantiles=quantiles,
+                         imputation=args.imputation)
+    if args.intervals == 'conformal':
+        # Calibrated on the training period only, so the test coverage is honest
+        fold_residuals = cross_validate_matrix(train, config.N_SPLITS_CV, params)['residuals']
+        residuals = np.concatenate(fold_residuals[-config.INTERVAL_CALIBRATION_FOLDS:])
+        bundle.quantiles = config.PREDICTION_QUANTILES
+        bundle.offsets = conformal_offsets(residuals, bundle.quantiles)
+        print(f"\n📏 Conformal offsets ({len(residuals)} out-of-fold residuals): "
+              + ", ".join(f"{quantile_label(q)} {offset:+.3f}"
+                          for q, offset in zip(bundle.quantiles, bundle.offsets)))
+
+    calculate_metrics(train.y, bundle.predict(train.X), "Training Set")
+    calculate_metrics(test.y, bundle.predict(test.X), "Test Set")
+    if bundle.intervals:
+        calculate_interval_metrics(test.y, bundle.predict_quantiles(test.X), "Test Set",
+                                   bundle.quantiles)
+
+    if args.cv and args.workers:
+        import xgboost as xgb
+        models_dict = {'XGBoost': xgb.XGBRegressor(**params)} if params else None
+        parallel_cross_validate(fm.X, fm.y, models_dict, config.N_SPLITS_CV,
+                                n_workers=args.workers)
+    elif args.cv:
+        cross_validate_matrix(fm, config.N_SPLITS_CV, params)
+
+    if args.compare:
+        compare = parallel_compare_models if args.workers else compare_models
+        kwargs = {'n_workers': args.workers} if args.workers else {}
+        comparison_df, predictions, trained_models = compare(train.X, train.y, test.X, test.y,
+                                                             **kwargs)
+        comparison_df.to_csv(args.comparison_output)
+        print(comparison_df.to_string())
+        print(f"\n💾 Comparison saved to: {args.comparison_output}")
+        if not args.no_significance:
+            _significance_report(test.y, predictions, args.bootstrap_output,
+                                 args.significance_output)
+
+    if args.figure_inputs:
+        from .figures import (comparison_inputs, evaluation_inputs, feature_importances,
+                              importance_inputs, save_figure_inputs)
+
+        evaluation = evaluation_inputs(test.y, bundle.predict(test.X), fm.feature_names,
+                                       feature_importances(bundle.model, fm.feature_names))
+        if args.compare:
+            save_figure_inputs(args.figure_inputs, fm.target, evaluation,
+                               comparison_inputs(comparison_df, test.y, predictions),
+                               importance_inputs(trained_models, fm.feature_names))
+        else:
+            save_figure_inputs(args.figure_inputs, fm.target, evaluation)
+        print(f"💾 Figure inputs saved to: {args.figure_inputs}")
+
+    bundle.save(args.model)
+    print(f"\n💾 Model bundle saved: {args.model}")
+    return 0
+
+
+def _significance_report(y_test, predictions: dict, bootstrap_output: str,
+                         significance_output: str):
+    """Block-bootstrap intervals and pairwise tests of the compared models' test errors."""
+    from .significance import bootstrap_metrics, pairwise_comparison
+
+    intervals = bootstrap_metrics(y_test, predictions)
+    # DM long-run variance over the same dependence horizon as the bootstrap blocks
+    tests = pairwise_comparison(y_test, predictions, hac_lags=config.BOOTSTRAP_BLOCK_HOURS - 1)
+    intervals.round(4).to_csv(bootstrap_output)
+    tests.to_csv(significance_output, index=False)
+
+    print(f"\n📏 {config.BOOTSTRAP_BLOCK_HOURS}-hour block bootstrap, 95% intervals:")
+    print(intervals.round(3).to_string())
+    print("\n🧪 Pairwise tests (Diebold-Mariano p-values Holm-adjusted):")
+    print(tests[['Model_A', 'Model_B', 'Mean_AE_Diff', 'T_P_Value', 'Wilcoxon_P_Value',
+                 'DM_P_Adjusted', 'Significant']].to_string(index=False))
+    print(f"💾 Bootstrap intervals saved to: {bootstrap_output}")
+    print(f"💾 Pairwise tests saved to: {significance_output}")
+
+
+def cmd_tune(args) -> int:
+    from .data import get_feeder_columns
+    from .features import select_feature_columns
+    from .storage import load_frame, read_schema
+    from .training import chronological_split
+    from .tuning import successive_halving
+
+    schema = read_schema(args.input)
+    target_col = args.target or get_feeder_columns(schema)[0]
+    feature_columns = select_feature_columns(schema, target_col)
+    df_features = load_frame(args.input, columns=[target_col] + feature_columns)
+    df_features = df_features[df_features[target_col].notna()]
+
+    # Search on the training period only; the test split stays untouched
+    X_train, _, y_train, _ = chronological_split(df_features[feature_columns],
+                                                 df_features[target_col], config.TEST_SIZE)
+    result = successive_halving(X_train, y_train, args.model, n_trials=args.trials, eta=args.eta,
+                                trials_file=args.trials_file, n_workers=args.workers,
+                                threads_per_trial=args.threads)
+
+    with open(args.output, 'w') as f:
+        json.dump({'model': result['model'], 'target': target_col,
+                   'cv_mae': round(result['best_mae'], 4), 'params': result['best_params']},
+                  f, indent=2)
+    print(f"\n💾 Tuned parameters saved to: {args.output}")
+    return 0
+
+
+def cmd_backtest(args) -> int:
+    from .backtest import walk_forward
+    from .data import get_feeder_columns
+    from .features import build_features, select_feature_columns
+    from .matrix import FeatureMatrix
+    from .storage import load_frame
+
+    params = _tuned_xgboost_params(args.params)
+    if params is False:
+        return 2
+
+    # Rebuilt with the causal gap fill whatever the features file used, so
+    # each replayed hour only sees imputations made from earlier readings
+    df_merged = load_frame(args.input)
+    target_col = args.target or get_feeder_columns(df_merged)[0]
+    df_features = build_features(df_merged, target_col, imputation='gap')
+    fm = FeatureMatrix.from_frame(df_features, select_feature_columns(df_features, target_col),
+                                  target_col).observed()
+    daily, predictions = walk_forward(fm, args.retrain_days, args.initial_days, args.warm_rounds,
+                                      params, args.refit_days, warm_start=not args.cold)
+    numeric = daily.select_dtypes(include='number').columns
+    daily[numeric] = daily[numeric].round(4)
+    daily.to_csv(args.output, index=False)
+    print(f"💾 Daily error curve saved to: {args.output}")
+    if args.predictions_output:
+        predictions.to_csv(args.predictions_output, index=False)
+        print(f"💾 Hourly predictions saved to: {args.predictions_output}")
+    return 0
+
+
+def cmd_predict(args) -> int:
+    from .data import get_feeder_columns
+    from .inference import load_model, predict_from_readings
+    from .storage import load_frame
+
+    try:
+        model = load_model(args.model, args.scaler)
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 2
+    df_merged = load_frame(args.input)
+    target_col = args.target or model.target or get_feeder_columns(df_merged)[0]
+
+    df_pred = predict_from_readings(df_merged, target_col, model, last_n=args.last)
+    if args.output:
+        df_pred.to_csv(args.output, index=False)
+        print(f"💾 Predictions saved to: {args.output}")
+    else:
+        print(df_pred.to_string(index=False))
+    return 0
+
+
+def cmd_run(args) -> int:
+    from .cache import StageCache
+    from .pipeline import run_pipeline
+    from .training import calculate_metrics
+
+    cache = StageCache(args.cache_dir, int(args.cache_max_mb * 1024 ** 2))
+    result = run_pipeline(args.inputs, args.target, cache, screen=not args.no_screen)
+
+    split = result['split']
+    y_pred = result['bundle'].predict(split['X_test'])
+    calculate_metrics(split['y_test'], y_pred, "Test Set")
+    result['bundle'].save(args.model)
+    print(f"\n💾 Model bundle saved: {args.model}")
+
+    if args.figures_dir:
+        from .figures import (evaluation_inputs, exploration_inputs, feature_importances,
+                              figure_key, render_figures, weather_inputs)
+
+        keys, stages = result['keys'], result['stages']
+        target_col, feature_columns = result['target_col'], split['feature_columns']
+        params = {'target': target_col}
+        # Keyed on the stage keys, so unchanged figures never load their stage outputs
+        render_figures({
+            'data_exploration': (
+                figure_key(cache, 'data_exploration', upstream=[keys['merge']], params=params),
+                lambda: exploration_inputs(stages['merge'](), target_col)),
+            'weather_features_visualization': (
+                figure_key(cache, 'weather_features_visualization', upstream=[keys['weather']],
+                           params=params),
+                lambda: weather_inputs(stages['weather'](), target_col)),
+            'model_evaluation': (
+                figure_key(cache, 'model_evaluation', upstream=[keys['train']]),
+                lambda: evaluation_inputs(split['y_test'], y_pred, feature_columns,
+                                          feature_importances(result['model'], feature_columns))),
+        }, args.figures_dir, args.workers)
+    return 0
+
+
+def cmd_train_dayahead(args) -> int:
+    import numpy as np
+
+    from .data import get_feeder_columns, reindex_hourly
+    from .horizon import DirectMultiHorizonForecaster, evaluate_horizons
+    from .storage import load_frame
+
+    # Row offsets must be hour offsets for the origin/seasonal lags
+    df_merged = reindex_hourly(load_frame(args.input))
+    feeder_cols = get_feeder_columns(df_merged)
+    split_idx = int(len(df_merged) * (1 - config.TEST_SIZE))
+
+    forecaster = DirectMultiHorizonForecaster()
+    forecaster.fit(df_merged.iloc[:split_idx], feeder_cols)
+
+    # Hold-out: every origin whose 24 h window lies in the test period
+    origins = np.arange(split_idx, len(df_merged) - forecaster.horizon)
+    y_true, y_pred, y_model, y_naive = forecaster.predict_origins(df_merged, origins,
+                                                                  components=True)
+    table = evaluate_horizons(y_true, y_pred, y_naive, y_model)
+    table['Model_Weight'] = forecaster.model_weight
+    print(f"\n📊 Hold-out per-horizon error of the plan ({len(origins)} origins):")
+    print(table.to_string(index=False))
+
+    forecaster.save(args.model)
+    print(f"\n💾 Day-ahead model saved: {args.model}")
+    return 0
+
+
+def cmd_train_global(args) -> int:
+    from .data import get_feeder_columns
+    from .global_model import GlobalFeederModel
+    from .storage import load_frame
+
+    df_merged = load_frame(args.input)
+    model = GlobalFeederModel().fit(df_merged, get_feeder_columns(df_merged))
+
+    metrics = model.evaluate(df_merged)
+    metrics.to_csv(args.metrics_output)
+    print("\n📊 Per-feeder test metrics:")
+    print(metrics.astype(float).round(4).to_string())
+    print(f"\n💾 Metrics saved to: {args.metrics_output}")
+
+    model.save(args.model)
+    print(f"💾 Global model saved: {args.model}")
+    return 0
+
+
+def cmd_predict_global(args) -> int:
+    from .global_model import GlobalFeederModel
+    from .storage import load_frame
+
+    model = GlobalFeederModel.load(args.model)
+    df_merged = load_frame(args.input, columns=[config.TIME_COLUMN] + model.feeder_cols)
+    result = model.predict(df_merged, last_n=args.last)
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"💾 Predictions saved to: {args.output}")
+    else:
+        print(result.to_string(index=False))
+    return 0
+
+
+def cmd_forecast(args) -> int:
+    from .data import reindex_hourly
+    from .horizon import DirectMultiHorizonForecaster
+    from .storage import load_frame
+
+    try:
+        forecaster = DirectMultiHorizonForecaster.load(args.model)
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 2
+    df_merged = reindex_hourly(load_frame(args.input))
+    plan = forecaster.predict(df_merged)
+    print(forecaster.blend_summary())
+    if args.output:
+        plan.to_csv(args.output, index=False)
+        print(f"💾 Day-ahead plan saved to: {args.output}")
+    else:
+        print(plan.to_string(index=False))
+    return 0
+
+
+def cmd_alerts(args) -> int:
+    import time
+
+    import pandas as pd
+
+    from .alerts import FeederLimits, overload_alerts
+    from .data import get_feeder_columns
+
+    if args.plan:
+        plan = pd.read_csv(args.plan, parse_dates=[config.TIME_COLUMN])
+    else:
+        from .data import reindex_hourly
+        from .horizon import DirectMultiHorizonForecaster
+        from .storage import load_frame
+
+        try:
+            forecaster = DirectMultiHorizonForecaster.load(args.model)
+        except ValueError as exc:
+            print(f"❌ {exc}")
+            return 2
+        plan = forecaster.predict(reindex_hourly(load_frame(args.input)))
+        print(forecaster.blend_summary())
+    feeder_cols = get_feeder_columns(plan.drop(columns=['Horizon'], errors='ignore'))
+
+    if args.write_limits:
+        FeederLimits.template(feeder_cols).save(args.limits)
+        print(f"💾 Limits template saved: {args.limits} "
+              f"({config.DEFAULT_FEEDER_RATING_AMPS:.0f} A placeholder ratings, no ties)")
+        return 0
+    try:
+        limits = FeederLimits.load(args.limits)
+        start = time.perf_counter()
+        summary, alerts = overload_alerts(plan, limits, feeder_cols)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 2
+
+    print(f"\n🚩 OVERLOAD EARLY WARNING ({len(feeder_cols)} feeders x {len(plan)} h "
+          f"from {plan[config.TIME_COLUMN].iloc[0]}, {elapsed_ms:.2f} ms)")
+    print(summary.to_string(index=False))
+    if len(alerts):
+        print(f"\n⚠️ {len(alerts)} alert(s):")
+        print(alerts.to_string(index=False))
+    else:
+        print("\n✅ No feeder reaches its warning level or loses N-1 cover")
+    if args.summary_output:
+        summary.to_csv(args.summary_output, index=False)
+        print(f"💾 Feeder summary saved to: {args.summary_output}")
+    alerts.to_csv(args.output, index=False)
+    print(f"💾 Alerts saved to: {args.output}")
+    return 0
+
+
+def cmd_figures(args) -> int:
+    from .cache import StageCache
+    from .data import get_feeder_columns
+    from .figures import (MODEL_FIGURES, exploration_inputs, figure_key, load_figure_inputs,
+                          render_figures, weather_inputs)
+    from .storage import load_frame, read_schema
+
+    try:
+        model_inputs = load_figure_inputs(args.model_inputs) if args.model_inputs else None
+        target_col = (args.target or (model_inputs or {}).get('target')
+                      or get_feeder_columns(read_schema(args.input))[0])
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 2
+
+    # Figure keys share the stage cache's memoized file digests
+    cache = StageCache(args.cache_dir)
+    readings = {}
+
+    def merged():
+        if 'df' not in readings:
+            readings['df'] = load_frame(args.input)
+        return readings['df']
+
+    def weather():
+        from .weather import add_weather_features
+        return weather_inputs(add_weather_features(merged()[[config.TIME_COLUMN, target_col]]),
+                              target_col)
+
+    params = {'target': target_col}
+    jobs = {
+        'data_exploration': (
+            figure_key(cache, 'data_exploration', [args.input], params=params, dpi=args.dpi),
+            lambda: exploration_inputs(merged(), target_col)),
+        'weather_features_visualization': (
+            figure_key(cache, 'weather_features_visualization', [args.input], params=params,
+                       dpi=args.dpi),
+            weather),
+    }
+    for name in MODEL_FIGURES:
+        if model_inputs and name in model_inputs:
+            jobs[name] = (figure_key(cache, name, [args.model_inputs], dpi=args.dpi),
+                          lambda name=name: model_inputs[name])
+    if args.only:
+        jobs = {name: job for name, job in jobs.items() if name in args.only}
+
+    import time
+    start = time.perf_counter()
+    status = render_figures(jobs, args.output_dir, args.workers, args.force, args.dpi)
+    rendered = sum(state == 'rendered' for state in status.values())
+    print(f"⏱️ {rendered} rendered, {len(status) - rendered} unchanged in "
+          f"{time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def cmd_paper_results(args) -> int:
+    from .paper import collect_paper_results, save_results
+
+    try:
+        results = collect_paper_results(args.input, args.features, args.comparison, args.model,
+                                        args.figures_dir, args.target, args.scaler,
+                                        args.substation,
+                                        {'voltage': args.voltage, 'region': args.region,
+                                         'area': args.area, 'customers': args.customers})
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 2
+    save_results(results, args.output)
+    best = results['comparison'][0]
+    print(f"📊 {results['dataset']['observations']:,} observations, best model {best['Model']} "
+          f"(test R²={best['Test_R2']:.4f})")
+    print(f"💾 Paper results saved to: {args.output}")
+    return 0
+
+
+def cmd_paper(args) -> int:
+    import os
+    import time
+
+    from .paper import PAPER_LAYOUTS, render_paper, render_papers
+
+    start = time.perf_counter()
+    try:
+        if len(args.results) == 1 and not args.output_dir:
+            output = args.output or PAPER_LAYOUTS[args.layout]['output']
+            outputs = [render_paper(args.results[0], output, args.layout)]
+        else:
+            outputs = render_papers(args.results, args.output_dir or os.curdir, args.layout,
+                                    args.workers)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 2
+    elapsed = time.perf_counter() - start
+    for output in outputs:
+        print(f"💾 Paper saved: {output}")
+    print(f"⏱️ {len(outputs)} paper(s) ({args.layout} layout) in {elapsed:.2f}s")
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from .inference import load_model
+    from .serving import InferenceService, make_server
+
+    try:
+        model = load_model(args.model, args.scaler)
+        service = InferenceService(model, args.max_batch, args.max_wait_ms, args.imputation)
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 2
+    server = make_server(service, args.host, args.port)
+    print(f"🚀 Serving {service.target_col} on http://{args.host}:{args.port} "
+          f"(POST /predict, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {json.dumps(service.stats())}")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    import pandas as pd
+
+    from .benchmark import (BENCH_STAGES, benchmark_cases, compare_to_baseline, load_results,
+                            results_table, run_benchmarks, save_results)
+
+    unknown = [name for name in args.feature_sets if name not in config.BENCH_FEATURE_SETS]
+    if unknown:
+        print(f"❌ unknown feature set(s): {', '.join(unknown)} "
+              f"(choose from {', '.join(config.BENCH_FEATURE_SETS)})")
+        return 2
+    try:
+        baseline = load_results(args.baseline) if args.baseline else None
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 2
+
+    cases = benchmark_cases(args.years, args.feeders, args.feature_sets)
+    stages = [stage for stage in BENCH_STAGES if stage in (args.stages or BENCH_STAGES)]
+    results = run_benchmarks(cases, stages=stages, trees=args.trees)
+    save_results(results, args.output)
+
+    with pd.option_context('display.width', 160):
+        print(results_table(results).to_string(index=False))
+    print(f"💾 Benchmark results saved to: {args.output}")
+    if args.save_baseline:
+        save_results(results, args.save_baseline)
+        print(f"💾 Baseline saved to: {args.save_baseline}")
+
+    if baseline is None:
+        return 0
+    comparison = compare_to_baseline(results, baseline, args.tolerance)
+    regressions = comparison[comparison['Regression']]
+    if comparison.empty:
+        print(f"⚠️ No cases in common with {args.baseline}")
+    elif regressions.empty:
+        print(f"✅ No regressions against {args.baseline} "
+              f"({len(comparison)} metrics within {args.tolerance:.0%})")
+    else:
+        print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+        print(regressions.drop(columns='Regression').to_string(index=False))
+        return 1
+    return 0
+
+
+def cmd_synth_profile(args) -> int:
+    import pandas as pd
+
+    from .storage import load_frame
+    from .synthetic import ScadaProfile
+
+    profile = ScadaProfile.fit(load_frame(args.input))
+    profile.save(args.output)
+    with pd.option_context('display.width', 160):
+        print(profile.summary().to_string())
+    print(f"💾 SCADA profile saved to: {args.output}")
+    return 0
+
+
+def cmd_synth(args) -> int:
+    import os
+    import time
+
+    from .synthetic import ScadaProfile, write_scada_exports
+
+    hours = args.hours if args.hours is not None else int(round(args.years * 8760))
+    if hours < args.parts or args.feeders < 1:
+        print(f"❌ need at least one hour per part and one feeder "
+              f"({hours} hours, {args.parts} parts, {args.feeders} feeders)")
+        return 2
+    try:
+        profile = ScadaProfile.load(args.profile) if args.profile else ScadaProfile.default()
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 2
+
+    if args.parts == 1:
+        paths = [args.output]
+    else:
+        stem, ext = os.path.splitext(args.output)
+        paths = [f"{stem}_part{k:0{len(str(args.parts))}d}{ext}" for k in range(1, args.parts + 1)]
+    started = time.perf_counter()
+    written = write_scada_exports(paths, hours, args.feeders, args.start, profile,
+                                  seed=args.seed, station=args.station)
+    seconds = time.perf_counter() - started
+
+    mb = written['bytes'] / 1024 ** 2
+    print(f"💾 {written['rows']:,} hours x {args.feeders:,} feeders -> {len(paths)} file(s), "
+          f"{mb:,.1f} MB in {seconds:.1f} s ({mb / seconds:,.1f} MB/s)")
+    print(f"   ├── First: {paths[0]}")
+    print(f"   └── Last: {paths[-1]}")
+    return 0
+
+
+def cmd_telemetry(args) -> int:
+    import pandas as pd
+
+    from .telemetry import load_records, summarize
+
+    try:
+        records = load_records(args.input)
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 2
+    runs = list(dict.fromkeys(record['run'] for record in records))
+    if not runs:
+        print(f"⚠️ No spans in {args.input}")
+        return 0
+    if not args.all_runs:
+        runs = runs[-args.runs:]
+    records = [record for record in records if record['run'] in runs
+               and (args.fits or record['name'] != 'fit')]
+    summary = summarize(records, config.STAGE_SLA_SECONDS)
+    with pd.option_context('display.width', 160):
+        print(summary.drop(columns='Start').to_string(index=False))
+    breaches = summary[summary['Over_SLA']]
+    if breaches.empty:
+        print(f"\n✅ No SLA breaches in {len(runs)} run(s)")
+        return 0
+    print(f"\n❌ {len(breaches)} SLA breach(es):")
+    for _, row in breaches.iterrows():
+        print(f"   {row['Run']} {row['Name']}: {row['Max_s']:.1f}s > {row['SLA_s']}s")
+    return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="load_forecasting",
+        description="11kV hourly load forecasting pipeline (Al-Khabourah KHBR01).")
+    parser.add_argument("--telemetry", default=None, metavar="JSONL",
+                        help="append per-stage spans (time, rows, memory, fit time) to this file")
+    parser.add_argument("--profile", action="store_true",
+                        help="with --telemetry, cProfile each top-level stage into --profile-dir")
+    parser.add_argument("--profile-dir", default=config.PROFILE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("merge", help="merge the raw NB 11kV hourly reading CSVs")
+    p.add_argument("--inputs", nargs="+", metavar="CSV",
+                   default=[config.FILE_MARCH_MAY, config.FILE_JUNE_AUG])
+    p.add_argument("--output", default=config.MERGED_DATA_FILE,
+                   help=f"Parquet/Feather, or .csv for text export (e.g. {config.OUTPUT_MERGED})")
+    p.add_argument("--stream", action="store_true",
+                   help="chunked k-way merge with bounded memory (any number of time-ordered files)")
+    p.add_argument("--chunksize", type=int, default=config.STREAM_CHUNK_ROWS,
+                   help="rows read per chunk from each file with --stream")
+    p.add_argument("--flags-output", default=config.QUALITY_FLAGS_FILE)
+    p.add_argument("--summary-output", default=config.QUALITY_SUMMARY_FILE)
+    p.add_argument("--no-screen", action="store_true", help="skip the data-quality report")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("quality", help="flag spikes, flatlines and out-of-range readings")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--flags-output", default=config.QUALITY_FLAGS_FILE,
+                   help="uint8 bitmap per reading: 1 missing, 2 spike, 4 flatline, 8 out of range, "
+                        "16 sustained low level")
+    p.add_argument("--summary-output", default=config.QUALITY_SUMMARY_FILE)
+    p.add_argument("--clean-output", default=None,
+                   help="also save the readings with flagged values set to NaN "
+                        "(what features and run model)")
+    p.set_defaults(func=cmd_quality)
+
+    p = sub.add_parser("features", help="impute and engineer model features")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--output", default=config.FEATURES_DATA_FILE)
+    p.add_argument("--weather-output", default=None,
+                   help=f"also write weather features (e.g. {config.WEATHER_DATA_FILE})")
+    p.add_argument("--target", default=None, help="feeder column (default: first feeder)")
+    p.add_argument("--imputation", default=config.IMPUTATION_METHOD, choices=["gap", "mean"],
+                   help="gap: hourly reindex + causal carry-forward/profile fill; "
+                        "mean: notebook column mean")
+    p.add_argument("--mask-output", default=None,
+                   help="save the boolean mask of missing readings (implies gap imputation)")
+    p.add_argument("--no-screen", action="store_true",
+                   help="keep spike/flatline/out-of-range readings instead of imputing them")
+    p.add_argument("--all-feeders", action="store_true",
+                   help="build lag/rolling features for every feeder, not just the target")
+    p.set_defaults(func=cmd_features)
+
+    p = sub.add_parser("train", help="train XGBoost and export the model bundle")
+    p.add_argument("--input", default=config.FEATURES_DATA_FILE)
+    p.add_argument("--target", default=None, help="feeder column (default: first feeder)")
+    p.add_argument("--model", default=config.MODEL_BUNDLE_PATH)
+    p.add_argument("--imputation", default=config.IMPUTATION_METHOD, choices=["gap", "mean"],
+                   help="gap fill the --input features were built with (recorded for serve)")
+    p.add_argument("--cv", action="store_true", help="run TimeSeriesSplit cross-validation")
+    p.add_argument("--compare", action="store_true",
+                   help="also train Random Forest, LightGBM and Ridge for comparison")
+    p.add_argument("--comparison-output", default=config.COMPARISON_RESULTS_FILE)
+    p.add_argument("--bootstrap-output", default=config.BOOTSTRAP_RESULTS_FILE)
+    p.add_argument("--significance-output", default=config.SIGNIFICANCE_RESULTS_FILE)
+    p.add_argument("--no-significance", action="store_true",
+                   help="skip the bootstrap intervals and pairwise tests after --compare")
+    p.add_argument("--workers", type=int, default=None,
+                   help="run CV folds / compared models on this many processes")
+    p.add_argument("--params", default=None, metavar="JSON",
+                   help="XGBoost settings written by the tune command")
+    p.add_argument("--figure-inputs", default=None, metavar="JSON",
+                   help=f"save reduced model-figure data for the figures command "
+                        f"(e.g. {config.FIGURE_INPUTS_FILE})")
+    p.add_argument("--intervals", nargs="?", const=config.INTERVAL_METHOD, default=None,
+                   choices=["conformal", "quantile"],
+                   help="also export P10/P50/P90 bands: conformal (point model + CV residuals, default) or "
+                        "quantile (one multi-quantile booster)")
+    p.set_defaults(func=cmd_train)
+
+    p = sub.add_parser("backtest", help="walk-forward replay with daily/weekly retrains")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE,
+                   help="merged readings; features are rebuilt with the causal gap fill")
+    p.add_argument("--target", default=None, help="feeder column (default: first feeder)")
+    p.add_argument("--retrain-days", type=int, default=config.BACKTEST_RETRAIN_DAYS,
+                   help="retrain cadence in days (7 = weekly)")
+    p.add_argument("--initial-days", type=int, default=config.BACKTEST_INITIAL_DAYS,
+                   help="history before the first retrain")
+    p.add_argument("--refit-days", type=int, default=config.BACKTEST_REFIT_DAYS,
+                   help="full refit cadence; retrains in between warm-start")
+    p.add_argument("--warm-rounds", type=int, default=config.BACKTEST_WARM_ROUNDS,
+                   help="trees added per warm-started retrain")
+    p.add_argument("--cold", action="store_true", help="refit from scratch at every retrain")
+    p.add_argument("--params", default=None, metavar="JSON",
+                   help="XGBoost settings written by the tune command")
+    p.add_argument("--output", default=config.BACKTEST_ERRORS_FILE)
+    p.add_argument("--predictions-output", default=None)
+    p.set_defaults(func=cmd_backtest)
+
+    p = sub.add_parser("tune", help="successive-halving hyperparameter search (resumable)")
+    p.add_argument("--input", default=config.FEATURES_DATA_FILE)
+    p.add_argument("--target", default=None, help="feeder column (default: first feeder)")
+    p.add_argument("--model", default="XGBoost", choices=["XGBoost", "LightGBM", "Random Forest"])
+    p.add_argument("--trials", type=int, default=config.TUNING_TRIALS)
+    p.add_argument("--eta", type=int, default=config.TUNING_ETA)
+    p.add_argument("--trials-file", default=config.TUNING_TRIALS_FILE,
+                   help="JSON-lines trial log; rerun with the same file to resume")
+    p.add_argument("--workers", type=int, default=None, help="concurrent trials")
+    p.add_argument("--threads", type=int, default=None, help="threads per trial")
+    p.add_argument("--output", default=config.TUNED_PARAMS_FILE)
+    p.set_defaults(func=cmd_tune)
+
+    p = sub.add_parser("predict", help="score merged readings with the saved model")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--target", default=None, help="feeder column (default: the model's target)")
+    p.add_argument("--model", default=config.MODEL_BUNDLE_PATH)
+    p.add_argument("--scaler", default=None,
+                   help=f"legacy: the {config.SCALER_PATH} paired with a plain booster --model")
+    p.add_argument("--last", type=int, default=None, help="only score the last N hours")
+    p.add_argument("--output", default=None)
+    p.set_defaults(func=cmd_predict)
+
+    p = sub.add_parser("train-dayahead",
+                       help="train the direct 24-hour-ahead forecaster for every feeder")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--model", default=config.DAYAHEAD_MODEL_PATH)
+    p.set_defaults(func=cmd_train_dayahead)
+
+    p = sub.add_parser("train-global", help="one XGBoost model for all feeders (long format)")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--model", default=config.GLOBAL_MODEL_PATH)
+    p.add_argument("--metrics-output", default=config.GLOBAL_METRICS_FILE)
+    p.set_defaults(func=cmd_train_global)
+
+    p = sub.add_parser("predict-global", help="score every feeder with the global model")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--model", default=config.GLOBAL_MODEL_PATH)
+    p.add_argument("--last", type=int, default=None, help="only score the last N hours")
+    p.add_argument("--output", default=None)
+    p.set_defaults(func=cmd_predict_global)
+
+    p = sub.add_parser("forecast", help="day-ahead plan for every feeder from the latest readings")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--model", default=config.DAYAHEAD_MODEL_PATH)
+    p.add_argument("--output", default=None)
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser("alerts", help="overload / N-1 early warning on the day-ahead plan")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--model", default=config.DAYAHEAD_MODEL_PATH)
+    p.add_argument("--plan", default=None, metavar="CSV",
+                   help="score a plan saved by forecast --output instead of forecasting")
+    p.add_argument("--limits", default=config.FEEDER_LIMITS_FILE,
+                   help="per-feeder rating_amps and ties (JSON)")
+    p.add_argument("--write-limits", action="store_true",
+                   help="write a --limits template for the plan's feeders and exit")
+    p.add_argument("--output", default=config.ALERTS_FILE)
+    p.add_argument("--summary-output", default=None)
+    p.set_defaults(func=cmd_alerts)
+
+    p = sub.add_parser("paper-results", help="collect every number the paper quotes into JSON")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--features", default=config.FEATURES_DATA_FILE)
+    p.add_argument("--comparison", default=config.COMPARISON_RESULTS_FILE,
+                   help="model comparison table written by train --compare")
+    p.add_argument("--model", default=config.MODEL_BUNDLE_PATH)
+    p.add_argument("--scaler", default=None,
+                   help=f"legacy: the {config.SCALER_PATH} paired with a plain booster --model")
+    p.add_argument("--target", default=None, help="feeder column (default: the model's target)")
+    p.add_argument("--figures-dir", default=config.FIGURES_DIR)
+    p.add_argument("--substation", default=config.PAPER_SUBSTATION)
+    p.add_argument("--voltage", default=None, help="e.g. 33/11kV (default: PAPER_SITES)")
+    p.add_argument("--region", default=None, help="e.g. North Batinah governorate")
+    p.add_argument("--area", default=None, help="e.g. a mixed residential and commercial area")
+    p.add_argument("--customers", type=int, default=None, help="connected customers")
+    p.add_argument("--output", default=config.PAPER_RESULTS_FILE)
+    p.set_defaults(func=cmd_paper_results)
+
+    p = sub.add_parser("figures", help="render the notebook figures (cached, parallel, downsampled)")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--model-inputs", default=None, metavar="JSON",
+                   help="written by train --figure-inputs; adds the model figures")
+    p.add_argument("--target", default=None, help="feeder column (default: the model's target)")
+    p.add_argument("--output-dir", default=config.FIGURES_DIR)
+    p.add_argument("--only", nargs="+", default=None, metavar="FIGURE")
+    p.add_argument("--workers", type=int, default=None, help="processes drawing figures")
+    p.add_argument("--dpi", type=int, default=config.FIGURE_DPI)
+    p.add_argument("--force", action="store_true", help="redraw figures whose inputs are unchanged")
+    p.add_argument("--cache-dir", default=config.CACHE_DIR)
+    p.set_defaults(func=cmd_figures)
+
+    p = sub.add_parser("paper", help="render the IEEE paper (DOCX) from results files")
+    p.add_argument("--results", nargs="+", default=[config.PAPER_RESULTS_FILE], metavar="JSON")
+    p.add_argument("--layout", default="final", choices=["final", "ieee"],
+                   help="final: create_ieee_paper.py styling; ieee: generate_ieee_paper.py styling")
+    p.add_argument("--output", default=None, help="DOCX path for a single results file")
+    p.add_argument("--output-dir", default=None,
+                   help="render one DOCX per results file into this directory")
+    p.add_argument("--workers", type=int, default=None, help="processes for a batch of papers")
+    p.set_defaults(func=cmd_paper)
+
+    p = sub.add_parser("serve", help="HTTP inference service with micro-batching")
+    p.add_argument("--model", default=config.MODEL_BUNDLE_PATH)
+    p.add_argument("--scaler", default=None,
+                   help=f"legacy: the {config.SCALER_PATH} paired with a plain booster --model")
+    p.add_argument("--host", default=config.SERVE_HOST)
+    p.add_argument("--port", type=int, default=config.SERVE_PORT)
+    p.add_argument("--max-batch", type=int, default=config.SERVE_MAX_BATCH)
+    p.add_argument("--max-wait-ms", type=float, default=config.SERVE_MAX_WAIT_MS,
+                   help="how long the batcher waits to fill a batch")
+    p.add_argument("--imputation", default=None, choices=["gap", "mean"],
+                   help="gap fill for request readings (default: the bundle's, "
+                        f"else {config.IMPUTATION_METHOD})")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("bench", help="time every stage on synthetic data of growing size")
+    p.add_argument("--years", nargs="+", type=float, default=config.BENCH_YEARS)
+    p.add_argument("--feeders", nargs="+", type=int, default=config.BENCH_FEEDERS)
+    p.add_argument("--feature-sets", nargs="+", default=list(config.BENCH_FEATURE_SETS),
+                   metavar="NAME", help="lag/window sets from config.BENCH_FEATURE_SETS")
+    p.add_argument("--stages", nargs="+", default=None,
+                   choices=["merge", "weather", "impute", "features", "train", "predict"],
+                   help="stages to measure (default: all)")
+    p.add_argument("--trees", type=int, default=config.BENCH_TREES)
+    p.add_argument("--output", default=config.BENCH_RESULTS_FILE)
+    p.add_argument("--baseline", default=None, metavar="JSON",
+                   help="earlier results to compare against; exit status 1 on regressions")
+    p.add_argument("--save-baseline", default=None, metavar="JSON",
+                   help="also store these results as a baseline")
+    p.add_argument("--tolerance", type=float, default=config.BENCH_TOLERANCE,
+                   help="relative slowdown / memory growth flagged as a regression")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("telemetry", help="summarise --telemetry spans per run and stage")
+    p.add_argument("--input", default=config.TELEMETRY_FILE)
+    p.add_argument("--runs", type=int, default=1, help="latest runs to show")
+    p.add_argument("--all-runs", action="store_true")
+    p.add_argument("--fits", action="store_true", help="also list individual model fits")
+    p.set_defaults(func=cmd_telemetry)
+
+    p = sub.add_parser("synth-profile",
+                       help="fit the synthetic SCADA generator to the merged readings")
+    p.add_argument("--input", default=config.MERGED_DATA_FILE)
+    p.add_argument("--output", default=config.SYNTH_PROFILE_FILE)
+    p.set_defaults(func=cmd_synth_profile)
+
+    p = sub.add_parser("synth", help="stream synthetic readings in the NB 11kV export format")
+    p.add_argument("--profile", default=None, metavar="JSON",
+                   help="profile from synth-profile (default: built-in feeder templates)")
+    length = p.add_mutually_exclusive_group()
+    length.add_argument("--years", type=float, default=1.0)
+    length.add_argument("--hours", type=int, default=None)
+    p.add_argument("--feeders", type=int, default=8)
+    p.add_argument("--start", default=config.SYNTH_START)
+    p.add_argument("--seed", type=int, default=config.RANDOM_STATE,
+                   help="same seed, profile and size give byte-identical files")
+    p.add_argument("--station", default=config.SYNTH_STATION)
+    p.add_argument("--output", default=config.SYNTH_OUTPUT_FILE)
+    p.add_argument("--parts", type=int, default=1,
+                   help="split the period into this many consecutive export files")
+    p.set_defaults(func=cmd_synth)
+
+    p = sub.add_parser("run", help="merge, features and train with a content-addressed stage cache")
+    p.add_argument("--inputs", nargs=2, metavar="CSV",
+                   default=[config.FILE_MARCH_MAY, config.FILE_JUNE_AUG])
+    p.add_argument("--target", default=None, help="feeder column (default: first feeder)")
+    p.add_argument("--model", default=config.MODEL_BUNDLE_PATH)
+    p.add_argument("--cache-dir", default=config.CACHE_DIR)
+    p.add_argument("--cache-max-mb", type=float, default=config.CACHE_MAX_BYTES / 1024 ** 2,
+                   help="evict least recently used stage outputs beyond this size")
+    p.add_argument("--figures-dir", default=None,
+                   help="also render data_exploration, weather and evaluation figures here")
+    p.add_argument("--workers", type=int, default=None, help="processes drawing figures")
+    p.add_argument("--no-screen", action="store_true",
+                   help="keep spike/flatline/out-of-range readings instead of imputing them")
+    p.set_defaults(func=cmd_run)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.telemetry:
+        return args.func(args)
+
+    from . import telemetry
+
+    telemetry.configure([telemetry.JsonLinesSink(args.telemetry)],
+                        'cprofile' if args.profile else None, args.profile_dir)
+    try:
+        with telemetry.span('cli.' + args.command, profile=False,
+                            argv=list(sys.argv[1:] if argv is None else argv)) as command_span:
+            status = args.func(args)
+            command_span.set(exit_status=status)
+        return status
+    finally:
+        telemetry.disable()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+# ============================================================
+# CONFIGURATION AND CONSTANTS
+# ============================================================
+"""
+Pipeline configuration shared by every stage.
+
+Values mirror SECTION 2 of ``11kV_ML_Pipeline.ipynb`` so that artifacts
+produced by the package and by the notebook are interchangeable.
+"""
+
+# File Paths
+FILE_MARCH_MAY = "NB 11kV Houly Reading (March- May).csv"
+FILE_JUNE_AUG = "Copy of NB 11kV Houly Reading (June- Aug).csv"
+OUTPUT_MERGED = "merged_11kv_readings.csv"
+OUTPUT_WEATHER = "11kv_data_with_weather_features.csv"
+FINAL_PROCESSED_FILE = "final_processed_11kv_data.csv"
+COMPARISON_RESULTS_FILE = "model_comparison_results.csv"
+BOOTSTRAP_RESULTS_FILE = "model_bootstrap_ci.csv"  # MAE/RMSE intervals per model (train --compare)
+SIGNIFICANCE_RESULTS_FILE = "model_significance.csv"  # Pairwise t / Wilcoxon / DM tests (train --compare)
+MODEL_PATH = "xgboost_11kv_model.json"  # Notebook export: booster trained on scaled features
+SCALER_PATH = "feature_scaler.pkl"      # ... and its StandardScaler
+MODEL_BUNDLE_PATH = "xgboost_11kv_bundle.json"  # Model + feature layout, one versioned artifact
+DAYAHEAD_MODEL_PATH = "dayahead_11kv_model.json"
+GLOBAL_MODEL_PATH = "global_11kv_model.json"
+GLOBAL_METRICS_FILE = "global_model_feeder_metrics.csv"
+QUALITY_FLAGS_FILE = "quality_flags.parquet"
+QUALITY_SUMMARY_FILE = "quality_summary.csv"
+TUNING_TRIALS_FILE = "tuning_trials.jsonl"
+TUNED_PARAMS_FILE = "tuned_params.json"
+BACKTEST_ERRORS_FILE = "backtest_daily_errors.csv"
+FEEDER_LIMITS_FILE = "feeder_limits.json"  # Per-feeder ampacity ratings and transfer ties (alerts)
+ALERTS_FILE = "overload_alerts.csv"
+FIGURES_DIR = "Analysis_Results"  # Notebook figures and comparison table used by the paper
+FIGURES_MANIFEST = ".figure_keys.json"  # Input key of every rendered figure (in FIGURES_DIR)
+FIGURE_INPUTS_FILE = "model_figure_inputs.json"  # Reduced model-figure data (train --figure-inputs)
+PAPER_RESULTS_FILE = "paper_results.json"  # Every number the paper quotes (paper-results)
+PAPER_FINAL_FILE = "Khaboorah_Load_Forecasting_Final.docx"
+PAPER_IEEE_FILE = "Khaboorah_Load_Forecasting_Paper_IEEE.docx"
+
+# Default intermediate datasets (columnar; pass a .csv path to export text instead)
+MERGED_DATA_FILE = "merged_11kv_readings.parquet"
+WEATHER_DATA_FILE = "11kv_data_with_weather_features.parquet"
+FEATURES_DATA_FILE = "final_processed_11kv_data.parquet"
+
+# Inference server (python -m load_forecasting serve)
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8011
+SERVE_MAX_BATCH = 256
+SERVE_MAX_WAIT_MS = 0.0  # 0 = greedy: batch whatever queued while the last batch ran
+
+# Stage cache (python -m load_forecasting run)
+CACHE_DIR = ".load_forecasting_cache"
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Data Configuration
+TIME_COLUMN = "Time"
+TIME_ISO_COLUMN = "Time_ISO"
+DATE_FORMAT_INPUT = "%Y-%m-%d %H"
+DATE_FORMAT_OUTPUT = "%Y-%m-%d %H:%M:%S"
+
+# Skip rows configuration (Row 0 = metadata, Row 1 = headers)
+SKIP_ROWS = [0]  # Skip first row (metadata)
+HEADER_ROW = 0   # After skipping, row 0 becomes the header
+
+# Streaming ingestion (rows per chunk read from each raw export)
+STREAM_CHUNK_ROWS = 100_000
+
+# Model Configuration
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+N_SPLITS_CV = 5
+FORECAST_HORIZON = 24  # Hours ahead to predict
+SEASONAL_LAGS = [24, 168]  # Same hour yesterday / last week (day-ahead forecaster)
+DAYAHEAD_VALIDATION_SIZE = 0.2  # Tail of the training origins that sets the model/baseline blend
+DAYAHEAD_BLEND_STEPS = 20  # Model weights tried per horizon: 0, 1/20, ..., 1
+
+# Model comparison statistics
+N_BOOTSTRAP = 10000
+BOOTSTRAP_BLOCK_HOURS = 24  # Moving-block length for autocorrelated hourly errors
+
+# Hyperparameter search (successive halving over time-ordered folds)
+TUNING_TRIALS = 27
+TUNING_ETA = 3  # Keep the best 1/eta of the trials per rung, eta x the budget
+TUNING_FOLDS = 3
+TUNING_MIN_ESTIMATORS = 50  # First-rung boosting rounds / trees
+TUNING_MAX_ESTIMATORS = 1350
+EARLY_STOPPING_ROUNDS = 50
+EARLY_STOPPING_FRACTION = 0.15  # Tail of each fold's training rows used for early stopping
+
+# Probabilistic forecasts (train --intervals)
+PREDICTION_QUANTILES = [0.1, 0.5, 0.9]  # P10/P50/P90; the outer pair is the reported interval
+INTERVAL_METHOD = "conformal"  # "conformal": point model + CV residual quantiles; "quantile": multi-quantile booster
+INTERVAL_CALIBRATION_FOLDS = 1  # Latest CV folds whose residuals calibrate conformal bands (early folds see too little history)
+
+# Walk-forward backtest (python -m load_forecasting backtest)
+BACKTEST_INITIAL_DAYS = 28  # History before the first retrain
+BACKTEST_RETRAIN_DAYS = 1   # Retrain cadence (7 = weekly)
+BACKTEST_REFIT_DAYS = 7     # Full refit cadence; retrains in between warm-start
+BACKTEST_WARM_ROUNDS = 25   # Trees added per warm-started retrain
+
+# Overload early warning (python -m load_forecasting alerts)
+ALERT_WARN_FRACTION = 0.9  # WARNING at this fraction of the rating, OVERLOAD at the rating
+DEFAULT_FEEDER_RATING_AMPS = 300.0  # Placeholder written by alerts --write-limits; use the real ampacities
+NOMINAL_VOLTAGE_KV = 11.0
+ALERT_POWER_FACTOR = 0.9  # Current -> MW for the security-standard class
+SECURITY_CLASS_MW = {'A': 2.0, 'B': 6.0, 'C': 20.0}  # KHB01 outage security standard: class upper bounds
+
+# Missing value imputation
+IMPUTATION_METHOD = "gap"  # "gap": hourly reindex + causal carry-forward/profile fill; "mean": notebook column mean
+IMPUTE_MAX_CARRY_HOURS = 3  # Hours a gap repeats the last reading; later hours use the past hour-of-week profile
+
+# Data-quality screening (quality; also gates features and run)
+QUALITY_RANGE_AMPS = (0.0, 600.0)  # Plausible 11kV feeder phase current
+QUALITY_SPIKE_HALF_WINDOW = 12  # Centred 25-hour rolling median / MAD
+QUALITY_SPIKE_SIGMAS = 5.0
+QUALITY_MAD_FLOOR_AMPS = 1.0  # Lower bound on the robust sigma for near-constant stretches
+QUALITY_FLATLINE_HOURS = 6  # Identical consecutive readings treated as a stuck sensor
+QUALITY_LEVEL_HALF_WINDOW = 84  # Centred one-week rolling median for the low-level check
+QUALITY_LEVEL_RATIO = 0.2  # Low level: below this share of the peer feeders' median level
+
+# Feature Configuration
+LAG_HOURS = [1, 2, 3, 6, 12, 24, 48, 168]  # 168 = 1 week
+ROLLING_WINDOWS = [6, 12, 24, 48]
+TEMPORAL_FEATURES = ['hour', 'day', 'day_of_week', 'month', 'week_of_year', 'is_weekend',
+                     'hour_sin', 'hour_cos', 'dow_sin', 'dow_cos']
+WEATHER_FEATURES = ['Temperature_C', 'Humidity_Pct', 'Season_Code', 'Is_Ramadan', 'Heat_Index_C']
+
+# XGBoost Hyperparameters (Tuned for Time Series)
+XGBOOST_PARAMS = {
+    'n_estimators': 500,
+    'max_depth': 6,
+    'learning_rate': 0.05,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'min_child_weight': 3,
+    'gamma': 0.1,
+    'reg_alpha': 0.1,
+    'reg_lambda': 1.0,
+    'random_state': RANDOM_STATE,
+    'n_jobs': -1
+}
+
+# Global cross-feeder model: one booster shared by every feeder needs more trees
+GLOBAL_XGBOOST_PARAMS = {**XGBOOST_PARAMS, 'n_estimators': 1500}
+
+# Figures (python -m load_forecasting figures)
+FIGURE_DPI = 150
+FIGURE_MAX_POINTS = 2000  # LTTB points per plotted time series
+FIGURE_MAX_SCATTER = 5000  # Fixed-seed sample of scatter clouds and box-plot fliers
+FIGURE_HEAD_SAMPLES = 200  # "First N test samples" panels
+
+# Paper (python -m load_forecasting paper)
+PAPER_HOT_THRESHOLD_C = 35.0  # Load-temperature slope is quoted above this temperature
+PAPER_SUBSTATION = "Khaboorah"  # paper-results --substation
+PAPER_SITES = {  # Substation facts quoted by the paper; override with paper-results flags
+    'Khaboorah': {'voltage': "33/11kV", 'region': "North Batinah governorate",
+                  'area': "a mixed residential and commercial area", 'customers': 5000},
+}
+
+# Scaling benchmarks (python -m load_forecasting bench)
+BENCH_RESULTS_FILE = "benchmark_results.json"
+BENCH_BASELINE_FILE = "benchmark_baseline.json"
+BENCH_START = "2016-01-01"  # First synthetic reading
+BENCH_YEARS = [1, 2, 5, 10]
+BENCH_FEEDERS = [8, 50, 200, 500]
+BENCH_FEATURE_SETS = {
+    'default': {'lags': LAG_HOURS, 'windows': ROLLING_WINDOWS},
+    'short': {'lags': [1, 24, 168], 'windows': [24]},
+    'long': {'lags': [1, 2, 3, 6, 12, 24, 48, 72, 168, 336], 'windows': [6, 12, 24, 48, 168]},
+}
+BENCH_TREES = 100  # Boosting rounds per benchmark fit (timing, not accuracy)
+BENCH_TOLERANCE = 0.25  # Relative growth flagged as a regression
+BENCH_MIN_DELTA_SECONDS = 0.05  # ...and only if at least this much slower
+BENCH_MIN_DELTA_MB = 16  # ...or this much bigger
+
+# Stage telemetry (python -m load_forecasting --telemetry telemetry.jsonl <command>)
+TELEMETRY_FILE = "telemetry.jsonl"
+PROFILE_DIR = "profiles"  # cProfile stats per span with --profile
+STAGE_SLA_SECONDS = {  # Slowest acceptable call per span name, flagged by the telemetry command
+    'cli.run': 1800,
+    'stage.merge': 120,
+    'stage.impute': 120,
+    'stage.features': 300,
+    'stage.train': 1200,
+    'cli.forecast': 120,
+    'cli.alerts': 60,
+}
+
+# Synthetic SCADA exports (python -m load_forecasting synth)
+SYNTH_PROFILE_FILE = "scada_profile.json"
+SYNTH_OUTPUT_FILE = "synthetic_11kv_readings.csv"
+SYNTH_START = "2025-01-01"
+SYNTH_STATION = "PS:AL KHABOURAH 01"
+SYNTH_CHUNK_CELLS = 1 << 22  # Readings generated and formatted per block
+SYNTH_LEVEL_JITTER = 0.25  # Log-normal sigma of feeder levels beyond the profile's templates
+SYNTH_PEAK_HEADROOM = 1.1  # Synthetic readings are capped at this multiple of the feeder's highest reading
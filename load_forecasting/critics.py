@@ -0,0 +1,134 @@
+# ============================================================
+# METHODOLOGY CRITICS
+# ============================================================
+"""
+Layer 2 methodology critics of the expert debate (notebook SECTION 12).
+
+``StatisticalValidityCritic`` runs on the batched engine in
+``significance``: paired moving-block bootstrap intervals for every model
+and Diebold-Mariano tests with a multiple-testing correction, alongside the
+notebook's paired t-test and Wilcoxon results. The returned dict keeps the
+notebook's keys, so the Supreme Judge and the report code read it unchanged.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from .config import BOOTSTRAP_BLOCK_HOURS, N_BOOTSTRAP, RANDOM_STATE
+from .significance import bootstrap_metrics, pairwise_comparison
+
+
+class StatisticalValidityCritic:
+    """Critic that questions statistical rigor and significance."""
+
+    def __init__(self, results_dict, predictions_dict, y_test,
+                 n_bootstrap: int = N_BOOTSTRAP, block_length: int = BOOTSTRAP_BLOCK_HOURS,
+                 correction: str = 'holm', seed: int = RANDOM_STATE):
+        self.results = results_dict
+        self.predictions = predictions_dict
+        self.y_test = y_test
+        self.n_bootstrap = n_bootstrap
+        self.block_length = block_length
+        self.correction = correction
+        self.seed = seed
+        self.critic_name = "Statistical Validity Critic"
+        self.focus = "Statistical Rigor & Significance"
+
+    def critique(self):
+        """Challenge statistical validity of comparisons."""
+        critique = {
+            'critic': self.critic_name,
+            'focus': self.focus,
+            'timestamp': datetime.now().isoformat(),
+            'significance_tests': {},
+            'statistical_concerns': [],
+            'confidence_intervals': {},
+            'bootstrap': {
+                'method': 'moving-block' if self.block_length > 1 else 'iid',
+                'block_length_hours': self.block_length,
+                'n_resamples': self.n_bootstrap,
+            },
+            'severity': 'moderate',
+            'recommendations': []
+        }
+
+        y_true = np.asarray(self.y_test, dtype=np.float64)
+
+        # Pairwise comparison of prediction errors (all pairs at once).
+        # DM long-run variance uses the same dependence horizon as the bootstrap.
+        if len(self.predictions) >= 2:
+            tests = pairwise_comparison(y_true, self.predictions, hac_lags=self.block_length - 1,
+                                        correction=self.correction)
+            for row in tests.itertuples(index=False):
+                w_missing = np.isnan(row.Wilcoxon_P_Value)
+                critique['significance_tests'][f"{row.Model_A} vs {row.Model_B}"] = {
+                    'paired_ttest': {
+                        't_statistic': float(row.T_Statistic),
+                        'p_value': float(row.T_P_Value),
+                        'significant_at_0.05': bool(row.T_P_Value < 0.05)
+                    },
+                    'wilcoxon_test': {
+                        'w_statistic': None if w_missing else float(row.Wilcoxon_Statistic),
+                        'p_value': None if w_missing else float(row.Wilcoxon_P_Value),
+                        'significant_at_0.05': None if w_missing else bool(row.Wilcoxon_P_Value < 0.05)
+                    },
+                    'diebold_mariano': {
+                        'statistic': float(row.DM_Statistic),
+                        'p_value': float(row.DM_P_Value),
+                        'p_value_adjusted': float(row.DM_P_Adjusted),
+                        'correction': self.correction,
+                        'significant_at_0.05': bool(row.Significant)
+                    },
+                    'mean_error_diff': float(row.Mean_AE_Diff)
+                }
+
+        # Statistical concerns
+        n_pairs = len(critique['significance_tests'])
+        critique['statistical_concerns'] = [
+            {
+                'concern': 'Multiple comparisons problem',
+                'explanation': f'{n_pairs} pairwise comparisons on the same test set',
+                'recommendation': f'Diebold-Mariano p-values are {self.correction}-adjusted; '
+                                  'treat unadjusted t-test/Wilcoxon p-values as indicative',
+                'severity': 'low'
+            },
+            {
+                'concern': 'Point estimates without uncertainty',
+                'explanation': 'Single train/test split provides point estimates only',
+                'recommendation': 'Use the bootstrap intervals below; add CV for split variance',
+                'severity': 'moderate'
+            },
+            {
+                'concern': 'Temporal autocorrelation in errors',
+                'explanation': 'Prediction errors are correlated across hours',
+                'recommendation': f'Intervals use a {self.block_length}-hour moving-block bootstrap '
+                                  'and DM uses a HAC variance',
+                'severity': 'low'
+            }
+        ]
+
+        # Confidence intervals from one shared set of block-bootstrap resamples
+        intervals = bootstrap_metrics(y_true, self.predictions, self.n_bootstrap,
+                                      self.block_length, seed=self.seed)
+        for model_name, row in intervals.iterrows():
+            critique['confidence_intervals'][model_name] = {
+                'mae_point_estimate': float(row['MAE']),
+                'mae_95_ci_lower': float(row['MAE_CI_lower']),
+                'mae_95_ci_upper': float(row['MAE_CI_upper']),
+                'ci_width': float(row['MAE_CI_upper'] - row['MAE_CI_lower']),
+                'rmse_point_estimate': float(row['RMSE']),
+                'rmse_95_ci_lower': float(row['RMSE_CI_lower']),
+                'rmse_95_ci_upper': float(row['RMSE_CI_upper'])
+            }
+
+        # Recommendations
+        critique['recommendations'] = [
+            "Base model rankings on the adjusted Diebold-Mariano results",
+            "Report block-bootstrap confidence intervals alongside point estimates",
+            "Check residual autocorrelation with Durbin-Watson test",
+            "Repeat the comparison across CV folds before declaring a winner",
+            "Current results suggestive but require careful interpretation"
+        ]
+
+        return critique
@@ -0,0 +1,335 @@
+# ============================================================
+# DATA LOADING & MERGING
+# ============================================================
+"""
+Loading, cleaning and merging of the NB 11kV hourly reading exports.
+
+``load_and_merge_datasets`` reads whole files into memory. For multi-year
+exports use ``stream_merge_readings``, which reads each file in chunks and
+merges the already time-ordered files with a k-way merge.
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from .config import (DATE_FORMAT_INPUT, DATE_FORMAT_OUTPUT, SKIP_ROWS, STREAM_CHUNK_ROWS,
+                     TEMPORAL_FEATURES, TIME_COLUMN, TIME_ISO_COLUMN, WEATHER_FEATURES)
+from .telemetry import traced
+
+
+class TimeSeriesDataLoader:
+    """
+    Base class for loading and preprocessing time series data.
+    Implements Chain of Thought methodology for data ingestion.
+    """
+
+    def __init__(self, time_column: str, date_format: str):
+        self.time_column = time_column
+        self.date_format = date_format
+        self.data = None
+
+    @traced('data.load_csv')
+    def load_csv(self, filepath: str, skip_rows: list = None) -> pd.DataFrame:
+        """Load CSV file with proper configuration."""
+        print(f"📖 Loading: {filepath}")
+        df = pd.read_csv(filepath, skiprows=skip_rows)
+        print(f"   ├── Shape: {df.shape}")
+        print(f"   └── Columns: {len(df.columns)}")
+        return df
+
+    @traced('data.parse_datetime')
+    def parse_datetime(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert time column to datetime format."""
+        df = df.copy()
+        df[self.time_column] = pd.to_datetime(df[self.time_column], format=self.date_format)
+        print(f"✅ Datetime parsed: {df[self.time_column].min()} to {df[self.time_column].max()}")
+        return df
+
+    @traced('data.clean_data')
+    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove empty rows and handle missing values."""
+        initial_rows = len(df)
+
+        # Remove rows where all values (except Time) are NaN
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        df = df.dropna(subset=numeric_cols, how='all')
+
+        # Remove rows with NaN in Time column
+        df = df.dropna(subset=[self.time_column])
+
+        removed = initial_rows - len(df)
+        print(f"🧹 Cleaned: Removed {removed} empty/invalid rows")
+        return df
+
+
+@traced('data.load_and_merge')
+def load_and_merge_datasets(file1: str, file2: str, loader: TimeSeriesDataLoader) -> pd.DataFrame:
+    """
+    Load both CSV files and merge them chronologically.
+
+    Chain of Thought:
+    1. Load file 1 (March-May) -> skip row 0, use row 1 as header
+    2. Load file 2 (June-Aug) -> same process
+    3. Clean both datasets
+    4. Parse datetime
+    5. Concatenate
+    6. Sort by time
+    7. Reset index
+    """
+    print("=" * 60)
+    print("📊 STEP 1: LOADING DATASETS")
+    print("=" * 60)
+
+    # Load both files
+    df1 = loader.load_csv(file1, skip_rows=SKIP_ROWS)
+    df2 = loader.load_csv(file2, skip_rows=SKIP_ROWS)
+
+    print("\n" + "=" * 60)
+    print("🧹 STEP 2: CLEANING DATA")
+    print("=" * 60)
+
+    # Clean datasets
+    df1 = loader.clean_data(df1)
+    df2 = loader.clean_data(df2)
+
+    print("\n" + "=" * 60)
+    print("📅 STEP 3: PARSING DATETIME")
+    print("=" * 60)
+
+    # Parse datetime
+    df1 = loader.parse_datetime(df1)
+    df2 = loader.parse_datetime(df2)
+
+    print("\n" + "=" * 60)
+    print("🔗 STEP 4: MERGING DATASETS")
+    print("=" * 60)
+
+    # Merge (concatenate)
+    merged = pd.concat([df1, df2], ignore_index=True)
+    print(f"📊 Combined shape: {merged.shape}")
+
+    # Sort by time
+    merged = merged.sort_values(by=TIME_COLUMN, kind='stable').reset_index(drop=True)
+
+    # Remove duplicates based on Time (stable sort: the earlier file wins)
+    initial_len = len(merged)
+    merged = merged.drop_duplicates(subset=[TIME_COLUMN], keep='first')
+    print(f"🔄 Removed {initial_len - len(merged)} duplicate timestamps")
+
+    print(f"\n✅ Final merged dataset: {merged.shape}")
+    print(f"   ├── Date Range: {merged[TIME_COLUMN].min()} to {merged[TIME_COLUMN].max()}")
+    print(f"   └── Total Hours: {len(merged)}")
+
+    return merged
+
+
+def read_reading_header(filepath: str) -> list:
+    """Return the column names of a raw NB 11kV export without reading its rows."""
+    return list(pd.read_csv(filepath, skiprows=SKIP_ROWS, nrows=0).columns)
+
+
+def iter_reading_chunks(filepath: str, columns: list = None, chunksize: int = STREAM_CHUNK_ROWS,
+                        time_column: str = TIME_COLUMN, date_format: str = DATE_FORMAT_INPUT):
+    """
+    Read a raw NB 11kV export in chunks of parsed, cleaned rows.
+
+    Only ``time_column`` and ``columns`` are parsed, readings as float32.
+    Columns requested but absent from the file come back as NaN. Chunks are
+    yielded in file order; the file must already be in time order.
+    """
+    header = read_reading_header(filepath)
+    if columns is None:
+        columns = [col for col in header if col != time_column]
+    present = [col for col in columns if col in header]
+
+    reader = pd.read_csv(filepath, skiprows=SKIP_ROWS, usecols=[time_column] + present,
+                         dtype={col: np.float32 for col in present}, chunksize=chunksize)
+    last_time = None
+    for chunk in reader:
+        chunk = chunk.dropna(subset=present, how='all').dropna(subset=[time_column])
+        if chunk.empty:
+            continue
+        chunk[time_column] = pd.to_datetime(chunk[time_column], format=date_format)
+        times = chunk[time_column].to_numpy()
+        if (last_time is not None and times[0] < last_time) or (np.diff(times) < np.timedelta64(0)).any():
+            raise ValueError(f"{filepath} is not in time order; stream_merge_readings "
+                             f"requires sorted inputs")
+        last_time = times[-1]
+        yield chunk.reindex(columns=[time_column] + columns).reset_index(drop=True)
+
+
+def stream_merge_readings(filepaths: list, columns: list = None,
+                          chunksize: int = STREAM_CHUNK_ROWS,
+                          time_column: str = TIME_COLUMN, date_format: str = DATE_FORMAT_INPUT):
+    """
+    Merge time-ordered NB 11kV exports into one deduplicated hourly stream.
+
+    Yields DataFrame blocks in time order. Each file is read chunk by chunk
+    and the files are combined with a k-way merge: a block holds every
+    buffered row up to the smallest last-buffered timestamp across files,
+    so memory stays around ``len(filepaths) * chunksize`` rows. Duplicate
+    timestamps keep the row from the earliest file, as in
+    ``load_and_merge_datasets``.
+    """
+    if columns is None:
+        columns = []
+        for filepath in filepaths:
+            columns += [col for col in read_reading_header(filepath)
+                        if col != time_column and col not in columns]
+
+    streams = [iter_reading_chunks(filepath, columns, chunksize, time_column, date_format)
+               for filepath in filepaths]
+    buffers = {}
+    heap = []  # (last buffered timestamp, stream index)
+
+    def refill(idx):
+        for chunk in streams[idx]:
+            buffers[idx] = chunk
+            heapq.heappush(heap, (chunk[time_column].iloc[-1], idx))
+            return
+        buffers.pop(idx, None)
+
+    for idx in range(len(streams)):
+        refill(idx)
+
+    last_emitted = None
+    while heap:
+        bound, idx = heapq.heappop(heap)
+
+        # Everything at or before ``bound`` is final: no stream can still produce it
+        parts = []
+        for key in sorted(buffers):
+            chunk = buffers[key]
+            cut = int(chunk[time_column].searchsorted(bound, side='right'))
+            if cut:
+                parts.append(chunk.iloc[:cut])
+                buffers[key] = chunk.iloc[cut:]
+        if not parts:
+            # Buffer already drained by a tie at an earlier bound
+            refill(idx)
+            continue
+
+        block = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        block = block.sort_values(by=time_column, kind='stable')
+        block = block.drop_duplicates(subset=[time_column], keep='first')
+        if last_emitted is not None:
+            block = block[block[time_column] > last_emitted]
+        if not block.empty:
+            last_emitted = block[time_column].iloc[-1]
+            yield block.reset_index(drop=True)
+
+        refill(idx)
+
+
+@traced('data.stream_merge')
+def stream_merge_to_file(filepaths: list, output_path: str, chunksize: int = STREAM_CHUNK_ROWS,
+                         time_column: str = TIME_COLUMN) -> int:
+    """
+    Write the merged stream block by block to ``output_path`` (Parquet,
+    Feather or CSV by suffix), reporting gaps on the way.
+    Returns the number of rows written.
+    """
+    from .storage import FrameWriter
+
+    total_rows = 0
+    missing_hours = 0
+    previous = None
+    one_hour = pd.Timedelta(hours=1)
+
+    with FrameWriter(output_path, time_column) as writer:
+        for block in stream_merge_readings(filepaths, chunksize=chunksize,
+                                           time_column=time_column):
+            times = block[time_column]
+            steps = times.diff()
+            if previous is not None:
+                steps.iloc[0] = times.iloc[0] - previous
+            missing_hours += int((steps[steps > one_hour] // one_hour - 1).sum())
+            previous = times.iloc[-1]
+
+            writer.write(block)
+            total_rows += len(block)
+
+    print(f"✅ Streamed {len(filepaths)} files -> {output_path}")
+    print(f"   ├── Total records: {total_rows}")
+    if missing_hours:
+        print(f"   └── ⚠️ Missing {missing_hours} hourly readings")
+    else:
+        print("   └── No missing hourly readings!")
+    return total_rows
+
+
+@traced('data.standardize_time_format')
+def standardize_time_format(df: pd.DataFrame, time_col: str) -> pd.DataFrame:
+    """
+    Standardize time column to ISO format (YYYY-MM-DD HH:MM:SS).
+    """
+    df = df.copy()
+    df[time_col] = pd.to_datetime(df[time_col])
+    df[TIME_ISO_COLUMN] = df[time_col].dt.strftime(DATE_FORMAT_OUTPUT)
+    print(f"✅ Time standardized to ISO format: {DATE_FORMAT_OUTPUT}")
+    return df
+
+
+@traced('data.check_missing_hours')
+def check_missing_hours(df: pd.DataFrame, time_col: str) -> pd.DataFrame:
+    """
+    Check for missing hourly readings and report gaps.
+    """
+    df = df.copy()
+    df = df.set_index(time_col)
+
+    # Create complete hourly range
+    full_range = pd.date_range(start=df.index.min(), end=df.index.max(), freq='h')
+    missing = full_range.difference(df.index)
+
+    if len(missing) > 0:
+        print(f"⚠️ Missing {len(missing)} hourly readings:")
+        print(f"   First few: {list(missing[:5])}")
+    else:
+        print("✅ No missing hourly readings!")
+
+    return df.reset_index()
+
+
+def reindex_hourly(df: pd.DataFrame, time_col: str = TIME_COLUMN) -> pd.DataFrame:
+    """
+    Reindex to the complete hourly range so that row offsets equal hour
+    offsets (``shift(24)`` is the same hour yesterday). Inserted hours have
+    NaN readings; ``Time_ISO`` is regenerated when present.
+    """
+    columns = list(df.columns)
+    df = df.copy()
+    df[time_col] = pd.to_datetime(df[time_col])
+    df = df.set_index(time_col)
+
+    full_range = pd.date_range(start=df.index.min(), end=df.index.max(), freq='h')
+    n_inserted = len(full_range) - len(df)
+    if n_inserted:
+        df = df.reindex(full_range)
+        df.index.name = time_col
+        print(f"⏱️ Reindexed to hourly grid: inserted {n_inserted} missing hours")
+
+    df = df.reset_index()[columns]
+    if TIME_ISO_COLUMN in df.columns:
+        df[TIME_ISO_COLUMN] = df[time_col].dt.strftime(DATE_FORMAT_OUTPUT)
+    return df
+
+
+def load_merged_csv(filepath: str, time_col: str = TIME_COLUMN) -> pd.DataFrame:
+    """Reload an exported merged/processed CSV with the time column parsed.
+
+    See ``storage.load_frame`` for Parquet/Feather datasets and column projection.
+    """
+    df = pd.read_csv(filepath)
+    df[time_col] = pd.to_datetime(df[time_col])
+    return df
+
+
+def get_feeder_columns(df: pd.DataFrame) -> list:
+    """Return the raw feeder reading columns (numeric, excluding derived features)."""
+    derived = set(TEMPORAL_FEATURES) | set(WEATHER_FEATURES)
+    return [col for col in df.select_dtypes(include=[np.number]).columns
+            if col not in derived and not col.startswith('Season_')
+            and '_lag_' not in col and '_rolling_' not in col]
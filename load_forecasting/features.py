@@ -0,0 +1,652 @@
+# ============================================================
+# FEATURE ENGINEERING & MISSING VALUE HANDLING
+# ============================================================
+"""
+Temporal, lag and rolling features plus the missing value imputation used
+before model training.
+
+``impute_readings`` is the imputation stage of ``build_features``. The
+default ``"gap"`` method reindexes to the complete hourly grid (so lags
+point at the right hours) and fills every feeder at once from earlier
+readings only: the last reading across short gaps, the feeder's
+same-hour-of-week profile of the previous weeks across long ones. Features
+therefore never contain the hour they predict, and a fill does not change
+when later data arrives, which is what ``OnlineFeatureState``, the
+inference server and the walk-forward backtest rely on. ``"mean"`` is the
+notebook's column-mean fill over the whole frame (not causal).
+
+Imputed values only feed the features: the feeder columns of
+``build_features`` keep the readings, NaN where there was none, and
+training and scoring drop those rows.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .config import (IMPUTATION_METHOD, IMPUTE_MAX_CARRY_HOURS, LAG_HOURS, ROLLING_WINDOWS,
+                     TEMPORAL_FEATURES, TIME_COLUMN)
+from .data import get_feeder_columns, reindex_hourly
+from .telemetry import traced
+
+
+class FeatureEngineer:
+    """
+    Feature engineering class for time series data.
+    Creates temporal features for ML models.
+    """
+
+    @staticmethod
+    @traced('features.create_time_features')
+    def create_time_features(df: pd.DataFrame, time_column: str) -> pd.DataFrame:
+        """Extract temporal features from datetime column."""
+        df = df.copy()
+
+        # Ensure datetime type
+        if not pd.api.types.is_datetime64_any_dtype(df[time_column]):
+            df[time_column] = pd.to_datetime(df[time_column])
+
+        # Extract features
+        df['hour'] = df[time_column].dt.hour
+        df['day'] = df[time_column].dt.day
+        df['day_of_week'] = df[time_column].dt.dayofweek
+        df['month'] = df[time_column].dt.month
+        df['week_of_year'] = df[time_column].dt.isocalendar().week.astype(int)
+        df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
+
+        # Cyclical encoding for hour (captures 23:00 -> 00:00 continuity)
+        df['hour_sin'] = np.sin(2 * np.pi * df['hour'] / 24)
+        df['hour_cos'] = np.cos(2 * np.pi * df['hour'] / 24)
+
+        # Cyclical encoding for day of week
+        df['dow_sin'] = np.sin(2 * np.pi * df['day_of_week'] / 7)
+        df['dow_cos'] = np.cos(2 * np.pi * df['day_of_week'] / 7)
+
+        print(f"✅ Created {10} temporal features")
+        return df
+
+    @staticmethod
+    @traced('features.create_lag_features')
+    def create_lag_features(df: pd.DataFrame, target_col: str, lags: list) -> pd.DataFrame:
+        """Create lagged features for time series prediction."""
+        df = df.copy()
+        for lag in lags:
+            df[f'{target_col}_lag_{lag}'] = df[target_col].shift(lag)
+        print(f"✅ Created {len(lags)} lag features: {lags}")
+        return df
+
+    @staticmethod
+    @traced('features.create_rolling_features')
+    def create_rolling_features(df: pd.DataFrame, target_col: str, windows: list) -> pd.DataFrame:
+        """Create rolling window statistics."""
+        df = df.copy()
+        for window in windows:
+            df[f'{target_col}_rolling_mean_{window}'] = df[target_col].rolling(window=window).mean()
+            df[f'{target_col}_rolling_std_{window}'] = df[target_col].rolling(window=window).std()
+        print(f"✅ Created rolling features for windows: {windows}")
+        return df
+
+    @staticmethod
+    @traced('features.create_feeder_features')
+    def create_feeder_features(df: pd.DataFrame, feeder_cols: list, lags: list,
+                               windows: list) -> pd.DataFrame:
+        """Create lag and rolling features for every feeder in one block insert."""
+        matrix, columns = build_feature_matrix(df[feeder_cols].to_numpy(), feeder_cols, lags, windows)
+        block = pd.DataFrame(matrix, columns=columns, index=df.index)
+        print(f"✅ Created {len(columns)} lag/rolling features for {len(feeder_cols)} feeders")
+        return pd.concat([df, block], axis=1)
+
+
+def feature_matrix_columns(feeder_cols: list, lags: list, windows: list) -> list:
+    """
+    Column names of ``build_feature_matrix`` output. Columns are grouped by
+    feature (every feeder's ``lag_1``, then every feeder's ``lag_2``, ...);
+    for a single feeder this is the order of ``create_lag_features``
+    followed by ``create_rolling_features``.
+    """
+    suffixes = [f'lag_{lag}' for lag in lags]
+    for window in windows:
+        suffixes.append(f'rolling_mean_{window}')
+        suffixes.append(f'rolling_std_{window}')
+    return [f'{feeder}_{suffix}' for suffix in suffixes for feeder in feeder_cols]
+
+
+def build_feature_matrix(values: np.ndarray, feeder_cols: list, lags: list = None,
+                         windows: list = None, dtype=np.float32):
+    """
+    Compute every lag and rolling mean/std for N feeders in one pass.
+
+    ``values`` is the (hours x feeders) reading matrix. Returns
+    ``(matrix, columns)`` where ``matrix`` is a preallocated
+    (hours x (len(lags) + 2 * len(windows)) * feeders) array and ``columns``
+    names each matrix column. Semantics match ``shift(lag)`` and
+    ``rolling(window).mean()/std()``: NaN for warm-up rows and for any
+    window containing a missing reading.
+    """
+    lags = LAG_HOURS if lags is None else lags
+    windows = ROLLING_WINDOWS if windows is None else windows
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_rows, n_feeders = values.shape
+    n_blocks = len(lags) + 2 * len(windows)
+
+    # One contiguous (hours x feeders) block per feature; only warm-up rows
+    # are NaN-filled, everything else is written exactly once
+    matrix = np.empty((n_rows, n_blocks, n_feeders), dtype=dtype)
+
+    # Lags: shifted copies of the reading block
+    for k, lag in enumerate(lags):
+        matrix[:lag, k] = np.nan
+        if lag < n_rows:
+            matrix[lag:, k] = values[:n_rows - lag]
+
+    # Rolling windows: cumulative sums of centred values (limits cancellation
+    # in the sum of squares) plus a cumulative count of missing readings
+    missing = np.isnan(values)
+    has_missing = missing.any()
+    centre = np.nanmean(values, axis=0) if n_rows and not missing.all() else np.zeros(n_feeders)
+    centre = np.where(np.isnan(centre), 0.0, centre)
+    centred = values - centre
+    if has_missing:
+        centred[missing] = 0.0
+
+    csum = np.zeros((n_rows + 1, n_feeders))
+    csq = np.zeros((n_rows + 1, n_feeders))
+    np.cumsum(centred, axis=0, out=csum[1:])
+    np.cumsum(np.square(centred, out=centred), axis=0, out=csq[1:])
+    if has_missing:
+        cnan = np.zeros((n_rows + 1, n_feeders), dtype=np.int32)
+        np.cumsum(missing, axis=0, out=cnan[1:])
+
+    for k, window in enumerate(windows):
+        mean_block = len(lags) + 2 * k
+        matrix[:window - 1, mean_block:mean_block + 2] = np.nan
+        if window > n_rows:
+            continue
+        win_sum = csum[window:] - csum[:-window]
+        win_sq = csq[window:] - csq[:-window]
+
+        mean = win_sum / window
+        if window > 1:
+            var = win_sq - win_sum * mean
+            var /= window - 1
+            np.maximum(var, 0.0, out=var)
+            std = np.sqrt(var, out=var)
+        else:
+            std = np.full_like(mean, np.nan)
+        mean += centre
+
+        if has_missing:
+            incomplete = (cnan[window:] - cnan[:-window]) > 0
+            mean[incomplete] = np.nan
+            std[incomplete] = np.nan
+
+        matrix[window - 1:, mean_block] = mean
+        matrix[window - 1:, mean_block + 1] = std
+
+    columns = feature_matrix_columns(feeder_cols, lags, windows)
+    return matrix.reshape(n_rows, n_blocks * n_feeders), columns
+
+
+# Cyclical encodings indexed by hour / day of week, computed with the same
+# vectorized expressions as create_time_features
+HOUR_SIN = np.sin(2 * np.pi * np.arange(24) / 24)
+HOUR_COS = np.cos(2 * np.pi * np.arange(24) / 24)
+DOW_SIN = np.sin(2 * np.pi * np.arange(7) / 7)
+DOW_COS = np.cos(2 * np.pi * np.arange(7) / 7)
+
+_HOUR = pd.Timedelta(hours=1)
+
+
+class OnlineFeatureState:
+    """
+    Streaming counterpart of FeatureEngineer for hourly SCADA updates.
+
+    Holds a ring buffer of the last max(LAG_HOURS) readings per feeder and
+    running sums / sums of squares for each rolling window. Each call to
+    ``update`` consumes one hourly row and returns the feature vector the
+    batch path (``impute_readings`` + ``create_time_features`` +
+    ``build_feature_matrix``) would produce for that row, in O(features)
+    time. Rows must arrive in time order; missing hours are filled in as
+    NaN rows, like the batch frame after ``reindex_hourly``.
+
+    With ``imputation="gap"`` missing readings are filled as ``impute_gaps``
+    fills them, from the last reading per feeder and running hour-of-week
+    sums, which is possible online because that fill only looks back.
+    ``"mean"`` needs the whole history and is not supported; ``None``
+    leaves gaps as NaN.
+    """
+
+    def __init__(self, feeder_cols: list, lags: list = None, windows: list = None,
+                 imputation: str = IMPUTATION_METHOD,
+                 max_carry_hours: int = IMPUTE_MAX_CARRY_HOURS):
+        if imputation not in ('gap', None):
+            raise ValueError(f"online updates support 'gap' imputation or None, not {imputation!r}")
+        self.feeder_cols = list(feeder_cols)
+        self.lags = list(LAG_HOURS if lags is None else lags)
+        self.windows = list(ROLLING_WINDOWS if windows is None else windows)
+        self.imputation = imputation
+        self.max_carry_hours = max_carry_hours
+        self.size = max(self.lags + self.windows)
+        self.columns = TEMPORAL_FEATURES + feature_matrix_columns(self.feeder_cols, self.lags,
+                                                                  self.windows)
+
+        n_feeders = len(self.feeder_cols)
+        n_windows = len(self.windows)
+        self.buffer = np.full((self.size, n_feeders), np.nan)
+        self.head = 0
+        self.n_seen = 0
+        self.last_time = None
+        # Running statistics are kept on values centred at the first reading
+        self.centre = np.zeros(n_feeders)
+        self.win_sum = np.zeros((n_windows, n_feeders))
+        self.win_sumsq = np.zeros((n_windows, n_feeders))
+        self.win_nan = np.zeros((n_windows, n_feeders), dtype=np.int64)
+        # Gap fill: last reading (and its row) per feeder, readings per hour of week
+        self.last_reading = np.full(n_feeders, np.nan)
+        self.last_reading_row = np.full(n_feeders, -1, dtype=np.int64)
+        self.slot_sum = np.zeros((168, n_feeders))
+        self.slot_count = np.zeros((168, n_feeders), dtype=np.int64)
+
+        self._lag_arr = np.array(self.lags)
+        self._win_arr = np.array(self.windows)
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, feeder_cols: list, lags: list = None,
+                     windows: list = None, time_column: str = TIME_COLUMN,
+                     imputation: str = IMPUTATION_METHOD) -> 'OnlineFeatureState':
+        """
+        Warm a state from a readings frame in one vectorized pass: the gap
+        fill statistics cover the whole frame, the buffer its last rows.
+        """
+        state = cls(feeder_cols, lags, windows, imputation)
+        df = reindex_hourly(df[[time_column] + state.feeder_cols], time_column)
+        raw = df[state.feeder_cols].to_numpy(dtype=np.float64)
+        if imputation == 'gap':
+            values = impute_gaps(df, state.feeder_cols, time_column,
+                                 state.max_carry_hours)[0][state.feeder_cols].to_numpy()
+            times = pd.DatetimeIndex(df[time_column])
+            weeks, _ = _fold_weeks(raw, times.dayofweek.to_numpy() * 24 + times.hour.to_numpy())
+            observed = ~np.isnan(weeks)
+            # Sequential sums over the weeks, in the order update() adds them
+            state.slot_sum = np.cumsum(np.where(observed, weeks, 0.0), axis=0)[-1]
+            state.slot_count = observed.sum(axis=0)
+            rows = np.arange(len(raw))[:, None]
+            state.last_reading_row = np.where(np.isnan(raw), -1, rows).max(axis=0)
+            state.last_reading = np.where(state.last_reading_row >= 0,
+                                          raw[state.last_reading_row, np.arange(raw.shape[1])],
+                                          np.nan)
+        else:
+            values = raw
+
+        tail = values[-state.size:]
+        state.buffer[:len(tail)] = tail
+        state.head = len(tail) % state.size
+        state.n_seen = len(values)
+        state.last_time = pd.Timestamp(df[time_column].iloc[-1])
+        state.centre = np.where(np.isnan(tail[0]), 0.0, tail[0])
+        state._refresh_sums()
+        return state
+
+    @staticmethod
+    def time_features(timestamp) -> np.ndarray:
+        """Temporal features of a single timestamp, in TEMPORAL_FEATURES order."""
+        ts = pd.Timestamp(timestamp)
+        dow = ts.dayofweek
+        return np.array([ts.hour, ts.day, dow, ts.month, ts.isocalendar()[1], int(dow >= 5),
+                         HOUR_SIN[ts.hour], HOUR_COS[ts.hour], DOW_SIN[dow], DOW_COS[dow]],
+                        dtype=np.float64)
+
+    def update(self, timestamp, values) -> np.ndarray:
+        """
+        Consume one hourly reading row and return its feature vector.
+
+        Hours skipped since the previous row are pushed as missing readings
+        first, as ``reindex_hourly`` inserts them in the batch path; a row
+        that is not on the hourly grid after the previous one raises
+        ``ValueError``.
+        """
+        timestamp = pd.Timestamp(timestamp)
+        if self.last_time is not None:
+            step = timestamp - self.last_time
+            if step <= pd.Timedelta(0) or step % _HOUR:
+                raise ValueError(f"reading at {timestamp} does not follow the last one "
+                                 f"({self.last_time}) on the hourly grid")
+            for _ in range(1, step // _HOUR):
+                self._push(self.last_time + _HOUR, np.full(len(self.feeder_cols), np.nan))
+        return self._push(timestamp, values)
+
+    def _push(self, timestamp: pd.Timestamp, values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64).reshape(len(self.feeder_cols))
+        if self.imputation == 'gap':
+            values = self._impute(timestamp, values)
+        if self.n_seen == 0:
+            self.centre = np.where(np.isnan(values), 0.0, values)
+
+        # Lags: buffer rows t-1 ... t-max (still NaN before the buffer fills)
+        lag_block = self.buffer[(self.head - self._lag_arr) % self.size]
+
+        # Rolling windows: add the new value, drop the one leaving each window
+        x = values - self.centre
+        x_nan = np.isnan(x)
+        x = np.where(x_nan, 0.0, x)
+        self.win_sum += x
+        self.win_sumsq += x * x
+        self.win_nan += x_nan
+
+        leaving = self.buffer[(self.head - self._win_arr) % self.size] - self.centre
+        leaving[self.n_seen < self._win_arr] = 0.0
+        leaving_nan = np.isnan(leaving)
+        leaving = np.where(leaving_nan, 0.0, leaving)
+        self.win_sum -= leaving
+        self.win_sumsq -= leaving * leaving
+        self.win_nan -= leaving_nan
+
+        # Push the new reading
+        self.buffer[self.head] = values
+        self.head = (self.head + 1) % self.size
+        self.n_seen += 1
+        self.last_time = timestamp
+        if self.n_seen % self.size == 0:
+            self._refresh_sums()
+
+        rolling_block = self._rolling_stats()
+        return np.concatenate([self.time_features(timestamp), lag_block.ravel(), rolling_block.ravel()])
+
+    def _impute(self, timestamp: pd.Timestamp, values: np.ndarray) -> np.ndarray:
+        """``impute_gaps`` fill of one row from the readings before it; updates the fill state."""
+        slot = timestamp.dayofweek * 24 + timestamp.hour
+        missing = np.isnan(values)
+        started = missing & (self.last_reading_row >= 0)
+        carry = started & (self.n_seen - self.last_reading_row <= self.max_carry_hours)
+        long = started & ~carry
+
+        filled = values.copy()
+        filled[carry] = self.last_reading[carry]
+        if long.any():
+            count = self.slot_count[slot]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                profile = self.slot_sum[slot] / count
+            fill = np.where(count > 0, profile, self.last_reading)
+            filled[long] = fill[long]
+
+        observed = ~missing
+        self.slot_sum[slot, observed] += values[observed]
+        self.slot_count[slot, observed] += 1
+        self.last_reading[observed] = values[observed]
+        self.last_reading_row[observed] = self.n_seen
+        return np.round(filled, 3)
+
+    def _rolling_stats(self) -> np.ndarray:
+        """(windows x 2 x feeders) rolling mean and std for the latest row."""
+        w = self._win_arr[:, None].astype(np.float64)
+        mean = self.win_sum / w
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = (self.win_sumsq - self.win_sum * mean) / (w - 1)
+        std = np.sqrt(np.maximum(var, 0.0))
+        std[self._win_arr == 1] = np.nan
+
+        invalid = (self.win_nan > 0) | (self.n_seen < self._win_arr)[:, None]
+        mean = np.where(invalid, np.nan, mean + self.centre)
+        std = np.where(invalid, np.nan, std)
+        return np.stack([mean, std], axis=1)
+
+    def _refresh_sums(self):
+        """Recompute running sums from the buffer to stop floating-point drift."""
+        for k, window in enumerate(self.windows):
+            recent = self.buffer[(self.head - 1 - np.arange(min(window, self.n_seen))) % self.size]
+            recent = recent - self.centre
+            recent_nan = np.isnan(recent)
+            recent = np.where(recent_nan, 0.0, recent)
+            self.win_sum[k] = recent.sum(axis=0)
+            self.win_sumsq[k] = (recent * recent).sum(axis=0)
+            self.win_nan[k] = recent_nan.sum(axis=0)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable snapshot of the state."""
+        return {
+            'feeder_cols': self.feeder_cols,
+            'lags': self.lags,
+            'windows': self.windows,
+            'buffer': self.buffer.tolist(),
+            'head': self.head,
+            'n_seen': self.n_seen,
+            'last_time': None if self.last_time is None else self.last_time.isoformat(),
+            'centre': self.centre.tolist(),
+            'win_sum': self.win_sum.tolist(),
+            'win_sumsq': self.win_sumsq.tolist(),
+            'win_nan': self.win_nan.tolist(),
+            'imputation': self.imputation,
+            'max_carry_hours': self.max_carry_hours,
+            'last_reading': self.last_reading.tolist(),
+            'last_reading_row': self.last_reading_row.tolist(),
+            'slot_sum': self.slot_sum.tolist(),
+            'slot_count': self.slot_count.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'OnlineFeatureState':
+        # Snapshots from before gap filling carry no fill state: keep NaN gaps
+        state = cls(data['feeder_cols'], data['lags'], data['windows'], data.get('imputation'),
+                    data.get('max_carry_hours', IMPUTE_MAX_CARRY_HOURS))
+        state.buffer = np.array(data['buffer'], dtype=np.float64)
+        state.head = data['head']
+        state.n_seen = data['n_seen']
+        state.last_time = None if data['last_time'] is None else pd.Timestamp(data['last_time'])
+        state.centre = np.array(data['centre'], dtype=np.float64)
+        state.win_sum = np.array(data['win_sum'], dtype=np.float64)
+        state.win_sumsq = np.array(data['win_sumsq'], dtype=np.float64)
+        state.win_nan = np.array(data['win_nan'], dtype=np.int64)
+        if state.imputation is not None:
+            state.last_reading = np.array(data['last_reading'], dtype=np.float64)
+            state.last_reading_row = np.array(data['last_reading_row'], dtype=np.int64)
+            state.slot_sum = np.array(data['slot_sum'], dtype=np.float64)
+            state.slot_count = np.array(data['slot_count'], dtype=np.int64)
+        return state
+
+    def save(self, path: str):
+        """Write the state as JSON so a restarted process can resume."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'OnlineFeatureState':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def impute_missing_values(df: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+    """
+    Fill missing readings with the column mean (rounded to 3 decimals) and
+    round all numeric columns to 3 decimal places.
+    """
+    df = df.copy()
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    for col in columns:
+        missing_count = df[col].isna().sum()
+        if missing_count > 0:
+            col_mean = round(float(df[col].mean()), 3)  # Round to 3 decimals
+            df[col] = df[col].fillna(col_mean)
+            print(f"   ✅ {col}: Filled {missing_count} gaps with mean = {col_mean}")
+
+    # Round ALL numeric columns to 3 decimal places
+    for col in columns:
+        df[col] = df[col].round(3)
+
+    return df
+
+
+def _fold_weeks(values: np.ndarray, how: np.ndarray):
+    """
+    Consecutive hourly rows starting at hour-of-week ``how[0]``, NaN-padded
+    to whole weeks and folded to (weeks x 168 x columns); returns
+    ``(weeks, lead)`` with ``lead`` the padding before the first row.
+    """
+    n_rows, n_cols = values.shape
+    lead = int(how[0])
+    n_weeks = -(-(lead + n_rows) // 168)
+    padded = np.full((n_weeks * 168, n_cols), np.nan)
+    padded[lead:lead + n_rows] = values
+    return padded.reshape(n_weeks, 168, n_cols), lead
+
+
+def _past_hour_of_week_profile(values: np.ndarray, how: np.ndarray) -> np.ndarray:
+    """
+    (rows x columns) mean of the non-missing ``values`` at the same hour of
+    week in earlier weeks only (NaN where there is none yet). Rows must be
+    consecutive hours starting at hour-of-week ``how[0]``.
+    """
+    n_rows, n_cols = values.shape
+    weeks, lead = _fold_weeks(values, how)
+    n_weeks = len(weeks)
+
+    # Accumulate over the weeks before each one
+    observed = ~np.isnan(weeks)
+    sums = np.zeros_like(weeks)
+    counts = np.zeros(weeks.shape, dtype=np.int64)
+    np.cumsum(np.where(observed, weeks, 0.0)[:-1], axis=0, out=sums[1:])
+    np.cumsum(observed[:-1], axis=0, out=counts[1:])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profile = sums / counts
+    return profile.reshape(n_weeks * 168, n_cols)[lead:lead + n_rows]
+
+
+def fill_gaps(values: np.ndarray, hour_of_week: np.ndarray,
+              max_carry_hours: int = IMPUTE_MAX_CARRY_HOURS):
+    """
+    Array core of ``impute_gaps``: ``values`` is the (hours x columns)
+    reading matrix on the complete hourly grid and ``hour_of_week`` the
+    ``dayofweek * 24 + hour`` of every row. Returns ``(filled, carry, long)``
+    with the unrounded fill and the masks of cells carried forward and
+    filled from the hour-of-week profile.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+
+    # Last observed row at or before every cell (-1 when there is none)
+    rows = np.arange(len(values))[:, None]
+    prev = np.maximum.accumulate(np.where(missing, -1, rows), axis=0)
+    started = missing & (prev >= 0)
+    carry = started & (rows - prev <= max_carry_hours)
+    long = started & ~carry
+
+    filled = values.copy()
+    r, c = np.nonzero(carry)
+    filled[r, c] = values[prev[r, c], c]
+
+    if long.any():
+        profile = _past_hour_of_week_profile(values, hour_of_week)
+        r, c = np.nonzero(long)
+        fill = profile[r, c]
+        filled[r, c] = np.where(np.isnan(fill), values[prev[r, c], c], fill)
+    return filled, carry, long
+
+
+def impute_gaps(df: pd.DataFrame, columns: list = None, time_column: str = TIME_COLUMN,
+                max_carry_hours: int = IMPUTE_MAX_CARRY_HOURS):
+    """
+    Causal gap imputation on the complete hourly grid.
+
+    Missing hours are inserted first. A missing reading up to
+    ``max_carry_hours`` after the feeder's last reading repeats that
+    reading; later hours of a longer gap take the feeder's mean at the same
+    hour of the week over the earlier weeks (the last reading if that slot
+    was never observed). Every fill uses only readings before the cell, so
+    a lag or rolling feature never sees the hour it predicts or anything
+    after it, and the fill of a cell is the same whether the frame ends
+    there or runs on. Cells before a feeder's first reading stay NaN. All
+    columns are filled in one vectorized pass (``fill_gaps``) and rounded
+    to 3 decimals, like ``impute_missing_values``.
+
+    Returns ``(df, mask)`` where ``mask`` is the (hours x columns) boolean
+    array of cells that had no reading.
+    """
+    df = reindex_hourly(df, time_column)
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    values = df[columns].to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+
+    times = pd.DatetimeIndex(df[time_column])
+    how = times.dayofweek.to_numpy() * 24 + times.hour.to_numpy()
+    filled, carry, long = fill_gaps(values, how, max_carry_hours)
+    df[columns] = np.round(filled, 3)
+
+    n_leading = (missing & ~carry & ~long).sum(axis=0)
+    for col, k_carry, k_long, k_leading in zip(columns, carry.sum(axis=0), long.sum(axis=0),
+                                               n_leading):
+        if k_carry or k_long or k_leading:
+            print(f"   ✅ {col}: Filled {k_carry + k_long} gaps "
+                  f"({k_carry} carried forward, {k_long} hour-of-week profile)"
+                  + (f", {k_leading} hours before the first reading left missing"
+                     if k_leading else ""))
+    return df, missing
+
+
+@traced('features.impute_readings')
+def impute_readings(df: pd.DataFrame, columns: list = None, method: str = IMPUTATION_METHOD,
+                    time_column: str = TIME_COLUMN) -> pd.DataFrame:
+    """Imputation stage of ``build_features``: ``"gap"`` (``impute_gaps``) or ``"mean"``."""
+    if method == 'gap':
+        return impute_gaps(df, columns, time_column)[0]
+    if method == 'mean':
+        return impute_missing_values(df, columns)
+    raise ValueError(f"unknown imputation method: {method}")
+
+
+@traced('features.build_features')
+def build_features(df: pd.DataFrame, target_col: str, lags: list = None,
+                   windows: list = None, time_column: str = TIME_COLUMN,
+                   all_feeders: bool = False, imputation: str = IMPUTATION_METHOD,
+                   imputed: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Run the full feature pipeline on merged readings: imputation
+    (``impute_readings``, or the already imputed copy ``imputed`` of
+    ``df``), temporal features, lag and rolling features for ``target_col``
+    (or for every feeder with ``all_feeders``), then drop the warm-up rows
+    and round to 3 decimals.
+
+    The feeder columns keep the readings on the hourly grid (NaN where
+    there was none), so imputed values never become targets.
+    """
+    lags = LAG_HOURS if lags is None else lags
+    windows = ROLLING_WINDOWS if windows is None else windows
+    fe = FeatureEngineer()
+    feeder_cols = get_feeder_columns(df)
+
+    if imputed is None:
+        imputed = impute_readings(df, method=imputation, time_column=time_column)
+    df_features = fe.create_time_features(imputed, time_column)
+    if all_feeders:
+        df_features = fe.create_feeder_features(df_features, feeder_cols, lags, windows)
+    else:
+        df_features = fe.create_lag_features(df_features, target_col, lags)
+        df_features = fe.create_rolling_features(df_features, target_col, windows)
+    readings = df[feeder_cols].set_index(pd.DatetimeIndex(pd.to_datetime(df[time_column])))
+    df_features[feeder_cols] = readings.reindex(df_features[time_column]).to_numpy()
+
+    # Drop rows with NaN (from lag/rolling features - only at beginning due to window size)
+    initial_len = len(df_features)
+    df_features = df_features.dropna(
+        subset=[col for col in df_features.columns if '_lag_' in col or '_rolling_' in col])
+    print(f"🧹 Dropped {initial_len - len(df_features)} rows due to lag/rolling NaN values")
+
+    # Round all numeric columns to 3 decimal places in final dataset
+    numeric_final = df_features.select_dtypes(include=[np.number]).columns.tolist()
+    for col in numeric_final:
+        df_features[col] = df_features[col].round(3)
+
+    return df_features
+
+
+def select_feature_columns(df: pd.DataFrame, target_col: str) -> list:
+    """Temporal + lag + rolling feature columns for ``target_col``, in model order."""
+    lag_features = [col for col in df.columns if '_lag_' in col and target_col in col]
+    rolling_features = [col for col in df.columns if '_rolling_' in col and target_col in col]
+    return TEMPORAL_FEATURES + lag_features + rolling_features
+
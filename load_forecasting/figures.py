@@ -0,0 +1,547 @@
+# ============================================================
+# FIGURE RENDERING
+# ============================================================
+"""
+The notebook's five analysis figures as a cached, parallel stage.
+
+Every figure is drawn from a small dict of reduced inputs rather than from
+the full history:
+
+* time series are downsampled with Largest-Triangle-Three-Buckets (LTTB)
+  to ``FIGURE_MAX_POINTS``, which keeps the peaks and troughs a plain
+  stride would drop
+* histograms and box plots are drawn from precomputed counts and quartiles,
+  and scatter clouds from a fixed-seed sample of ``FIGURE_MAX_SCATTER``
+  points
+
+so drawing costs the same for six months or ten years of readings; only the
+numpy reductions grow with the data. Model figures are reduced at training
+time (``train --figure-inputs``), so their inputs file has a bounded size.
+
+A figure is skipped when its key - the ``StageCache`` key of its input files
+(or upstream stage keys in ``run``) and the figure settings - is the one
+recorded in the output directory's manifest and the PNG exists.
+Stale figures are drawn on a process pool, one figure per task.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .config import (FIGURE_DPI, FIGURE_HEAD_SAMPLES, FIGURE_MAX_POINTS, FIGURE_MAX_SCATTER,
+                     FIGURES_MANIFEST, RANDOM_STATE, TIME_COLUMN, WEATHER_FEATURES)
+
+FIGURE_INPUTS_FORMAT = "load_forecasting.figure_inputs"
+FIGURE_INPUTS_VERSION = 1
+
+DATA_FIGURES = ['data_exploration', 'weather_features_visualization']
+MODEL_FIGURES = ['model_evaluation', 'model_comparison_visualization',
+                 'feature_importance_comparison']
+
+
+# ------------------------------------------------------------
+# Reductions
+# ------------------------------------------------------------
+
+def lttb(x, y, n_out: int = FIGURE_MAX_POINTS) -> np.ndarray:
+    """
+    Indices of the ``n_out`` points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the previously kept
+    point and the mean of the next bucket. ``x`` must be increasing.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n_out - 2 buckets over points 1 .. n-2; bucket i is [bounds[i], bounds[i + 1])
+    bounds = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    counts = np.diff(np.r_[bounds, n - 1])
+    mean_x = np.add.reduceat(x[1:n - 1], bounds[:-1] - 1) / counts[:-1]
+    mean_y = np.add.reduceat(y[1:n - 1], bounds[:-1] - 1) / counts[:-1]
+    # The last bucket looks ahead to the final point
+    next_x = np.r_[mean_x[1:], x[-1]]
+    next_y = np.r_[mean_y[1:], y[-1]]
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def sample_indices(n: int, max_points: int = FIGURE_MAX_SCATTER) -> np.ndarray:
+    """Sorted fixed-seed sample of at most ``max_points`` of ``n`` row indices."""
+    if n <= max_points:
+        return np.arange(n)
+    rng = np.random.default_rng(RANDOM_STATE)
+    return np.sort(rng.choice(n, max_points, replace=False))
+
+
+def histogram(values, bins: int = 50) -> dict:
+    values = np.asarray(values, dtype=np.float64)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+    return {'counts': counts, 'edges': edges}
+
+
+def box_stats(values, label: str, max_fliers: int = FIGURE_MAX_SCATTER) -> dict:
+    """``Axes.bxp`` statistics (1.5 IQR whiskers), with at most ``max_fliers`` fliers drawn."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    fliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    return {'label': label, 'med': med, 'q1': q1, 'q3': q3,
+            'whislo': inside.min(), 'whishi': inside.max(),
+            'fliers': fliers[sample_indices(len(fliers), max_fliers)]}
+
+
+def feature_importances(model, feature_names: list):
+    """
+    Importance per feature of a fitted model: ``feature_importances_`` of the
+    scikit-learn API, normalised gain of a native booster (whose features
+    may be named f0, f1, ...), or None for models without importances.
+    """
+    if hasattr(model, 'feature_importances_'):
+        return np.asarray(model.feature_importances_, dtype=np.float64)
+    if not hasattr(model, 'get_score'):
+        return None
+    index = {name: j for j, name in enumerate(feature_names)}
+    index.update({f"f{j}": j for j in range(len(feature_names))})
+    values = np.zeros(len(feature_names))
+    for name, gain in model.get_score(importance_type='gain').items():
+        values[index[name]] = gain
+    return values / values.sum() if values.sum() > 0 else values
+
+
+def _top(feature_names: list, importances, k: int = 15) -> dict:
+    order = np.argsort(importances)[-k:]
+    return {'features': [feature_names[j] for j in order],
+            'values': np.asarray(importances)[order]}
+
+
+def exploration_inputs(df_merged, target_col: str) -> dict:
+    """Reduced inputs of ``data_exploration``: LTTB series, histogram, hour/weekday means."""
+    times = df_merged[TIME_COLUMN].to_numpy()
+    load = df_merged[target_col].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(load)
+    times, values = times[valid], load[valid]
+    kept = lttb(times.astype('datetime64[ns]').astype(np.int64), values)
+
+    hour = df_merged[TIME_COLUMN].dt.hour.to_numpy()[valid]
+    weekday = df_merged[TIME_COLUMN].dt.dayofweek.to_numpy()[valid]
+    return {
+        'target': target_col,
+        'times': times[kept],
+        'values': values[kept],
+        'hist': histogram(values),
+        'hourly': np.bincount(hour, values, 24) / np.maximum(np.bincount(hour, minlength=24), 1),
+        'daily': np.bincount(weekday, values, 7) / np.maximum(np.bincount(weekday, minlength=7), 1),
+    }
+
+
+def weather_inputs(df_weather, target_col: str = None) -> dict:
+    """Reduced inputs of ``weather_features_visualization`` from ``add_weather_features`` output."""
+    temperature = df_weather['Temperature_C'].to_numpy(dtype=np.float64)
+    season = df_weather['Season'].to_numpy()
+    seasons = {}
+    for name in ['Winter', 'Spring', 'Summer', 'Autumn']:
+        in_season = temperature[season == name]
+        if len(in_season):
+            # Each season keeps its own 20 bins, as in the notebook
+            seasons[name] = histogram(in_season, bins=20)
+
+    sample = sample_indices(len(df_weather))
+    hour = df_weather[TIME_COLUMN].dt.hour.to_numpy()
+    inputs = {
+        'seasons': seasons,
+        'scatter': {'temperature': temperature[sample],
+                    'humidity': df_weather['Humidity_Pct'].to_numpy()[sample],
+                    'season_code': df_weather['Season_Code'].to_numpy()[sample]},
+        'hourly_temp': np.bincount(hour, temperature, 24) / np.maximum(np.bincount(hour, minlength=24), 1),
+        'target': None,
+    }
+    if target_col is None:
+        load_cols = [col for col in df_weather.select_dtypes(include=[np.number]).columns
+                     if col not in WEATHER_FEATURES and 'Season_' not in col]
+        target_col = load_cols[0] if load_cols else None
+    if target_col is not None:
+        load = df_weather[target_col].to_numpy(dtype=np.float64)
+        ramadan = df_weather['Is_Ramadan'].to_numpy() == 1
+        if (~np.isnan(load[ramadan])).any() and (~np.isnan(load[~ramadan])).any():
+            inputs['target'] = target_col
+            inputs['boxes'] = [box_stats(load[~ramadan], 'Non-Ramadan'),
+                               box_stats(load[ramadan], 'Ramadan')]
+    return inputs
+
+
+def evaluation_inputs(y_test, y_pred, feature_names: list, importances) -> dict:
+    """Reduced inputs of ``model_evaluation`` (the best model on the test split)."""
+    y_test = np.asarray(y_test, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    sample = sample_indices(len(y_test))
+    return {
+        'actual_head': y_test[:FIGURE_HEAD_SAMPLES],
+        'predicted_head': y_pred[:FIGURE_HEAD_SAMPLES],
+        'scatter': {'actual': y_test[sample], 'predicted': y_pred[sample]},
+        'range': [float(y_test.min()), float(y_test.max())],
+        'residuals': histogram(y_test - y_pred),
+        'importance': None if importances is None else _top(feature_names, importances),
+    }
+
+
+def comparison_inputs(comparison_df, y_test, predictions: dict) -> dict:
+    """Reduced inputs of ``model_comparison_visualization``."""
+    return {
+        'results': {name: {col: float(value) for col, value in row.items()}
+                    for name, row in comparison_df.iterrows()},
+        'best': comparison_df.index[0],
+        'actual_head': np.asarray(y_test, dtype=np.float64)[:FIGURE_HEAD_SAMPLES],
+        'predictions_head': {name: np.asarray(pred)[:FIGURE_HEAD_SAMPLES]
+                             for name, pred in predictions.items()},
+    }
+
+
+def importance_inputs(trained_models: dict, feature_names: list) -> dict:
+    """Top-15 importances per tree model for ``feature_importance_comparison``."""
+    top = {}
+    for name in ['XGBoost', 'Random Forest', 'LightGBM']:
+        if name in trained_models:
+            values = feature_importances(trained_models[name].model, feature_names)
+            if values is not None:
+                top[name] = _top(feature_names, values)
+    return top
+
+
+# ------------------------------------------------------------
+# Model figure inputs file (train --figure-inputs)
+# ------------------------------------------------------------
+
+def _to_json(value):
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def save_figure_inputs(path: str, target: str, evaluation: dict, comparison: dict = None,
+                       importances: dict = None):
+    payload = {'format': FIGURE_INPUTS_FORMAT, 'version': FIGURE_INPUTS_VERSION,
+               'target': target, 'model_evaluation': evaluation}
+    if comparison is not None:
+        payload['model_comparison_visualization'] = comparison
+    if importances:
+        payload['feature_importance_comparison'] = importances
+    with open(path, 'w') as f:
+        json.dump(_to_json(payload), f)
+
+
+def load_figure_inputs(path: str) -> dict:
+    with open(path) as f:
+        payload = json.load(f)
+    if not isinstance(payload, dict) or payload.get('format') != FIGURE_INPUTS_FORMAT:
+        raise ValueError(f"{path} is not a figure inputs file "
+                         f"(python -m load_forecasting train --figure-inputs writes one)")
+    if payload['version'] > FIGURE_INPUTS_VERSION:
+        raise ValueError(f"{path} is figure inputs version {payload['version']}; "
+                         f"this package reads up to version {FIGURE_INPUTS_VERSION}")
+    return payload
+
+
+# ------------------------------------------------------------
+# Drawing (worker side)
+# ------------------------------------------------------------
+
+def _bars_from_hist(ax, hist, **kwargs):
+    edges = np.asarray(hist['edges'])
+    ax.hist(edges[:-1], bins=edges, weights=hist['counts'], **kwargs)
+
+
+def plot_data_exploration(plt, inputs):
+    target = inputs['target']
+    fig, axes = plt.subplots(2, 2, figsize=(16, 10))
+
+    ax1 = axes[0, 0]
+    ax1.plot(np.asarray(inputs['times'], dtype='datetime64[ns]'), inputs['values'],
+             linewidth=0.5, alpha=0.8)
+    ax1.set_title(f'Time Series: {target}', fontsize=12, fontweight='bold')
+    ax1.set_xlabel('Date')
+    ax1.set_ylabel('Reading')
+    ax1.tick_params(axis='x', rotation=45)
+
+    ax2 = axes[0, 1]
+    _bars_from_hist(ax2, inputs['hist'], edgecolor='black', alpha=0.7)
+    ax2.grid(True)
+    ax2.set_title(f'Distribution: {target}', fontsize=12, fontweight='bold')
+    ax2.set_xlabel('Value')
+    ax2.set_ylabel('Frequency')
+
+    ax3 = axes[1, 0]
+    ax3.bar(range(24), inputs['hourly'], color='steelblue', edgecolor='black')
+    ax3.set_title('Average Hourly Pattern', fontsize=12, fontweight='bold')
+    ax3.set_xlabel('Hour of Day')
+    ax3.set_ylabel('Average Reading')
+    ax3.set_xticks(range(0, 24))
+
+    ax4 = axes[1, 1]
+    ax4.bar(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'], inputs['daily'],
+            color='coral', edgecolor='black')
+    ax4.set_title('Average Daily Pattern (by Day of Week)', fontsize=12, fontweight='bold')
+    ax4.set_xlabel('Day of Week')
+    ax4.set_ylabel('Average Reading')
+    return fig
+
+
+def plot_weather_features(plt, inputs):
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+
+    ax1 = axes[0, 0]
+    colors = {'Winter': '#3498db', 'Spring': '#2ecc71', 'Summer': '#e74c3c', 'Autumn': '#f39c12'}
+    for season, hist in inputs['seasons'].items():
+        _bars_from_hist(ax1, hist, alpha=0.6, label=season, color=colors[season])
+    ax1.set_xlabel('Temperature (°C)')
+    ax1.set_ylabel('Frequency')
+    ax1.set_title('Temperature Distribution by Season')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    ax2 = axes[0, 1]
+    scatter = inputs['scatter']
+    points = ax2.scatter(scatter['temperature'], scatter['humidity'], c=scatter['season_code'],
+                         cmap='viridis', alpha=0.5, s=10)
+    ax2.set_xlabel('Temperature (°C)')
+    ax2.set_ylabel('Humidity (%)')
+    ax2.set_title('Temperature vs Humidity by Season')
+    plt.colorbar(points, ax=ax2, label='Season (0=Win, 1=Spr, 2=Sum, 3=Aut)')
+    ax2.grid(True, alpha=0.3)
+
+    ax3 = axes[1, 0]
+    hourly = np.asarray(inputs['hourly_temp'])
+    ax3.plot(range(24), hourly, 'o-', color='#e74c3c', linewidth=2, markersize=6)
+    ax3.fill_between(range(24), hourly, alpha=0.3, color='#e74c3c')
+    ax3.set_xlabel('Hour of Day')
+    ax3.set_ylabel('Average Temperature (°C)')
+    ax3.set_title('Diurnal Temperature Pattern')
+    ax3.set_xticks(range(0, 24, 3))
+    ax3.grid(True, alpha=0.3)
+
+    ax4 = axes[1, 1]
+    if inputs['target']:
+        ax4.bxp(inputs['boxes'])
+        ax4.set_ylabel(inputs['target'])
+        ax4.set_title(f"Load Comparison: Ramadan vs Non-Ramadan\n(using {inputs['target']})")
+    else:
+        ax4.text(0.5, 0.5, 'Insufficient Ramadan data\nfor comparison',
+                 ha='center', va='center', transform=ax4.transAxes)
+        ax4.set_title('Ramadan Comparison')
+    ax4.grid(True, alpha=0.3)
+    return fig
+
+
+def plot_model_evaluation(plt, inputs):
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    head = len(inputs['actual_head'])
+
+    ax1 = axes[0, 0]
+    ax1.plot(inputs['actual_head'], label='Actual', linewidth=1.5, alpha=0.8)
+    ax1.plot(inputs['predicted_head'], label='Predicted', linewidth=1.5, alpha=0.8)
+    ax1.set_title(f'Actual vs Predicted (First {head} Test Samples)', fontsize=12,
+                  fontweight='bold')
+    ax1.set_xlabel('Sample Index')
+    ax1.set_ylabel('Reading')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    ax2 = axes[0, 1]
+    low, high = inputs['range']
+    ax2.scatter(inputs['scatter']['actual'], inputs['scatter']['predicted'], alpha=0.3, s=10)
+    ax2.plot([low, high], [low, high], 'r--', linewidth=2, label='Perfect Prediction')
+    ax2.set_title('Actual vs Predicted Scatter Plot', fontsize=12, fontweight='bold')
+    ax2.set_xlabel('Actual Values')
+    ax2.set_ylabel('Predicted Values')
+    ax2.legend()
+    ax2.grid(True, alpha=0.3)
+
+    ax3 = axes[1, 0]
+    _bars_from_hist(ax3, inputs['residuals'], edgecolor='black', alpha=0.7)
+    ax3.axvline(x=0, color='r', linestyle='--', linewidth=2)
+    ax3.set_title('Residuals Distribution', fontsize=12, fontweight='bold')
+    ax3.set_xlabel('Residual (Actual - Predicted)')
+    ax3.set_ylabel('Frequency')
+    ax3.grid(True, alpha=0.3)
+
+    ax4 = axes[1, 1]
+    if inputs['importance']:
+        ax4.barh(inputs['importance']['features'], inputs['importance']['values'],
+                 color='steelblue', edgecolor='black')
+    ax4.set_title('Top 15 Feature Importance', fontsize=12, fontweight='bold')
+    ax4.set_xlabel('Importance Score')
+    ax4.grid(True, alpha=0.3, axis='x')
+    return fig
+
+
+def plot_model_comparison(plt, inputs):
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    results = inputs['results']
+    names = list(results)
+    x = np.arange(len(names))
+    width = 0.35
+
+    ax1 = axes[0, 0]
+    ax1.bar(x - width / 2, [results[m]['Train_R2'] for m in names], width, label='Train R²',
+            color='steelblue')
+    ax1.bar(x + width / 2, [results[m]['Test_R2'] for m in names], width, label='Test R²',
+            color='coral')
+    ax1.set_ylabel('R² Score')
+    ax1.set_title('R² Comparison Across Models', fontweight='bold', fontsize=12)
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(names, rotation=15)
+    ax1.legend()
+    ax1.set_ylim(0, 1.1)
+    ax1.axhline(y=0.9, color='green', linestyle='--', alpha=0.5, label='Good R² threshold')
+
+    ax2 = axes[0, 1]
+    test_rmse = [results[m]['Test_RMSE'] for m in names]
+    ax2.bar(x - width / 2, [results[m]['Test_MAE'] for m in names], width, label='Test MAE',
+            color='steelblue')
+    ax2.bar(x + width / 2, test_rmse, width, label='Test RMSE', color='coral')
+    ax2.set_ylabel('Error')
+    ax2.set_title('MAE & RMSE Comparison Across Models', fontweight='bold', fontsize=12)
+    ax2.set_xticks(x)
+    ax2.set_xticklabels(names, rotation=15)
+    ax2.legend()
+
+    ax3 = axes[1, 0]
+    head = len(inputs['actual_head'])
+    ax3.plot(inputs['actual_head'], label='Actual', color='black', linewidth=2)
+    for name, pred in inputs['predictions_head'].items():
+        ax3.plot(pred, label=name, alpha=0.7, linewidth=1)
+    ax3.set_title(f'Predictions vs Actual (First {head} Test Samples)', fontweight='bold',
+                  fontsize=12)
+    ax3.set_xlabel('Sample Index')
+    ax3.set_ylabel('Reading')
+    ax3.legend(loc='upper right')
+
+    ax4 = axes[1, 1]
+    colors = ['gold' if m == inputs['best'] else 'steelblue' for m in names]
+    bars = ax4.bar(names, test_rmse, color=colors, edgecolor='black')
+    ax4.set_ylabel('RMSE')
+    ax4.set_title('Test RMSE Comparison (Best Model in Gold)', fontweight='bold', fontsize=12)
+    ax4.tick_params(axis='x', rotation=15)
+    for bar, value in zip(bars, test_rmse):
+        ax4.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1, f'{value:.2f}',
+                 ha='center', va='bottom', fontweight='bold')
+    return fig
+
+
+def plot_feature_importance_comparison(plt, inputs):
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    colors = {'XGBoost': 'steelblue', 'Random Forest': 'coral', 'LightGBM': 'green'}
+    for ax, (name, top) in zip(axes, inputs.items()):
+        ax.barh(range(len(top['values'])), top['values'], color=colors.get(name, 'steelblue'))
+        ax.set_yticks(range(len(top['values'])))
+        ax.set_yticklabels(top['features'], fontsize=8)
+        ax.set_title(f'{name} - Top {len(top["values"])} Features', fontweight='bold')
+        ax.set_xlabel('Importance Score')
+    return fig
+
+
+FIGURES = {
+    'data_exploration': plot_data_exploration,
+    'weather_features_visualization': plot_weather_features,
+    'model_evaluation': plot_model_evaluation,
+    'model_comparison_visualization': plot_model_comparison,
+    'feature_importance_comparison': plot_feature_importance_comparison,
+}
+
+
+def draw_figure(name: str, inputs: dict, path: str, dpi: int = FIGURE_DPI) -> str:
+    """Draw one figure to ``path`` (the unit of work of the process pool)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    plt.style.use('seaborn-v0_8-whitegrid')
+    fig = FIGURES[name](plt, inputs)
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+# ------------------------------------------------------------
+# Stage
+# ------------------------------------------------------------
+
+def figure_key(cache, name: str, files: list = None, upstream: list = None,
+               params: dict = None, dpi: int = FIGURE_DPI) -> str:
+    """
+    Content key of one figure from its input files or upstream stage keys,
+    built by ``StageCache.key`` (file digests memoized by size and mtime).
+    ``dpi`` must be the resolution passed to ``render_figures``.
+    """
+    settings = {'dpi': dpi, 'max_points': FIGURE_MAX_POINTS,
+                'max_scatter': FIGURE_MAX_SCATTER, 'head': FIGURE_HEAD_SAMPLES}
+    return cache.key(f"figure:{name}", {**settings, **(params or {})}, upstream, files)
+
+
+def render_figures(jobs: dict, output_dir: str, n_workers: int = None, force: bool = False,
+                   dpi: int = FIGURE_DPI) -> dict:
+    """
+    Render ``jobs`` ({figure name: (key, prepare)}) into ``output_dir``.
+
+    ``prepare`` is a zero-argument callable returning the figure's reduced
+    inputs; it is only called for figures whose key differs from the
+    manifest (or whose PNG is missing), so unchanged figures cost neither
+    loading nor drawing. Returns {figure name: 'cached' | 'rendered'}.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, FIGURES_MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    status = {}
+    stale = []
+    for name, (key, prepare) in jobs.items():
+        path = os.path.join(output_dir, f"{name}.png")
+        if not force and manifest.get(name) == key and os.path.exists(path):
+            status[name] = 'cached'
+            print(f"♻️  {name}: unchanged ({key[:12]})")
+        else:
+            stale.append((name, key, prepare, path))
+
+    if stale:
+        tasks = [(name, prepare(), path) for name, _, prepare, path in stale]
+        n_workers = min(len(tasks), n_workers or os.cpu_count() or 1)
+        if n_workers == 1:
+            for name, inputs, path in tasks:
+                draw_figure(name, inputs, path, dpi)
+        else:
+            from joblib import Parallel, delayed
+            Parallel(n_jobs=n_workers, backend='loky')(
+                delayed(draw_figure)(name, inputs, path, dpi) for name, inputs, path in tasks)
+        for name, key, _, path in stale:
+            manifest[name] = key
+            status[name] = 'rendered'
+            print(f"🖼️  {name}: rendered -> {path}")
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    return status
@@ -0,0 +1,173 @@
+# ============================================================
+# GLOBAL CROSS-FEEDER MODEL
+# ============================================================
+"""
+One gradient-boosted model for every feeder instead of one per feeder.
+
+The wide readings table (hours x feeders) is stacked into long format:
+one row per (feeder, hour) with a categorical ``feeder`` identifier, the
+calendar features of the hour and the feeder's own lags and rolling
+mean/std (feeder-agnostic names: ``lag_1``, ``rolling_mean_24``, ...). The
+data semantics follow ``build_features``: ``impute_readings``, features
+rounded to 3 decimals, warm-up rows dropped, and targets that were gaps
+rather than readings left out of fitting and scoring.
+
+Targets stay in amperes: the feeder's own lags carry its load level, and
+XGBoost's ``gamma`` / ``reg_*`` settings are in target units, so rescaling
+per feeder would silently strengthen them. One model sees (feeders x) the
+rows of a single-feeder fit, so it defaults to ``GLOBAL_XGBOOST_PARAMS`` (more
+trees than ``XGBOOST_PARAMS``). One artifact holds the booster and feeder
+list, and every feeder is scored with one ``inplace_predict``.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .config import GLOBAL_XGBOOST_PARAMS, LAG_HOURS, ROLLING_WINDOWS, TEMPORAL_FEATURES, \
+    TEST_SIZE, TIME_COLUMN
+from .data import reindex_hourly
+from .features import build_feature_matrix, impute_readings
+from .horizon import calendar_matrix
+from .telemetry import span, traced
+
+
+class GlobalFeederModel:
+    """Single XGBoost model trained on the stacked long-format feeder table."""
+
+    def __init__(self, lags: list = None, windows: list = None, params: dict = None):
+        self.lags = list(LAG_HOURS if lags is None else lags)
+        self.windows = list(ROLLING_WINDOWS if windows is None else windows)
+        self.params = dict(GLOBAL_XGBOOST_PARAMS if params is None else params)
+        self.feeder_cols = []
+        self.booster = None
+
+    @property
+    def warmup_hours(self) -> int:
+        """Leading rows without a complete set of lag/rolling features."""
+        return max(max(self.lags), max(self.windows) - 1)
+
+    @property
+    def feature_names(self) -> list:
+        return (['feeder'] + TEMPORAL_FEATURES + [f'lag_{lag}' for lag in self.lags]
+                + [f'rolling_{stat}_{w}' for w in self.windows for stat in ('mean', 'std')])
+
+    @property
+    def feature_types(self) -> list:
+        return ['c'] + ['q'] * (len(self.feature_names) - 1)
+
+    def build_long(self, df: pd.DataFrame, time_column: str = TIME_COLUMN):
+        """
+        Long-format design matrix of a readings frame.
+
+        Returns ``(X, y, times)``: X is (feeders x hours x features) float32
+        and y the (feeders x hours) readings (NaN for gaps), both without
+        warm-up rows; ``times`` are the hours kept.
+        """
+        df = reindex_hourly(df[[time_column] + self.feeder_cols], time_column)
+        readings = df[self.feeder_cols].to_numpy(dtype=np.float64)
+        df = impute_readings(df, self.feeder_cols, time_column=time_column)
+        values = df[self.feeder_cols].to_numpy(dtype=np.float64)
+        times = pd.DatetimeIndex(df[time_column])
+        n_hours, n_feeders = values.shape
+
+        # (hours x blocks x feeders) -> (feeders x hours x blocks)
+        matrix, _ = build_feature_matrix(values, self.feeder_cols, self.lags, self.windows,
+                                         dtype=np.float64)
+        blocks = np.round(matrix, 3).reshape(n_hours, -1, n_feeders).transpose(2, 0, 1)
+
+        keep = slice(self.warmup_hours, None)
+        n_keep = n_hours - self.warmup_hours
+        X = np.empty((n_feeders, n_keep, len(self.feature_names)), dtype=np.float32)
+        X[..., 0] = np.arange(n_feeders)[:, None]
+        X[..., 1:1 + len(TEMPORAL_FEATURES)] = calendar_matrix(times[keep])[None]
+        X[..., 1 + len(TEMPORAL_FEATURES):] = blocks[:, keep]
+        return X, readings[keep].T, times[keep]
+
+    @traced('global_model.fit')
+    def fit(self, df: pd.DataFrame, feeder_cols: list, time_column: str = TIME_COLUMN,
+            test_size: float = TEST_SIZE):
+        """
+        Fit on the first ``1 - test_size`` of the hours (the same
+        chronological split as ``chronological_split``, shared by all
+        feeders).
+        """
+        import xgboost as xgb
+
+        self.feeder_cols = list(feeder_cols)
+        X, y, _ = self.build_long(df, time_column)
+        split_idx = int(X.shape[1] * (1 - test_size))
+
+        observed = ~np.isnan(y[:, :split_idx].ravel())
+        X_train = X[:, :split_idx].reshape(-1, X.shape[2])[observed]
+        y_train = y[:, :split_idx].ravel()[observed]
+
+        print(f"🚀 Training global model: {len(self.feeder_cols)} feeders x {split_idx} hours "
+              f"= {len(y_train)} rows")
+        model = xgb.XGBRegressor(**{**self.params, 'enable_categorical': True,
+                                    'feature_types': self.feature_types})
+        with span('fit', fit=True, model='XGBoost') as fit_span:
+            fit_span.inputs(X_train)
+            model.fit(X_train, y_train, verbose=0)
+        self.booster = model.get_booster()
+        self.booster.feature_names = self.feature_names
+        print("\n✅ Model training complete!")
+        return self
+
+    def predict_long(self, X: np.ndarray) -> np.ndarray:
+        """Score a (feeders x hours x features) block in one call; returns (feeders x hours)."""
+        y = self.booster.inplace_predict(X.reshape(-1, X.shape[2])).reshape(X.shape[:2])
+        return y.astype(np.float64)
+
+    def predict(self, df: pd.DataFrame, time_column: str = TIME_COLUMN,
+                last_n: int = None) -> pd.DataFrame:
+        """Predictions for every feeder and hour after the warm-up, one column per feeder."""
+        X, _, times = self.build_long(df, time_column)
+        if last_n is not None:
+            X, times = X[:, -last_n:], times[-last_n:]
+        y_pred = self.predict_long(X)
+
+        out = pd.DataFrame({TIME_COLUMN: times})
+        for f, feeder in enumerate(self.feeder_cols):
+            out[feeder] = np.round(y_pred[f], 3)
+        return out
+
+    def evaluate(self, df: pd.DataFrame, time_column: str = TIME_COLUMN,
+                 test_size: float = TEST_SIZE) -> pd.DataFrame:
+        """Per-feeder test-period metrics (``calculate_metrics``), one row per feeder."""
+        from .training import calculate_metrics
+
+        X, y, _ = self.build_long(df, time_column)
+        split_idx = int(X.shape[1] * (1 - test_size))
+        y_pred = self.predict_long(X[:, split_idx:])
+
+        observed = ~np.isnan(y[:, split_idx:])
+        rows = {feeder: calculate_metrics(y[f, split_idx:][observed[f]], y_pred[f][observed[f]],
+                                          feeder)
+                for f, feeder in enumerate(self.feeder_cols)}
+        return pd.DataFrame(rows).T.rename_axis('Feeder')
+
+    def save(self, path: str):
+        """Write settings, feeder list and the booster into one JSON artifact."""
+        payload = {
+            'lags': self.lags,
+            'windows': self.windows,
+            'params': self.params,
+            'feeder_cols': self.feeder_cols,
+            'booster': json.loads(bytes(self.booster.save_raw('json'))),
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'GlobalFeederModel':
+        import xgboost as xgb
+
+        with open(path) as f:
+            payload = json.load(f)
+        model = cls(payload['lags'], payload['windows'], payload['params'])
+        model.feeder_cols = payload['feeder_cols']
+        model.booster = xgb.Booster()
+        model.booster.load_model(bytearray(json.dumps(payload['booster']).encode()))
+        return model
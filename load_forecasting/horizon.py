@@ -0,0 +1,337 @@
+# ============================================================
+# DIRECT MULTI-HORIZON (DAY-AHEAD) FORECASTING
+# ============================================================
+"""
+Direct 24-hour-ahead forecasting for every feeder.
+
+The training set is horizon-stacked: each forecast origin ``t`` contributes
+one row per horizon ``h = 1..FORECAST_HORIZON`` whose target is the reading
+at ``t + h``. Every feature is known at the origin:
+
+* origin lags - readings at ``t``, ``t-1``, ... (``LAG_HOURS`` shifted by one,
+  so for ``h = 1`` they equal the usual ``lag_k`` of the target hour)
+* seasonal lags - same hour one day / one week before the target hour
+  (``t + h - 24``, ``t + h - 168``; always at or before ``t`` for h <= 24)
+* rolling mean/std over ``ROLLING_WINDOWS`` ending at the origin
+* calendar features of the target hour and the horizon ``h``
+
+Frames must be on the complete hourly grid (``reindex_hourly``) so row
+offsets are hour offsets. Inputs are imputed with ``IMPUTATION_METHOD``
+(stored with the model); the ``"mean"`` fill uses the training-period
+means, so scoring a later period never sees its own readings. Rows whose
+target reading was missing are left out of training (and scored as NaN),
+so the model never learns an imputed value.
+
+The same hour yesterday (the shortest seasonal lag) is a strong baseline
+for these feeders. The model therefore predicts the residual against it,
+and the plan blends the two per horizon:
+``w * model + (1 - w) * baseline``. The weights ``w`` are chosen on the
+last ``DAYAHEAD_VALIDATION_SIZE`` of the training origins with a booster
+fitted on the earlier ones. They are stored with the model and reported,
+and ``w = 0`` means the plan falls back to the baseline.
+
+One booster is fitted for all feeders, with the feeder index as a
+feature. A day-ahead plan builds the (feeders x horizons x features)
+tensor in one vectorized pass and scores it with a single
+``inplace_predict``; no recursion. The booster is used on unscaled
+features (trees are scale invariant).
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .config import (DAYAHEAD_BLEND_STEPS, DAYAHEAD_VALIDATION_SIZE, FORECAST_HORIZON,
+                     IMPUTATION_METHOD, LAG_HOURS, ROLLING_WINDOWS, SEASONAL_LAGS,
+                     TEMPORAL_FEATURES, TIME_COLUMN, XGBOOST_PARAMS)
+from .features import (DOW_COS, DOW_SIN, HOUR_COS, HOUR_SIN, build_feature_matrix,
+                       impute_readings)
+from .telemetry import span, traced
+
+
+def calendar_matrix(times) -> np.ndarray:
+    """(n x 10) TEMPORAL_FEATURES of a DatetimeIndex, as in ``create_time_features``."""
+    times = pd.DatetimeIndex(times)
+    hour = times.hour.to_numpy()
+    dow = times.dayofweek.to_numpy()
+    return np.column_stack([
+        hour, times.day.to_numpy(), dow, times.month.to_numpy(),
+        times.isocalendar().week.to_numpy(dtype=np.int64), (dow >= 5).astype(int),
+        HOUR_SIN[hour], HOUR_COS[hour], DOW_SIN[dow], DOW_COS[dow],
+    ]).astype(np.float64)
+
+
+def blend_weights(model: np.ndarray, baseline: np.ndarray, actual: np.ndarray, horizon: int,
+                  steps: int = DAYAHEAD_BLEND_STEPS) -> np.ndarray:
+    """
+    Per-horizon model weight ``w`` in ``0, 1/steps, ..., 1`` whose blend
+    ``w * model + (1 - w) * baseline`` has the lowest MAE against
+    ``actual``. The arrays hold origin-major rows, so their last axis
+    reshapes to (..., horizon). Missing readings are ignored.
+    """
+    grid = np.linspace(0, 1, steps + 1)
+    with np.errstate(invalid='ignore'):
+        mae = np.stack([
+            np.nanmean(np.abs(w * model + (1 - w) * baseline - actual).reshape(-1, horizon), axis=0)
+            for w in grid])
+    return grid[np.where(np.isnan(mae), np.inf, mae).argmin(axis=0)]
+
+
+class DirectMultiHorizonForecaster:
+    """
+    Day-ahead forecaster producing all ``horizon`` hourly values for every
+    feeder in one call.
+    """
+
+    def __init__(self, horizon: int = FORECAST_HORIZON, lags: list = None,
+                 windows: list = None, seasonal_lags: list = None, params: dict = None,
+                 imputation: str = IMPUTATION_METHOD,
+                 validation_size: float = DAYAHEAD_VALIDATION_SIZE):
+        self.horizon = horizon
+        self.lags = list(LAG_HOURS if lags is None else lags)
+        self.windows = list(ROLLING_WINDOWS if windows is None else windows)
+        self.seasonal_lags = list(SEASONAL_LAGS if seasonal_lags is None else seasonal_lags)
+        if min(self.seasonal_lags) < horizon:
+            raise ValueError(f"seasonal lags must be >= horizon ({horizon}) to be known at the origin")
+        if imputation not in ('gap', 'mean'):
+            raise ValueError(f"unknown imputation method: {imputation}")
+        self.params = dict(XGBOOST_PARAMS if params is None else params)
+        self.imputation = imputation
+        self.validation_size = validation_size
+        self.feeder_cols = []
+        self.booster = None
+        self.model_weight = np.ones(horizon)
+        self.fill_values = None
+
+    @property
+    def history_hours(self) -> int:
+        """Readings needed before an origin to build its features."""
+        return max(max(self.lags) - 1, max(self.windows) - 1, max(self.seasonal_lags) - 1)
+
+    @property
+    def baseline_lag(self) -> int:
+        """Seasonal lag used as the baseline (24: same hour yesterday)."""
+        return min(self.seasonal_lags)
+
+    @property
+    def feature_names(self) -> list:
+        return (['feeder', 'horizon'] + [f'target_{name}' for name in TEMPORAL_FEATURES]
+                + [f'origin_lag_{lag}' for lag in self.lags]
+                + [f'seasonal_lag_{lag}' for lag in self.seasonal_lags]
+                + [f'origin_rolling_{stat}_{w}' for w in self.windows for stat in ('mean', 'std')])
+
+    def _origin_block(self, values: np.ndarray, origins: np.ndarray) -> np.ndarray:
+        """(origins x feeders x k) lags and rolling stats at each origin row."""
+        rolling, _ = build_feature_matrix(values, list(range(values.shape[1])), lags=[],
+                                          windows=self.windows, dtype=np.float64)
+        rolling = rolling.reshape(len(values), 2 * len(self.windows), values.shape[1])
+        lagged = np.stack([values[origins - (lag - 1)] for lag in self.lags], axis=-1)
+        return np.concatenate([lagged, rolling[origins].transpose(0, 2, 1)], axis=-1)
+
+    def build_dataset(self, values: np.ndarray, origins: np.ndarray, target_times) -> np.ndarray:
+        """
+        Horizon-stacked features: (feeders x (origins * horizon) x features),
+        rows ordered origin-major. ``target_times`` holds the
+        (origins x horizon) timestamps of the target hours.
+        """
+        n_origins, n_feeders = len(origins), values.shape[1]
+        H = self.horizon
+        h = np.arange(1, H + 1)
+
+        origin_feats = self._origin_block(values, origins)                 # (O, F, L + 2W)
+        n_lag = len(self.lags)
+        calendar = calendar_matrix(np.asarray(target_times).ravel())       # (O*H, 10)
+        seasonal = np.stack([values[origins[:, None] + h[None, :] - lag]    # (O, H, F, S)
+                             for lag in self.seasonal_lags], axis=-1)
+
+        n_features = len(self.feature_names)
+        X = np.empty((n_feeders, n_origins, H, n_features), dtype=np.float32)
+        X[..., 0] = np.arange(n_feeders)[:, None, None]
+        X[..., 1] = h
+        X[..., 2:12] = calendar.reshape(n_origins, H, 10)[None]
+        col = 12
+        X[..., col:col + n_lag] = origin_feats[:, :, :n_lag].transpose(1, 0, 2)[:, :, None, :]
+        col += n_lag
+        X[..., col:col + len(self.seasonal_lags)] = seasonal.transpose(2, 0, 1, 3)
+        col += len(self.seasonal_lags)
+        X[..., col:] = origin_feats[:, :, n_lag:].transpose(1, 0, 2)[:, :, None, :]
+        return X.reshape(n_feeders, n_origins * H, n_features)
+
+    def _prepare(self, df: pd.DataFrame, feeder_cols: list, time_column: str):
+        """(imputed values, raw values with NaN, times) for the feeder columns."""
+        raw = df[feeder_cols].to_numpy(dtype=np.float64)
+        if self.imputation == 'mean':
+            values = np.round(np.where(np.isnan(raw), self.fill_values, raw), 3)
+        else:
+            values = impute_readings(df[[time_column] + feeder_cols], feeder_cols, self.imputation,
+                                     time_column)[feeder_cols].to_numpy(dtype=np.float64)
+        times = pd.DatetimeIndex(pd.to_datetime(df[time_column]))
+        return values, raw, times
+
+    def _fit_booster(self, X: np.ndarray, residual: np.ndarray):
+        """Booster on the (feeders x rows x features) tensor, skipping missing targets."""
+        import xgboost as xgb
+
+        X = X.reshape(-1, X.shape[-1])
+        residual = residual.ravel()
+        observed = ~np.isnan(residual)
+        model = xgb.XGBRegressor(**{**self.params, 'verbosity': 0})
+        with span('fit', fit=True, model='XGBoost', feeders=len(self.feeder_cols)) as fit_span:
+            fit_span.inputs(X[observed])
+            model.fit(X[observed], residual[observed])
+        return model.get_booster()
+
+    def _score(self, X: np.ndarray):
+        """(model, baseline) predictions of the (feeders x rows x features) tensor, one call."""
+        baseline = X[..., self.feature_names.index(f'seasonal_lag_{self.baseline_lag}')]
+        residual = self.booster.inplace_predict(X.reshape(-1, X.shape[-1]))
+        return baseline + residual.reshape(X.shape[:2]), baseline.astype(np.float64)
+
+    def _blend(self, model: np.ndarray, baseline: np.ndarray) -> np.ndarray:
+        weight = np.resize(self.model_weight, model.shape[-1])
+        return weight * model + (1 - weight) * baseline
+
+    def blend_summary(self) -> str:
+        """One line on how the plan combines the model and the seasonal baseline."""
+        baseline = f"the reading {self.baseline_lag} h before each target hour"
+        weight = self.model_weight
+        if not weight.any():
+            return (f"⚠️ The model did not beat {baseline} on validation at any horizon; "
+                    f"the plan falls back to that baseline")
+        if (weight == 1).all():
+            return "✅ The plan is the model alone (it beat the seasonal baseline at every horizon)"
+        return (f"⚠️ The plan blends the model with {baseline}: model weight "
+                f"{weight.min():.2f}-{weight.max():.2f} across horizons (chosen on validation)")
+
+    @traced('horizon.fit')
+    def fit(self, df: pd.DataFrame, feeder_cols: list, time_column: str = TIME_COLUMN,
+            origin_stride: int = 1):
+        """
+        Fit the booster for all feeders on a readings frame, after choosing
+        the per-horizon blend weights on the tail of its origins.
+        """
+        self.feeder_cols = list(feeder_cols)
+        if self.imputation == 'mean':
+            self.fill_values = np.round(np.nanmean(df[self.feeder_cols].to_numpy(dtype=np.float64),
+                                                   axis=0), 3)
+        values, raw, times = self._prepare(df, self.feeder_cols, time_column)
+        H = self.horizon
+        origins = np.arange(self.history_hours, len(values) - H, origin_stride)
+        target_rows = origins[:, None] + np.arange(1, H + 1)[None, :]
+
+        X = self.build_dataset(values, origins, times[target_rows.ravel()])   # (F, O*H, K)
+        y = raw[target_rows].transpose(2, 0, 1).reshape(X.shape[:2])           # (F, O*H)
+        residual = y - X[..., self.feature_names.index(f'seasonal_lag_{self.baseline_lag}')]
+
+        print(f"🚀 Training {H}-hour direct forecaster: "
+              f"{len(origins)} origins x {H} horizons, {len(self.feeder_cols)} feeders")
+        # Validation tail; the head stops a horizon earlier so no head target lies in it
+        n_valid = int(len(origins) * self.validation_size)
+        n_head = len(origins) - n_valid - -(-H // origin_stride)
+        if n_valid and n_head > 0:
+            self.booster = self._fit_booster(X[:, :n_head * H], residual[:, :n_head * H])
+            model, baseline = self._score(X[:, -n_valid * H:])
+            self.model_weight = blend_weights(model, baseline, y[:, -n_valid * H:], H)
+        else:
+            self.model_weight = np.ones(H)
+        self.booster = self._fit_booster(X, residual)
+        print(f"   {self.blend_summary()}")
+        return self
+
+    def predict(self, df: pd.DataFrame, time_column: str = TIME_COLUMN,
+                origin: int = None) -> pd.DataFrame:
+        """
+        Day-ahead plan from the readings in ``df``: one row per target hour
+        after the origin (the last row unless ``origin`` gives a row index),
+        one column per feeder.
+        """
+        values, _, times = self._prepare(df, self.feeder_cols, time_column)
+        origin = len(values) - 1 if origin is None else origin
+        if origin < self.history_hours:
+            raise ValueError(f"need at least {self.history_hours + 1} hourly rows before the origin")
+
+        target_times = times[origin] + pd.to_timedelta(np.arange(1, self.horizon + 1), unit='h')
+        X = self.build_dataset(values, np.array([origin]), target_times)
+        plan = self._blend(*self._score(X))                                    # (F, H)
+
+        out = pd.DataFrame({TIME_COLUMN: target_times, 'Horizon': np.arange(1, self.horizon + 1)})
+        for f, feeder in enumerate(self.feeder_cols):
+            out[feeder] = np.round(plan[f], 3)
+        return out
+
+    def predict_origins(self, df: pd.DataFrame, origins: np.ndarray,
+                        time_column: str = TIME_COLUMN, components: bool = False):
+        """
+        Score many origins at once (backtesting). Returns ``(y_true, y_pred)``
+        arrays of shape (origins x horizon x feeders); ``y_true`` is NaN where
+        the reading was missing. ``components=True`` appends the unblended
+        model and the seasonal baseline in the same shape.
+        """
+        values, raw, times = self._prepare(df, self.feeder_cols, time_column)
+        origins = np.asarray(origins)
+        target_rows = origins[:, None] + np.arange(1, self.horizon + 1)[None, :]
+        X = self.build_dataset(values, origins, times[target_rows.ravel()])
+        model, baseline = self._score(X)
+        shape = (len(self.feeder_cols), len(origins), self.horizon)
+        parts = [self._blend(model, baseline)] + ([model, baseline] if components else [])
+        return (raw[target_rows],) + tuple(part.reshape(shape).transpose(1, 2, 0)
+                                           for part in parts)
+
+    def save(self, path: str):
+        """Write settings, blend weights and the booster into one JSON artifact."""
+        payload = {
+            'horizon': self.horizon,
+            'lags': self.lags,
+            'windows': self.windows,
+            'seasonal_lags': self.seasonal_lags,
+            'params': self.params,
+            'imputation': self.imputation,
+            'validation_size': self.validation_size,
+            'feeder_cols': self.feeder_cols,
+            'fill_values': None if self.fill_values is None else self.fill_values.tolist(),
+            'model_weight': self.model_weight.tolist(),
+            'booster': json.loads(bytes(self.booster.save_raw('json'))),
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'DirectMultiHorizonForecaster':
+        import xgboost as xgb
+
+        with open(path) as f:
+            payload = json.load(f)
+        if 'booster' not in payload:
+            raise ValueError(f"{path} holds per-feeder boosters from an earlier version; "
+                             f"retrain it with train-dayahead")
+        forecaster = cls(payload['horizon'], payload['lags'], payload['windows'],
+                         payload['seasonal_lags'], payload['params'], payload['imputation'],
+                         payload['validation_size'])
+        forecaster.feeder_cols = payload['feeder_cols']
+        if payload['fill_values'] is not None:
+            forecaster.fill_values = np.asarray(payload['fill_values'], dtype=np.float64)
+        forecaster.model_weight = np.asarray(payload['model_weight'], dtype=np.float64)
+        forecaster.booster = xgb.Booster()
+        forecaster.booster.load_model(bytearray(json.dumps(payload['booster']).encode()))
+        return forecaster
+
+
+def evaluate_horizons(y_true: np.ndarray, y_pred: np.ndarray, y_naive: np.ndarray = None,
+                      y_model: np.ndarray = None) -> pd.DataFrame:
+    """
+    Per-horizon MAE/RMSE over (origins x horizon x feeders) arrays, ignoring
+    missing readings. ``y_naive`` adds the MAE of the same-hour-yesterday
+    baseline and ``y_model`` that of the unblended model.
+    """
+    error = y_pred - y_true
+    table = pd.DataFrame({
+        'Horizon': np.arange(1, y_true.shape[1] + 1),
+        'MAE': np.nanmean(np.abs(error), axis=(0, 2)),
+        'RMSE': np.sqrt(np.nanmean(error ** 2, axis=(0, 2))),
+    })
+    if y_naive is not None:
+        table['Naive_MAE'] = np.nanmean(np.abs(y_naive - y_true), axis=(0, 2))
+    if y_model is not None:
+        table['Model_MAE'] = np.nanmean(np.abs(y_model - y_true), axis=(0, 2))
+    return table.round(3)
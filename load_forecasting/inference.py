@@ -0,0 +1,60 @@
+# ============================================================
+# INFERENCE WITH SAVED ARTIFACTS
+# ============================================================
+"""
+Scoring with an exported model bundle (or the notebook's
+``xgboost_11kv_model.json`` / ``feature_scaler.pkl`` pair), without
+plotting, model comparison or report libraries.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import TIME_COLUMN
+from .features import build_features
+from .telemetry import traced
+
+
+def load_model(model_path: str, scaler_path: str = None):
+    """
+    Load a ``ModelBundle``. With ``scaler_path`` the model is read as a
+    legacy booster/scaler pair and the scaler is folded into the booster,
+    so neither path transforms features at prediction time.
+    """
+    from .bundle import ModelBundle
+
+    if scaler_path:
+        return ModelBundle.from_legacy(model_path, scaler_path)
+    return ModelBundle.load(model_path)
+
+
+@traced('inference.predict_from_readings')
+def predict_from_readings(df_merged: pd.DataFrame, target_col: str, model,
+                          last_n: int = None) -> pd.DataFrame:
+    """
+    Build features from merged readings and return a frame of
+    ``Time``, actual and predicted values for ``target_col`` scored with
+    the ``ModelBundle`` ``model`` (plus one column per quantile, e.g.
+    ``P10``/``P50``/``P90``, if the bundle has intervals).
+    """
+    from .intervals import quantile_label
+
+    df_features = build_features(df_merged, target_col)
+    if last_n is not None:
+        df_features = df_features.tail(last_n)
+
+    X = df_features[model.feature_names].to_numpy(dtype=np.float64)
+    if model.intervals:
+        y_pred, bands = model.predict_intervals(X)
+    else:
+        y_pred, bands = model.predict(X), None
+
+    df_pred = pd.DataFrame({
+        TIME_COLUMN: df_features[TIME_COLUMN].values,
+        target_col: np.round(df_features[target_col].to_numpy(dtype=np.float64), 3),
+        'Predicted': np.round(y_pred.astype(np.float64), 3),
+    })
+    if bands is not None:
+        for j, q in enumerate(model.quantiles):
+            df_pred[quantile_label(q)] = np.round(bands[:, j].astype(np.float64), 3)
+    return df_pred
@@ -0,0 +1,119 @@
+# ============================================================
+# PROBABILISTIC FORECASTS: QUANTILES AND CONFORMAL INTERVALS
+# ============================================================
+"""
+P10/P50/P90 load bands for thermal-limit decisions.
+
+Two ways to get every quantile from one fit and one predict call:
+
+* conformal (default) - the point model is unchanged; each quantile is the
+  point forecast plus an offset, the empirical quantile of out-of-fold
+  residuals from time-series CV on the training period. Only the latest
+  ``INTERVAL_CALIBRATION_FOLDS`` folds are used: the early folds' models
+  see a few weeks of history and their errors would widen the bands far
+  past the nominal coverage. Predicting the band is one addition on top
+  of the point prediction.
+* quantile - one XGBoost booster with the multi-quantile objective
+  (``reg:quantileerror`` with every ``quantile_alpha``); its predictions
+  are (rows x quantiles), sorted so the bands never cross.
+
+``pinball_loss`` / ``interval_scores`` score any (rows x quantiles) array;
+CV tables add Pinball and Coverage columns computed sequentially (fold k
+is calibrated on the residuals of the folds just before it).
+"""
+
+import numpy as np
+
+from .config import INTERVAL_CALIBRATION_FOLDS, PREDICTION_QUANTILES
+
+
+def quantile_label(q: float) -> str:
+    return f"P{round(q * 100):d}"
+
+
+def pinball_loss(y_true, y_quantiles, quantiles: list = None) -> np.ndarray:
+    """Mean pinball (quantile) loss of each column of the (rows x quantiles) forecast."""
+    quantiles = np.asarray(PREDICTION_QUANTILES if quantiles is None else quantiles)
+    diff = np.asarray(y_true, dtype=np.float64)[:, None] - np.asarray(y_quantiles)
+    return np.mean(np.maximum(quantiles * diff, (quantiles - 1) * diff), axis=0)
+
+
+def interval_scores(y_true, y_quantiles, quantiles: list = None) -> dict:
+    """
+    Pinball loss per quantile and its mean, plus coverage and mean width of
+    the outermost interval (e.g. P10-P90, nominal 80%).
+    """
+    quantiles = list(PREDICTION_QUANTILES if quantiles is None else quantiles)
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_quantiles = np.asarray(y_quantiles, dtype=np.float64)
+    losses = pinball_loss(y_true, y_quantiles, quantiles)
+
+    scores = {f'Pinball_{quantile_label(q)}': loss for q, loss in zip(quantiles, losses)}
+    scores['Pinball'] = float(np.mean(losses))
+    lower, upper = y_quantiles[:, 0], y_quantiles[:, -1]
+    scores['Coverage'] = float(np.mean((y_true >= lower) & (y_true <= upper)) * 100)
+    scores['Nominal'] = (quantiles[-1] - quantiles[0]) * 100
+    scores['Width'] = float(np.mean(upper - lower))
+    return scores
+
+
+def calculate_interval_metrics(y_true, y_quantiles, dataset_name, quantiles: list = None):
+    """Calculate and display interval metrics (the probabilistic ``calculate_metrics``)."""
+    quantiles = list(PREDICTION_QUANTILES if quantiles is None else quantiles)
+    scores = interval_scores(y_true, y_quantiles, quantiles)
+    band = f"{quantile_label(quantiles[0])}-{quantile_label(quantiles[-1])}"
+
+    print(f"\n📊 {dataset_name} Interval Metrics:")
+    for q in quantiles:
+        label = f'Pinball_{quantile_label(q)}'
+        print(f"   ├── {label + ':':<16} {scores[label]:.4f}")
+    print(f"   ├── Mean pinball loss: {scores['Pinball']:.4f}")
+    print(f"   ├── {band} coverage:  {scores['Coverage']:.2f}% "
+          f"(nominal {scores['Nominal']:.0f}%)")
+    print(f"   └── {band} width:     {scores['Width']:.3f}")
+    return scores
+
+
+def conformal_offsets(residuals, quantiles: list = None) -> np.ndarray:
+    """
+    Offsets to add to a point forecast for each quantile: the empirical
+    quantiles of ``residuals`` (actual - predicted), with the finite-sample
+    split-conformal level adjustment.
+    """
+    quantiles = np.asarray(PREDICTION_QUANTILES if quantiles is None else quantiles)
+    residuals = np.asarray(residuals, dtype=np.float64)
+    residuals = residuals[~np.isnan(residuals)]
+    n = len(residuals)
+    if n == 0:
+        raise ValueError("no residuals to calibrate intervals from")
+    # Widen the outer levels by the (n + 1) / n finite-sample correction
+    levels = np.clip(0.5 + (quantiles - 0.5) * (n + 1) / n, 0.0, 1.0)
+    return np.quantile(residuals, levels)
+
+
+def sequential_conformal_scores(y_val_folds: list, y_pred_folds: list, quantiles: list = None,
+                                calibration_folds: int = INTERVAL_CALIBRATION_FOLDS) -> list:
+    """
+    Interval scores of each CV fold with bands calibrated on the residuals
+    of the ``calibration_folds`` folds before it (None for the first fold),
+    so no fold is scored with its own residuals.
+    """
+    scores = []
+    residuals = []
+    for y_val, y_pred in zip(y_val_folds, y_pred_folds):
+        y_val = np.asarray(y_val, dtype=np.float64)
+        y_pred = np.asarray(y_pred, dtype=np.float64)
+        if residuals:
+            offsets = conformal_offsets(np.concatenate(residuals[-calibration_folds:]),
+                                        quantiles)
+            scores.append(interval_scores(y_val, y_pred[:, None] + offsets, quantiles))
+        else:
+            scores.append(None)
+        residuals.append(y_val - y_pred)
+    return scores
+
+
+def quantile_params(params: dict, quantiles: list = None) -> dict:
+    """XGBoost settings for one multi-quantile booster."""
+    quantiles = list(PREDICTION_QUANTILES if quantiles is None else quantiles)
+    return {**params, 'objective': 'reg:quantileerror', 'quantile_alpha': quantiles}
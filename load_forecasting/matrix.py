@@ -0,0 +1,122 @@
+# ============================================================
+# COMPACT FEATURE MATRICES
+# ============================================================
+"""
+Feature matrix container for model training.
+
+``FeatureMatrix`` holds the features as one C-contiguous float32 array
+(rows x features) plus the column names, the target and the time index.
+Chronological splits and fold ranges are row slices, i.e. NumPy views
+that share the parent buffer, so training works on a single copy of the
+features. ``dmatrix`` hands the array to XGBoost as its native matrix type
+without going through a DataFrame.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import TEST_SIZE, TIME_COLUMN
+
+
+class FeatureMatrix:
+    """Contiguous float32 features with column metadata, target and times."""
+
+    def __init__(self, X: np.ndarray, feature_names: list, y: np.ndarray = None,
+                 times: pd.DatetimeIndex = None, target: str = None):
+        if X.ndim != 2 or X.shape[1] != len(feature_names):
+            raise ValueError(f"X has shape {X.shape} but {len(feature_names)} feature names")
+        self.X = X
+        self.feature_names = list(feature_names)
+        self.y = y
+        self.times = times
+        self.target = target
+
+    @classmethod
+    def from_file(cls, path: str, target_col: str = None, feature_columns: list = None,
+                  time_col: str = TIME_COLUMN, observed: bool = False) -> 'FeatureMatrix':
+        """
+        Load the features of ``target_col`` (default: the first feeder) from
+        a features dataset straight into float32, without a DataFrame.
+        With ``observed`` only the rows of ``observed()`` are loaded: the
+        target column is read first and the gap rows are skipped while the
+        array is filled, so no second copy is made.
+        """
+        from .data import get_feeder_columns
+        from .features import select_feature_columns
+        from .storage import load_frame, load_matrix, read_schema
+
+        if feature_columns is None or target_col is None:
+            schema = read_schema(path, time_col)
+            target_col = target_col or get_feeder_columns(schema)[0]
+            feature_columns = feature_columns or select_feature_columns(schema, target_col)
+        keep = None
+        if observed:
+            keep = load_frame(path, [target_col], time_col)[target_col].notna().to_numpy()
+            if keep.all():
+                keep = None
+            else:
+                print(f"🧹 Dropped {int((~keep).sum())} rows without a target reading")
+        X, y, times = load_matrix(path, feature_columns, target_col, time_col, keep=keep)
+        return cls(X, feature_columns, y, times, target_col)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, feature_columns: list, target_col: str = None,
+                   time_col: str = TIME_COLUMN) -> 'FeatureMatrix':
+        X = np.empty((len(df), len(feature_columns)), dtype=np.float32)
+        for j, col in enumerate(feature_columns):
+            X[:, j] = df[col].to_numpy()
+        y = df[target_col].to_numpy(dtype=np.float64) if target_col else None
+        times = pd.DatetimeIndex(df[time_col]) if time_col in df.columns else None
+        return cls(X, feature_columns, y, times, target_col)
+
+    @property
+    def n_rows(self) -> int:
+        return self.X.shape[0]
+
+    @property
+    def shape(self) -> tuple:
+        return self.X.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.X.nbytes + (0 if self.y is None else self.y.nbytes)
+
+    def rows(self, start: int, stop: int) -> 'FeatureMatrix':
+        """Rows ``[start, stop)`` as a view on the same buffers."""
+        return FeatureMatrix(self.X[start:stop], self.feature_names,
+                             None if self.y is None else self.y[start:stop],
+                             None if self.times is None else self.times[start:stop],
+                             self.target)
+
+    def observed(self) -> 'FeatureMatrix':
+        """
+        Rows whose target was a reading rather than a gap (``build_features``
+        leaves those targets NaN). A copy when rows are dropped, else self.
+        """
+        keep = ~np.isnan(self.y)
+        if keep.all():
+            return self
+        print(f"🧹 Dropped {int((~keep).sum())} rows without a target reading")
+        return FeatureMatrix(self.X[keep], self.feature_names, self.y[keep],
+                             None if self.times is None else self.times[keep], self.target)
+
+    def split(self, test_size: float = TEST_SIZE):
+        """Chronological train/test split (views, no copy)."""
+        split_idx = int(self.n_rows * (1 - test_size))
+        train, test = self.rows(0, split_idx), self.rows(split_idx, self.n_rows)
+
+        print("📊 Train-Test Split (Chronological):")
+        print(f"   ├── Training samples: {train.n_rows} ({(1-test_size)*100:.0f}%)")
+        print(f"   └── Testing samples: {test.n_rows} ({test_size*100:.0f}%)")
+        return train, test
+
+    def dmatrix(self, ref=None):
+        """
+        XGBoost ``QuantileDMatrix`` built directly from the float32 buffer
+        (histogram bins only; pass the training matrix as ``ref`` for
+        validation data).
+        """
+        import xgboost as xgb
+
+        return xgb.QuantileDMatrix(self.X, label=self.y, feature_names=self.feature_names,
+                                   ref=ref)
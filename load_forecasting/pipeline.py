@@ -0,0 +1,123 @@
+# ============================================================
+# CACHED END-TO-END PIPELINE
+# ============================================================
+"""
+End-to-end run (merge -> weather, merge -> screen -> impute -> features
+-> split -> train) with every stage served from the content-addressed StageCache
+when its inputs and parameters are unchanged.
+
+Weather features are a side branch, as in the notebook: the model features
+are built from the merged readings.
+"""
+
+from . import config
+from .cache import StageCache
+
+
+def run_pipeline(inputs: list = None, target_col: str = None, cache: StageCache = None,
+                 lags: list = None, windows: list = None, params: dict = None,
+                 test_size: float = None, all_feeders: bool = False,
+                 screen: bool = True) -> dict:
+    """
+    Run every stage through ``cache`` and return a dict with the stage
+    ``keys``, ``target_col``, ``model``, its ``bundle`` (for export and
+    scoring), the ``split`` arrays, the stage ``outputs`` that had to be
+    loaded or computed and ``stages``, getters of the merged readings and
+    weather features that load them only when called.
+
+    All keys are computed up front, and a stage's upstream output is only
+    loaded when the stage itself misses, so a fully cached run reads just
+    the split and model entries. With ``screen`` the merged readings pass
+    the ``quality_gate`` before imputation.
+    """
+    from .data import (TimeSeriesDataLoader, check_missing_hours, load_and_merge_datasets,
+                       read_reading_header, standardize_time_format)
+    from .features import build_features, impute_readings, select_feature_columns
+    from .bundle import ModelBundle
+    from .quality import MASK_BITS, quality_gate
+    from .training import chronological_split, train_xgboost
+    from .weather import add_weather_features
+
+    inputs = list(inputs or [config.FILE_MARCH_MAY, config.FILE_JUNE_AUG])
+    cache = cache or StageCache()
+    lags = list(config.LAG_HOURS if lags is None else lags)
+    windows = list(config.ROLLING_WINDOWS if windows is None else windows)
+    params = dict(config.XGBOOST_PARAMS if params is None else params)
+    test_size = config.TEST_SIZE if test_size is None else test_size
+    if target_col is None:
+        target_col = [col for col in read_reading_header(inputs[0])
+                      if col != config.TIME_COLUMN][0]
+
+    keys = {}
+    keys['merge'] = cache.key('merge', {'skip_rows': config.SKIP_ROWS,
+                                        'date_format': config.DATE_FORMAT_INPUT}, files=inputs)
+    keys['weather'] = cache.key('weather', upstream=[keys['merge']])
+    keys['screen'] = cache.key('screen', {'screen': screen, 'bits': MASK_BITS,
+                                          'range': config.QUALITY_RANGE_AMPS,
+                                          'half_window': config.QUALITY_SPIKE_HALF_WINDOW,
+                                          'sigmas': config.QUALITY_SPIKE_SIGMAS,
+                                          'mad_floor': config.QUALITY_MAD_FLOOR_AMPS,
+                                          'flatline_hours': config.QUALITY_FLATLINE_HOURS,
+                                          'level_half_window': config.QUALITY_LEVEL_HALF_WINDOW,
+                                          'level_ratio': config.QUALITY_LEVEL_RATIO},
+                               upstream=[keys['merge']])
+    keys['impute'] = cache.key('impute', {'method': config.IMPUTATION_METHOD,
+                                          'max_carry_hours': config.IMPUTE_MAX_CARRY_HOURS},
+                               upstream=[keys['screen']])
+    keys['features'] = cache.key('features', {'target': target_col, 'lags': lags,
+                                              'windows': windows, 'all_feeders': all_feeders},
+                                 upstream=[keys['impute']])
+    # Trees train on unscaled features
+    keys['split'] = cache.key('split', {'target': target_col, 'test_size': test_size,
+                                        'scaled': False}, upstream=[keys['features']])
+    keys['train'] = cache.key('train', {'params': params}, upstream=[keys['split']])
+
+    outputs = {}
+
+    def stage(name, compute):
+        def get():
+            if name not in outputs:
+                outputs[name] = cache.cached(name, keys[name], compute)
+            return outputs[name]
+        return get
+
+    def merge():
+        loader = TimeSeriesDataLoader(time_column=config.TIME_COLUMN,
+                                      date_format=config.DATE_FORMAT_INPUT)
+        df = load_and_merge_datasets(inputs[0], inputs[1], loader)
+        df = standardize_time_format(df, config.TIME_COLUMN)
+        return check_missing_hours(df, config.TIME_COLUMN)
+
+    def split_features():
+        df_features = features()
+        df_features = df_features[df_features[target_col].notna()]
+        feature_columns = select_feature_columns(df_features, target_col)
+        X_train, X_test, y_train, y_test = chronological_split(
+            df_features[feature_columns], df_features[target_col], test_size)
+        return {'feature_columns': feature_columns,
+                'X_train': X_train.to_numpy(), 'X_test': X_test.to_numpy(),
+                'y_train': y_train, 'y_test': y_test}
+
+    merged = stage('merge', merge)
+    weather = stage('weather', lambda: add_weather_features(merged()))
+    screened = stage('screen', lambda: quality_gate(merged())[0] if screen else merged())
+    imputed = stage('impute', lambda: impute_readings(screened()))
+    features = stage('features', lambda: build_features(screened(), target_col, lags, windows,
+                                                        all_feeders=all_feeders,
+                                                        imputed=imputed()))
+    split = stage('split', split_features)
+    train = stage('train', lambda: train_xgboost(split()['X_train'], split()['y_train'],
+                                                 split()['X_test'], split()['y_test'], params))
+
+    weather()
+    model = train()
+    return {
+        'keys': keys,
+        'stages': {'merge': merged, 'weather': weather},
+        'target_col': target_col,
+        'model': model,
+        'bundle': ModelBundle(model, split()['feature_columns'], target_col,
+                              imputation=config.IMPUTATION_METHOD),
+        'split': split(),
+        'outputs': outputs,
+    }
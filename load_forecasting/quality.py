@@ -0,0 +1,203 @@
+# ============================================================
+# SCADA DATA-QUALITY SCREENING
+# ============================================================
+"""
+Bulk screening of feeder readings before they reach imputation and lags.
+
+Every reading gets a uint8 flag bitmap:
+
+* ``FLAG_MISSING``  - no reading (including hours absent from the export)
+* ``FLAG_SPIKE``    - Hampel test: further than ``QUALITY_SPIKE_SIGMAS``
+  robust sigmas (1.4826 x MAD) from the centred rolling median
+* ``FLAG_FLATLINE`` - part of a run of ``QUALITY_FLATLINE_HOURS`` or more
+  identical consecutive readings (stuck sensor / frozen SCADA value)
+* ``FLAG_RANGE``    - outside ``QUALITY_RANGE_AMPS``
+* ``FLAG_LEVEL``    - sustained low level: the feeder's centred one-week
+  rolling median is below ``QUALITY_LEVEL_RATIO`` of the median level of all
+  feeders at that hour (a feeder reading a few amps while its neighbours
+  carry 50-60 A, as KHBR01 LN04 does outside June-July)
+
+All feeders are screened together. The rolling median/MAD sort strided
+(rows x feeders x window) views in row chunks, and flatline runs come from
+accumulated change indices, so there is no per-feeder or per-row Python loop.
+``mask_flagged`` turns flagged readings into NaN so the imputation stage
+fills them; ``quality_gate`` does both and is applied by ``features`` and
+``run`` ahead of imputation. Low-level readings are reported but not masked
+by default: a feeder-wide level problem cannot be filled from the feeder's
+own history.
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .config import (QUALITY_FLATLINE_HOURS, QUALITY_LEVEL_HALF_WINDOW, QUALITY_LEVEL_RATIO,
+                     QUALITY_MAD_FLOOR_AMPS, QUALITY_RANGE_AMPS, QUALITY_SPIKE_HALF_WINDOW,
+                     QUALITY_SPIKE_SIGMAS, TIME_COLUMN)
+from .data import get_feeder_columns, reindex_hourly
+
+FLAG_MISSING = 1
+FLAG_SPIKE = 2
+FLAG_FLATLINE = 4
+FLAG_RANGE = 8
+FLAG_LEVEL = 16
+FLAG_NAMES = {FLAG_MISSING: 'Missing', FLAG_SPIKE: 'Spike', FLAG_FLATLINE: 'Flatline',
+              FLAG_RANGE: 'Out_of_range', FLAG_LEVEL: 'Low_level'}
+MASK_BITS = FLAG_SPIKE | FLAG_FLATLINE | FLAG_RANGE
+
+_CHUNK_ELEMENTS = 1 << 23
+
+
+def _nan_median(windows: np.ndarray):
+    """Median over the last axis ignoring NaN, and the non-NaN count."""
+    ordered = np.sort(windows, axis=-1)  # NaN sorts last
+    count = np.count_nonzero(~np.isnan(windows), axis=-1)
+    lo = np.maximum(count - 1, 0) // 2
+    hi = count // 2
+    median = 0.5 * (np.take_along_axis(ordered, lo[..., None], axis=-1)[..., 0]
+                    + np.take_along_axis(ordered, hi[..., None], axis=-1)[..., 0])
+    median[count == 0] = np.nan
+    return median, count
+
+
+def rolling_median_mad(values: np.ndarray, half_window: int = QUALITY_SPIKE_HALF_WINDOW,
+                       n_threads: int = None):
+    """
+    Centred rolling median, MAD and valid-reading count of every column of
+    the (hours x feeders) ``values`` over ``2 * half_window + 1`` hours,
+    ignoring NaN. Column blocks are processed on ``n_threads`` threads
+    (NumPy's sort releases the GIL).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    n_rows, n_cols = values.shape
+    window = 2 * half_window + 1
+    # Readings are stored as float32; sorting in float32 halves memory traffic
+    padded = np.full((n_rows + 2 * half_window, n_cols), np.nan, dtype=np.float32)
+    padded[half_window:half_window + n_rows] = values
+
+    median = np.empty((n_rows, n_cols), dtype=np.float32)
+    mad = np.empty((n_rows, n_cols), dtype=np.float32)
+    count = np.empty((n_rows, n_cols), dtype=np.int64)
+
+    def block(cols):
+        chunk = max(1, _CHUNK_ELEMENTS // ((cols.stop - cols.start) * window))
+        for lo in range(0, n_rows, chunk):
+            hi = min(n_rows, lo + chunk)
+            windows = sliding_window_view(padded[lo:hi + 2 * half_window, cols], window, axis=0)
+            median[lo:hi, cols], count[lo:hi, cols] = _nan_median(windows)
+            mad[lo:hi, cols], _ = _nan_median(np.abs(windows - median[lo:hi, cols, None]))
+
+    n_threads = max(1, min(n_cols, n_threads or os.cpu_count() or 1))
+    bounds = np.linspace(0, n_cols, n_threads + 1).astype(int)
+    with ThreadPoolExecutor(n_threads) as pool:
+        list(pool.map(block, [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:])]))
+    return median, mad, count
+
+
+def flatline_mask(values: np.ndarray, min_hours: int = QUALITY_FLATLINE_HOURS) -> np.ndarray:
+    """Cells in a run of at least ``min_hours`` identical consecutive readings."""
+    n_rows = len(values)
+    rows = np.arange(n_rows)[:, None]
+    # A run starts wherever the reading differs from the previous hour (NaN breaks runs)
+    starts = np.ones(values.shape, dtype=bool)
+    starts[1:] = ~(values[1:] == values[:-1])
+    run_start = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+    ends = np.ones(values.shape, dtype=bool)
+    ends[:-1] = starts[1:]
+    run_end = np.minimum.accumulate(np.where(ends, rows, n_rows)[::-1], axis=0)[::-1]
+    return (run_end - run_start + 1 >= min_hours) & ~np.isnan(values)
+
+
+def low_level_mask(values: np.ndarray, half_window: int = QUALITY_LEVEL_HALF_WINDOW,
+                   ratio: float = QUALITY_LEVEL_RATIO) -> np.ndarray:
+    """
+    Readings of feeders whose centred rolling median level is below
+    ``ratio`` times the median level across all feeders at that hour.
+    """
+    level = (pd.DataFrame(values)
+             .rolling(2 * half_window + 1, center=True, min_periods=half_window + 1)
+             .median().to_numpy())
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN hours
+        peers = np.nanmedian(level, axis=1, keepdims=True)
+        return (level < ratio * peers) & ~np.isnan(values)
+
+
+def screen_readings(df: pd.DataFrame, feeder_cols: list = None, time_column: str = TIME_COLUMN,
+                    value_range: tuple = QUALITY_RANGE_AMPS,
+                    half_window: int = QUALITY_SPIKE_HALF_WINDOW,
+                    n_sigmas: float = QUALITY_SPIKE_SIGMAS,
+                    mad_floor: float = QUALITY_MAD_FLOOR_AMPS,
+                    flatline_hours: int = QUALITY_FLATLINE_HOURS,
+                    level_half_window: int = QUALITY_LEVEL_HALF_WINDOW,
+                    level_ratio: float = QUALITY_LEVEL_RATIO):
+    """
+    Flag every reading of a merged readings frame.
+
+    The frame is reindexed to the complete hourly grid first. Returns
+    ``(flags, summary)``: ``flags`` has the time column plus one uint8
+    bitmap column per feeder, ``summary`` one row per feeder with the count
+    of each flag and the share of readings flagged.
+    """
+    df = reindex_hourly(df, time_column)
+    feeder_cols = get_feeder_columns(df) if feeder_cols is None else list(feeder_cols)
+    values = df[feeder_cols].to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+
+    median, mad, count = rolling_median_mad(values, half_window)
+    sigma = np.maximum(1.4826 * mad, mad_floor)
+    with np.errstate(invalid='ignore'):
+        # Only judge spikes where at least half the window was observed
+        spike = (np.abs(values - median) > n_sigmas * sigma) & (count > half_window)
+        out_of_range = (values < value_range[0]) | (values > value_range[1])
+
+    flags = (missing * FLAG_MISSING + spike * FLAG_SPIKE
+             + flatline_mask(values, flatline_hours) * FLAG_FLATLINE
+             + out_of_range * FLAG_RANGE
+             + low_level_mask(values, level_half_window, level_ratio) * FLAG_LEVEL).astype(np.uint8)
+
+    flag_frame = pd.DataFrame(flags, columns=feeder_cols)
+    flag_frame.insert(0, time_column, df[time_column].to_numpy())
+
+    summary = pd.DataFrame({'Readings': np.full(len(feeder_cols), len(df))},
+                           index=pd.Index(feeder_cols, name='Feeder'))
+    for bit, name in FLAG_NAMES.items():
+        summary[name] = ((flags & bit) > 0).sum(axis=0)
+    summary['Flagged_Pct'] = np.round(100 * ((flags & ~np.uint8(FLAG_MISSING)) > 0).mean(axis=0), 2)
+    return flag_frame, summary
+
+
+def mask_flagged(df: pd.DataFrame, flags: pd.DataFrame,
+                 bits: int = MASK_BITS,
+                 time_column: str = TIME_COLUMN) -> pd.DataFrame:
+    """
+    Readings on the flags' hourly grid with every reading carrying one of
+    ``bits`` set to NaN, ready for ``impute_readings``.
+    """
+    df = reindex_hourly(df, time_column)
+    feeder_cols = [col for col in flags.columns if col != time_column]
+    bad = (flags[feeder_cols].to_numpy() & bits) > 0
+    df[feeder_cols] = df[feeder_cols].mask(bad)
+    print(f"🚩 Masked {int(bad.sum())} flagged readings across {len(feeder_cols)} feeders")
+    return df
+
+
+def quality_gate(df: pd.DataFrame, feeder_cols: list = None, bits: int = MASK_BITS,
+                 time_column: str = TIME_COLUMN):
+    """
+    Screen merged readings and mask the readings carrying one of ``bits``
+    ahead of imputation. Returns ``(screened, flags, summary)``; feeders
+    with low-level readings are reported, and masked only if ``bits``
+    includes ``FLAG_LEVEL``.
+    """
+    flags, summary = screen_readings(df, feeder_cols, time_column)
+    screened = mask_flagged(df, flags, bits, time_column)
+    for feeder, row in summary[summary['Low_level'] > 0].iterrows():
+        print(f"⚠️ {feeder}: {int(row['Low_level'])} readings at a sustained low level against "
+              f"its peers{'' if bits & FLAG_LEVEL else ' (kept)'}")
+    return screened, flags, summary
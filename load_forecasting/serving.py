@@ -0,0 +1,248 @@
+# ============================================================
+# BATCHED INFERENCE SERVER
+# ============================================================
+"""
+Local HTTP service for a saved model bundle (or a legacy
+``xgboost_11kv_model.json`` / ``feature_scaler.pkl`` pair, loaded with the
+scaler folded into the booster).
+
+The model is loaded once. Each request carries the raw recent readings of
+the model's target feeder; they are put on the hourly grid, gaps are filled
+with the ``build_features`` imputation the bundle was trained with (else
+``IMPUTATION_METHOD``) and the
+features for the latest hour are built from the result, so a request
+carrying a feeder's full history gets the same row as the batch features.
+With a shorter history, long gaps take the hour-of-week profile (or mean)
+of the supplied readings only. The request is then queued. A
+batcher thread collects whatever arrives within ``max_wait_ms`` (up to
+``max_batch`` rows) and scores them in one call; tree models score the raw
+feature rows without any transform.
+
+    POST /predict  {"times": ["2025-08-31 11:00:00", ...], "values": [150.28, ...]}
+      -> {"time": ..., "prediction": 153.305, "latency_ms": 0.9}
+         (+ "quantiles": {"P10": ..., "P50": ..., "P90": ...} for bundles with intervals)
+    GET  /stats    -> request count, p50/p99 latency, batch sizes
+    GET  /health
+"""
+
+import json
+import queue
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .config import (IMPUTATION_METHOD, SERVE_HOST, SERVE_MAX_BATCH, SERVE_MAX_WAIT_MS,
+                     SERVE_PORT, TEMPORAL_FEATURES)
+from .features import (OnlineFeatureState, build_feature_matrix, feature_matrix_columns,
+                       fill_gaps)
+from .intervals import quantile_label
+
+
+def model_layout(feature_names: list):
+    """``(target_col, lags, windows)`` encoded in the model's feature names."""
+    lags, windows, target_col = [], [], None
+    for name in feature_names:
+        match = re.match(r'(.+)_lag_(\d+)$', name)
+        if match:
+            target_col = match.group(1)
+            lags.append(int(match.group(2)))
+        match = re.match(r'.+_rolling_mean_(\d+)$', name)
+        if match:
+            windows.append(int(match.group(1)))
+    return target_col, lags, windows
+
+
+class LatestHourFeatures:
+    """Feature vector of the most recent hour from a short history of readings."""
+
+    def __init__(self, target_col: str, lags: list, windows: list,
+                 imputation: str = IMPUTATION_METHOD):
+        if imputation not in ('gap', 'mean'):
+            raise ValueError(f"unknown imputation method: {imputation}")
+        self.target_col = target_col
+        self.lags = lags
+        self.windows = windows
+        self.imputation = imputation
+        self.history_hours = max(lags + windows)
+        self.columns = TEMPORAL_FEATURES + feature_matrix_columns([target_col], lags, windows)
+
+    def __call__(self, times: list, values: list):
+        if len(times) != len(values):
+            raise ValueError(f"got {len(times)} times for {len(values)} readings")
+        readings = pd.Series(np.asarray(values, dtype=np.float64),
+                             index=pd.DatetimeIndex(pd.to_datetime(times))).sort_index()
+        if readings.index.has_duplicates:
+            raise ValueError("duplicate reading times")
+        if not (readings.index == readings.index.floor('h')).all():
+            raise ValueError("reading times must be on the hour")
+
+        # Same grid and fill as impute_readings, over the supplied history
+        grid = pd.date_range(readings.index[0], readings.index[-1], freq='h')
+        if len(grid) < self.history_hours + 1:
+            raise ValueError(f"need at least {self.history_hours + 1} hours of readings, "
+                             f"got {len(grid)}")
+        values = readings.reindex(grid).to_numpy()
+        missing = np.isnan(values)
+        if missing.all():
+            raise ValueError("all readings are missing")
+        if self.imputation == 'gap':
+            hour_of_week = np.asarray(grid.dayofweek * 24 + grid.hour)
+            values = fill_gaps(values[:, None], hour_of_week)[0][:, 0]
+        elif missing.any():
+            values[missing] = round(float(values[~missing].mean()), 3)
+        values = np.round(values[-(self.history_hours + 1):], 3)
+
+        matrix, _ = build_feature_matrix(values[:, None], [self.target_col], self.lags,
+                                         self.windows, dtype=np.float64)
+        timestamp = grid[-1]
+        row = np.concatenate([OnlineFeatureState.time_features(timestamp), matrix[-1]])
+        return timestamp, np.round(row, 3)
+
+
+class MicroBatcher:
+    """Collects concurrently submitted rows into single batched predictions."""
+
+    def __init__(self, predict_batch, max_batch: int = SERVE_MAX_BATCH,
+                 max_wait_ms: float = SERVE_MAX_WAIT_MS):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_sizes = deque(maxlen=10000)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: np.ndarray):
+        """Prediction for ``row``: a float, or a list for multi-output batches."""
+        item = {'row': row, 'done': threading.Event(), 'result': None, 'error': None}
+        self._queue.put(item)
+        item['done'].wait()
+        if item['error'] is not None:
+            raise item['error']
+        return item['result']
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                predictions = self.predict_batch(np.vstack([item['row'] for item in batch]))
+                for item, value in zip(batch, predictions):
+                    item['result'] = value.tolist() if np.ndim(value) else float(value)
+            except Exception as exc:
+                for item in batch:
+                    item['error'] = exc
+            self.batch_sizes.append(len(batch))
+            for item in batch:
+                item['done'].set()
+
+
+class InferenceService:
+    """Warm model bundle, feature builder, micro-batcher and latency log."""
+
+    def __init__(self, model, max_batch: int = SERVE_MAX_BATCH,
+                 max_wait_ms: float = SERVE_MAX_WAIT_MS, imputation: str = None):
+        self.model = model
+        self.feature_names = model.feature_names
+        self.target_col, lags, windows = model_layout(self.feature_names)
+        if self.target_col is None:
+            raise ValueError("the model has no lag features to serve from readings")
+        imputation = imputation or getattr(model, 'imputation', None) or IMPUTATION_METHOD
+        self.features = LatestHourFeatures(self.target_col, lags, windows, imputation)
+        if self.features.columns != self.feature_names:
+            unknown = [name for name in self.feature_names if name not in self.features.columns]
+            raise ValueError(f"the model's features do not match the served row "
+                             f"({len(TEMPORAL_FEATURES)} temporal + lags {lags} + rolling "
+                             f"mean/std {windows}, in that order)"
+                             + (f"; not built by serve: {', '.join(unknown)}" if unknown else ""))
+
+        # With intervals each batch row is [point, quantile bands...] from one model call
+        predict_batch = (lambda X: np.column_stack(self.model.predict_intervals(X))) \
+            if model.intervals else self.model.predict
+        self.batcher = MicroBatcher(predict_batch, max_batch, max_wait_ms)
+        self.latencies_ms = deque(maxlen=100000)
+
+    def predict(self, payload: dict) -> dict:
+        start = time.perf_counter()
+        timestamp, row = self.features(payload['times'], payload['values'])
+        result = self.batcher.submit(row)
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.latencies_ms.append(latency_ms)
+        response = {'time': str(timestamp), 'target': self.target_col}
+        if self.model.intervals:
+            response['prediction'] = round(result[0], 3)
+            response['quantiles'] = {quantile_label(q): round(value, 3)
+                                     for q, value in zip(self.model.quantiles, result[1:])}
+        else:
+            response['prediction'] = round(result, 3)
+        response['latency_ms'] = round(latency_ms, 3)
+        return response
+
+    def stats(self) -> dict:
+        latencies = np.array(self.latencies_ms)
+        batch_sizes = np.array(self.batcher.batch_sizes)
+        return {
+            'requests': int(len(latencies)),
+            'p50_ms': round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None,
+            'p99_ms': round(float(np.percentile(latencies, 99)), 3) if len(latencies) else None,
+            'batches': int(len(batch_sizes)),
+            'mean_batch_size': round(float(batch_sizes.mean()), 2) if len(batch_sizes) else None,
+            'max_batch_size': int(batch_sizes.max()) if len(batch_sizes) else None,
+        }
+
+
+def make_handler(service: InferenceService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._reply(200, service.stats())
+            elif self.path == "/health":
+                self._reply(200, {'status': 'ok', 'target': service.target_col})
+            else:
+                self._reply(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._reply(404, {'error': 'not found'})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                self._reply(200, service.predict(payload))
+            except (KeyError, ValueError, TypeError) as exc:
+                self._reply(400, {'error': str(exc)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def make_server(service: InferenceService, host: str = SERVE_HOST,
+                port: int = SERVE_PORT) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server
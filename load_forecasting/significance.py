@@ -0,0 +1,218 @@
+# ============================================================
+# BOOTSTRAP & FORECAST COMPARISON STATISTICS
+# ============================================================
+"""
+Batched statistics for comparing forecast models on the same test hours.
+
+* ``bootstrap_metrics`` - MAE/RMSE confidence intervals for every model from
+  one shared set of resamples. Hourly errors are autocorrelated, so the
+  default is a moving-block bootstrap; each resample's statistic is
+  assembled from prefix sums of the errors (O(blocks) per resample, not
+  O(hours)), and all models use the same resamples so intervals are paired.
+* ``diebold_mariano`` - DM test with a Newey-West long-run variance and
+  the Harvey-Leybourne-Newbold small-sample correction, for many model
+  pairs at once.
+* ``adjust_pvalues`` - Bonferroni, Holm or Benjamini-Hochberg correction.
+* ``pairwise_comparison`` - all of the above plus the paired t-test and
+  Wilcoxon test for every model pair, as one table.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .config import BOOTSTRAP_BLOCK_HOURS, N_BOOTSTRAP, RANDOM_STATE
+
+_GATHER_ELEMENTS = 1 << 22
+
+
+def block_bootstrap_sums(values: np.ndarray, n_resamples: int = N_BOOTSTRAP,
+                         block_length: int = BOOTSTRAP_BLOCK_HOURS,
+                         seed: int = RANDOM_STATE) -> np.ndarray:
+    """
+    Resampled sums of each row of ``values`` (series x hours).
+
+    Every resample concatenates ``ceil(n / block_length)`` blocks with
+    uniformly drawn start hours and truncates to ``n`` hours (moving-block
+    bootstrap; ``block_length=1`` is the ordinary i.i.d. bootstrap). The
+    same block starts are used for every row. Returns (series x resamples).
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    n = values.shape[1]
+    block_length = max(1, min(int(block_length), n))
+    n_blocks = -(-n // block_length)
+    last_length = n - (n_blocks - 1) * block_length
+
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, n - block_length + 1, size=(n_resamples, n_blocks))
+
+    prefix = np.zeros((values.shape[0], n + 1))
+    np.cumsum(values, axis=1, out=prefix[:, 1:])
+
+    sums = np.empty((values.shape[0], n_resamples))
+    if block_length == 1:
+        # i.i.d.: per-resample draw counts, then one matrix product
+        chunk = max(1, _GATHER_ELEMENTS // n)
+        for lo in range(0, n_resamples, chunk):
+            block = starts[lo:lo + chunk]
+            flat = (block + n * np.arange(len(block))[:, None]).ravel()
+            counts = np.bincount(flat, minlength=len(block) * n).reshape(len(block), n)
+            sums[:, lo:lo + chunk] = values @ counts.T
+        return sums
+
+    # Chunk the resamples so the gathered (series x chunk x blocks) array stays small
+    chunk = max(1, _GATHER_ELEMENTS // (values.shape[0] * n_blocks))
+    for lo in range(0, n_resamples, chunk):
+        block = starts[lo:lo + chunk]
+        # Full blocks, then the truncated last block
+        full = block[:, :-1]
+        last = block[:, -1]
+        sums[:, lo:lo + chunk] = ((prefix[:, full + block_length] - prefix[:, full]).sum(axis=2)
+                                  + prefix[:, last + last_length] - prefix[:, last])
+    return sums
+
+
+def bootstrap_metrics(y_true, predictions: dict, n_resamples: int = N_BOOTSTRAP,
+                      block_length: int = BOOTSTRAP_BLOCK_HOURS, alpha: float = 0.05,
+                      seed: int = RANDOM_STATE) -> pd.DataFrame:
+    """
+    Point estimate and ``1 - alpha`` percentile interval of MAE and RMSE for
+    every model, indexed by model name.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    names = list(predictions)
+    errors = np.stack([np.asarray(predictions[name], dtype=np.float64) - y_true
+                       for name in names])
+    n = errors.shape[1]
+
+    # One draw for |e| and e^2 of every model: (2 * models) x resamples
+    sums = block_bootstrap_sums(np.vstack([np.abs(errors), errors ** 2]),
+                                n_resamples, block_length, seed)
+    boot_mae = sums[:len(names)] / n
+    boot_rmse = np.sqrt(sums[len(names):] / n)
+    q = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    mae_ci = np.percentile(boot_mae, q, axis=1)
+    rmse_ci = np.percentile(boot_rmse, q, axis=1)
+
+    return pd.DataFrame({
+        'MAE': np.abs(errors).mean(axis=1),
+        'MAE_CI_lower': mae_ci[0],
+        'MAE_CI_upper': mae_ci[1],
+        'RMSE': np.sqrt((errors ** 2).mean(axis=1)),
+        'RMSE_CI_lower': rmse_ci[0],
+        'RMSE_CI_upper': rmse_ci[1],
+    }, index=pd.Index(names, name='Model'))
+
+
+def diebold_mariano(errors_a: np.ndarray, errors_b: np.ndarray, horizon: int = 1,
+                    loss: str = 'squared', hac_lags: int = None):
+    """
+    Diebold-Mariano test of equal predictive accuracy.
+
+    ``errors_a`` / ``errors_b`` are forecast errors, either 1-D or
+    (pairs x hours) for many comparisons at once. The loss differential's
+    long-run variance uses Bartlett-weighted autocovariances up to
+    ``hac_lags`` (default ``horizon - 1``, the textbook choice; raise it for
+    autocorrelated one-step errors). Returns ``(statistic, p_value)``;
+    a negative statistic means ``a`` has the lower loss.
+    """
+    from scipy import stats
+
+    errors_a = np.atleast_2d(np.asarray(errors_a, dtype=np.float64))
+    errors_b = np.atleast_2d(np.asarray(errors_b, dtype=np.float64))
+    if loss == 'squared':
+        d = errors_a ** 2 - errors_b ** 2
+    elif loss == 'absolute':
+        d = np.abs(errors_a) - np.abs(errors_b)
+    else:
+        raise ValueError(f"unknown loss: {loss}")
+
+    n = d.shape[1]
+    lags = horizon - 1 if hac_lags is None else hac_lags
+    d_bar = d.mean(axis=1)
+    centred = d - d_bar[:, None]
+
+    long_run = (centred ** 2).sum(axis=1) / n
+    for k in range(1, lags + 1):
+        gamma = (centred[:, k:] * centred[:, :-k]).sum(axis=1) / n
+        long_run += 2 * (1 - k / (lags + 1)) * gamma
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dm = d_bar / np.sqrt(long_run / n)
+    # Harvey, Leybourne & Newbold (1997) small-sample correction
+    dm *= np.sqrt((n + 1 - 2 * horizon + horizon * (horizon - 1) / n) / n)
+    p_value = 2 * stats.t.sf(np.abs(dm), df=n - 1)
+
+    if dm.shape == (1,):
+        return float(dm[0]), float(p_value[0])
+    return dm, p_value
+
+
+def adjust_pvalues(p_values, method: str = 'holm') -> np.ndarray:
+    """Multiple-testing adjusted p-values (``bonferroni``, ``holm`` or ``fdr_bh``)."""
+    p = np.asarray(p_values, dtype=np.float64)
+    m = len(p)
+    if m == 0:
+        return p
+    order = np.argsort(p)
+    ranked = p[order]
+
+    if method == 'bonferroni':
+        return np.minimum(p * m, 1.0)
+    if method == 'holm':
+        stepped = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == 'fdr_bh':
+        stepped = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"unknown method: {method}")
+
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(stepped, 1.0)
+    return adjusted
+
+
+def pairwise_comparison(y_true, predictions: dict, horizon: int = 1,
+                        hac_lags: int = None, correction: str = 'holm',
+                        alpha: float = 0.05) -> pd.DataFrame:
+    """
+    Every model pair on the same test hours: mean absolute error
+    difference, paired t-test and Wilcoxon on absolute errors, and
+    Diebold-Mariano on squared errors, with ``correction`` applied to the
+    DM p-values across all pairs.
+    """
+    from scipy import stats
+
+    y_true = np.asarray(y_true, dtype=np.float64)
+    names = list(predictions)
+    errors = np.stack([np.asarray(predictions[name], dtype=np.float64) - y_true
+                       for name in names])
+    pairs = list(combinations(range(len(names)), 2))
+    if not pairs:
+        return pd.DataFrame()
+    first = np.array([i for i, _ in pairs])
+    second = np.array([j for _, j in pairs])
+
+    abs_a, abs_b = np.abs(errors[first]), np.abs(errors[second])
+    t_stat, t_p = stats.ttest_rel(abs_a, abs_b, axis=1)
+    try:
+        w_stat, w_p = stats.wilcoxon(abs_a, abs_b, axis=1)
+    except ValueError:
+        w_stat = w_p = np.full(len(pairs), np.nan)
+    dm, dm_p = diebold_mariano(errors[first], errors[second], horizon, 'squared', hac_lags)
+    dm, dm_p = np.atleast_1d(dm), np.atleast_1d(dm_p)
+    dm_p_adj = adjust_pvalues(dm_p, correction)
+
+    return pd.DataFrame({
+        'Model_A': [names[i] for i in first],
+        'Model_B': [names[j] for j in second],
+        'Mean_AE_Diff': abs_a.mean(axis=1) - abs_b.mean(axis=1),
+        'T_Statistic': t_stat,
+        'T_P_Value': t_p,
+        'Wilcoxon_Statistic': w_stat,
+        'Wilcoxon_P_Value': w_p,
+        'DM_Statistic': dm,
+        'DM_P_Value': dm_p,
+        'DM_P_Adjusted': dm_p_adj,
+        'Significant': dm_p_adj < alpha,
+    })
@@ -0,0 +1,225 @@
+# ============================================================
+# INTERMEDIATE DATASET STORAGE
+# ============================================================
+"""
+Reading and writing of the merged, weather and feature datasets.
+
+The format follows the file suffix:
+
+* ``.parquet`` / ``.feather`` - columnar, float readings stored as float32
+  and ``Time`` as a single datetime64 index (``Time_ISO`` is not stored).
+  Loads support column projection.
+* ``.csv`` - the notebook's text layout, including ``Time_ISO``.
+
+pyarrow is imported only when a columnar file is read or written.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .config import DATE_FORMAT_OUTPUT, STREAM_CHUNK_ROWS, TIME_COLUMN, TIME_ISO_COLUMN
+
+COLUMNAR_SUFFIXES = ('.parquet', '.feather')
+
+
+def is_columnar(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COLUMNAR_SUFFIXES
+
+
+def _to_arrow(df: pd.DataFrame, time_col: str):
+    """Columnar table with float32 readings and the time column as index."""
+    import pyarrow as pa
+
+    df = df.drop(columns=[TIME_ISO_COLUMN], errors='ignore')
+    float_cols = df.select_dtypes(include=['float']).columns
+    df = df.astype({col: np.float32 for col in float_cols})
+    if time_col in df.columns:
+        df = df.set_index(pd.DatetimeIndex(df[time_col], name=time_col)).drop(columns=[time_col])
+    return pa.Table.from_pandas(df, preserve_index=True)
+
+
+def _with_time_iso(df: pd.DataFrame, time_col: str) -> pd.DataFrame:
+    """Insert ``Time_ISO`` after the raw readings, as in the notebook CSVs."""
+    from .data import get_feeder_columns
+
+    if TIME_ISO_COLUMN in df.columns or time_col not in df.columns:
+        return df
+    df = df.copy()
+    position = 1 + len(get_feeder_columns(df.iloc[:0]))
+    df.insert(position, TIME_ISO_COLUMN,
+              pd.to_datetime(df[time_col]).dt.strftime(DATE_FORMAT_OUTPUT))
+    return df
+
+
+def save_frame(df: pd.DataFrame, path: str, time_col: str = TIME_COLUMN):
+    """Write a pipeline dataset in the format given by the suffix of ``path``."""
+    if not is_columnar(path):
+        _with_time_iso(df, time_col).to_csv(path, index=False)
+        return
+
+    table = _to_arrow(df, time_col)
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path)
+
+
+def read_schema(path: str, time_col: str = TIME_COLUMN) -> pd.DataFrame:
+    """Empty frame with the stored columns and dtypes, without loading the rows."""
+    if not is_columnar(path):
+        return load_frame(path, time_col=time_col).iloc[:0]
+
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        schema = pq.read_schema(path)
+    else:
+        import pyarrow.ipc as ipc
+        with ipc.open_file(path) as reader:
+            schema = reader.schema
+    df = schema.empty_table().to_pandas()
+    if time_col in df.columns:
+        df = df.set_index(time_col)
+    return df.reset_index()
+
+
+def load_frame(path: str, columns: list = None, time_col: str = TIME_COLUMN) -> pd.DataFrame:
+    """
+    Load a stored dataset with ``time_col`` as a parsed datetime column.
+
+    ``columns`` restricts the load to those columns (``time_col`` is always
+    included); for columnar files the other columns are never read.
+    """
+    if columns is not None:
+        columns = [col for col in columns if col != time_col]
+
+    if not is_columnar(path):
+        usecols = None if columns is None else [time_col] + columns
+        df = pd.read_csv(path, usecols=usecols)
+        df[time_col] = pd.to_datetime(df[time_col])
+        return df if usecols is None else df[usecols]
+
+    read_cols = None if columns is None else columns + [time_col]
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=read_cols)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=read_cols)
+    df = table.to_pandas()
+    if time_col in df.columns:
+        df = df.set_index(time_col)
+    df = df.reset_index()
+    return df if columns is None else df[[time_col] + columns]
+
+
+def load_matrix(path: str, columns: list, target: str = None, time_col: str = TIME_COLUMN,
+                dtype=np.float32, batch_rows: int = STREAM_CHUNK_ROWS, keep: np.ndarray = None):
+    """
+    Load ``columns`` straight into one C-contiguous (rows x columns) array.
+
+    Parquet is decoded one column of one row group at a time and Feather is
+    read through a memory map, so neither a DataFrame nor a second full copy
+    of the data is built. ``keep``, a boolean mask over the file's rows,
+    drops rows while the array is filled, so only the kept rows are ever
+    allocated. Returns ``(matrix, y, times)``; ``y`` is the float64
+    ``target`` column or None.
+    """
+    read_cols = list(columns) + ([target] if target else []) + [time_col]
+
+    if not is_columnar(path):
+        blocks, start = [], 0
+        for block in pd.read_csv(path, usecols=read_cols, chunksize=batch_rows):
+            stop = start + len(block)
+            blocks.append(block if keep is None else block[keep[start:stop]])
+            start = stop
+        frame = pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame(columns=read_cols)
+        matrix = np.empty((len(frame), len(columns)), dtype=dtype)
+        for j, col in enumerate(columns):
+            matrix[:, j] = frame[col].to_numpy()
+        y = frame[target].to_numpy(dtype=np.float64) if target else None
+        return matrix, y, pd.DatetimeIndex(pd.to_datetime(frame[time_col]))
+
+    # (rows, read_column) per piece; read_column(name) returns one arrow column
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        source = pq.ParquetFile(path)
+        # One column of one row group is decoded at a time
+        pieces = [(source.metadata.row_group(rg).num_rows,
+                   lambda col, rg=rg: source.read_row_group(rg, columns=[col]).column(0))
+                  for rg in range(source.metadata.num_row_groups)]
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=read_cols, memory_map=True)
+        pieces = [(batch.num_rows, batch.column)
+                  for batch in table.to_batches(max_chunksize=batch_rows)]
+    n_rows = sum(rows for rows, _ in pieces)
+    if keep is not None and len(keep) != n_rows:
+        raise ValueError(f"keep mask has {len(keep)} rows, {path} has {n_rows}")
+    n_kept = n_rows if keep is None else int(np.count_nonzero(keep))
+
+    matrix = np.empty((n_kept, len(columns)), dtype=dtype)
+    y = np.empty(n_kept) if target else None
+    times = np.empty(n_kept, dtype='datetime64[ns]')
+    start = out = 0
+    for rows, read_column in pieces:
+        piece_keep = None if keep is None else keep[start:start + rows]
+        stop = out + (rows if piece_keep is None else int(np.count_nonzero(piece_keep)))
+
+        def values(col):
+            column = read_column(col).to_numpy(zero_copy_only=False)
+            return column if piece_keep is None else column[piece_keep]
+
+        for j, col in enumerate(columns):
+            matrix[out:stop, j] = values(col)
+        if target:
+            y[out:stop] = values(target)
+        times[out:stop] = values(time_col)
+        start, out = start + rows, stop
+    return matrix, y, pd.DatetimeIndex(times, name=time_col)
+
+
+class FrameWriter:
+    """
+    Append DataFrame blocks to one dataset file (used by streaming merges).
+
+    Columnar files are written batch by batch through pyarrow writers; CSV
+    blocks are appended with the header written once.
+    """
+
+    def __init__(self, path: str, time_col: str = TIME_COLUMN):
+        self.path = path
+        self.time_col = time_col
+        self._writer = None
+        self._blocks = 0
+
+    def write(self, df: pd.DataFrame):
+        if not is_columnar(self.path):
+            _with_time_iso(df, self.time_col).to_csv(
+                self.path, mode='w' if self._blocks == 0 else 'a',
+                header=(self._blocks == 0), index=False)
+        else:
+            table = _to_arrow(df, self.time_col)
+            if self._writer is None:
+                if self.path.lower().endswith('.parquet'):
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    import pyarrow.ipc as ipc
+                    self._writer = ipc.new_file(self.path, table.schema)
+            self._writer.write_table(table)
+        self._blocks += 1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
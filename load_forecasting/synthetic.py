@@ -0,0 +1,513 @@
+# ============================================================
+# SYNTHETIC SCADA READINGS
+# ============================================================
+"""
+Synthetic feeder currents in the NB 11kV hourly export layout, for scale
+testing without the MZEC data::
+
+    ,PS:AL KHABOURAH 01,,,...
+    Time,KHBR01_K_LN01_Q0_Y_PH_I,KHBR01_K_LN02_Q0_Y_PH_I,...
+    ,,,...
+    2025-03-01 11,63.12,54.77,,2.75,...
+
+Each feeder follows one of the templates of a ``ScadaProfile``:
+
+    current = level x week_shape[hour of week]
+              x exp(temp_slope x (T - T_ref) + ramadan_effect x Ramadan + AR(1) noise)
+
+with T the ``MONTHLY_WEATHER_OMAN`` average temperature interpolated
+between mid-month values, Ramadan from ``RAMADAN_PERIODS`` (extended to
+other years by lunar-year steps), multiplicative spikes at ``spike_rate``
+and blank gaps of geometric length (``missing_rate``, ``mean_gap_hours``).
+Spikes go up with probability ``spike_up_share`` and never exceed the
+largest fitted spike in that direction (``spike_up_max`` /
+``spike_down_max``, as log ratios), and every reading is capped at
+``peak_amps``, ``SYNTH_PEAK_HEADROOM`` above the feeder's highest reading.
+``ScadaProfile.fit`` estimates all of these per feeder from merged
+readings; ``ScadaProfile.default`` is a hand-set profile of the same shape.
+Feeders beyond the number of templates reuse them round-robin with a
+log-normal level jitter.
+
+Generation is vectorised over (hours x feeders) blocks of about
+``SYNTH_CHUNK_CELLS`` readings, with the AR(1) and gap state carried from
+block to block, and the CSV text is assembled as a byte matrix rather than
+through ``to_csv``, so memory stays flat however many years and feeders are
+written. The same seed, profile and size give the same bytes.
+"""
+
+import functools
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .config import (QUALITY_MAD_FLOOR_AMPS, QUALITY_SPIKE_HALF_WINDOW, QUALITY_SPIKE_SIGMAS,
+                     RANDOM_STATE, SYNTH_CHUNK_CELLS, SYNTH_LEVEL_JITTER, SYNTH_PEAK_HEADROOM,
+                     SYNTH_STATION, TIME_COLUMN)
+from .weather import MONTHLY_WEATHER_OMAN, RAMADAN_PERIODS
+
+PROFILE_FORMAT = "load_forecasting.scada_profile"
+PROFILE_VERSION = 2
+
+HOURS_PER_WEEK = 168
+LUNAR_YEAR_DAYS = 354.367
+# Readings are written with at most 4 integer digits and 2 decimals
+MAX_AMPS = 9999.99
+_N_CENTS = 1000000
+
+_MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+_MID_MONTH = np.cumsum(_MONTH_DAYS) - _MONTH_DAYS / 2
+_MONTH_TEMP = np.array([MONTHLY_WEATHER_OMAN[m]['temp_avg'] for m in range(1, 13)])
+REFERENCE_TEMP_C = float(_MONTH_TEMP.mean())
+
+_TEMPLATE_FIELDS = ['level', 'temp_slope', 'ramadan_effect', 'ar_coef', 'noise_sigma',
+                    'missing_rate', 'mean_gap_hours', 'spike_rate', 'spike_scale',
+                    'spike_up_share', 'spike_up_max', 'spike_down_max', 'peak_amps']
+
+
+def feeder_name(j: int) -> str:
+    return f"KHBR01_K_LN{j:02d}_Q0_Y_PH_I"
+
+
+def monthly_temperature(times) -> np.ndarray:
+    """``MONTHLY_WEATHER_OMAN`` average temperature, interpolated between mid-month days."""
+    times = pd.DatetimeIndex(times)
+    day = times.dayofyear.to_numpy() - 1 + times.hour.to_numpy() / 24
+    anchors = np.concatenate([_MID_MONTH - 365, _MID_MONTH, _MID_MONTH + 365])
+    return np.interp(day, anchors, np.tile(_MONTH_TEMP, 3))
+
+
+def ramadan_mask(times) -> np.ndarray:
+    """
+    Ramadan hours: ``RAMADAN_PERIODS`` where listed, otherwise 30-day
+    periods stepped from them by the lunar year.
+    """
+    days = pd.DatetimeIndex(times).values.astype('datetime64[D]')
+    known = np.array([start for start, _ in RAMADAN_PERIODS], dtype='datetime64[D]')
+    known_end = np.array([end for _, end in RAMADAN_PERIODS], dtype='datetime64[D]')
+    reference = known[0].astype(np.int64)
+    first, last = days.min().astype(np.int64), days.max().astype(np.int64)
+    steps = np.arange(np.floor((first - reference) / LUNAR_YEAR_DAYS) - 1,
+                      np.ceil((last - reference) / LUNAR_YEAR_DAYS) + 2)
+    starts = (reference + np.round(steps * LUNAR_YEAR_DAYS)).astype('datetime64[D]')
+    ends = starts + np.timedelta64(29, 'D')
+
+    # Listed periods replace the stepped estimate for their year
+    nearest = np.abs(starts[:, None] - known[None, :]).argmin(axis=1)
+    listed = np.abs(starts - known[nearest]) <= np.timedelta64(20, 'D')
+    starts = np.where(listed, known[nearest], starts)
+    ends = np.where(listed, known_end[nearest], ends)
+
+    idx = np.searchsorted(starts, days, side='right') - 1
+    return (idx >= 0) & (days <= ends[np.clip(idx, 0, None)])
+
+
+def _hour_of_week(times) -> np.ndarray:
+    times = pd.DatetimeIndex(times)
+    return times.dayofweek.to_numpy() * 24 + times.hour.to_numpy()
+
+
+class ScadaProfile:
+    """
+    Statistics of ``n_templates`` template feeders: ``week_shape`` is
+    (168 x templates) with mean 1 per template, every other field one
+    value per template (see ``_TEMPLATE_FIELDS``).
+    """
+
+    def __init__(self, week_shape: np.ndarray, names: list = None, **fields):
+        self.week_shape = np.asarray(week_shape, dtype=np.float64)
+        n_templates = self.week_shape.shape[1]
+        missing = [field for field in _TEMPLATE_FIELDS if field not in fields]
+        if missing:
+            raise ValueError(f"profile is missing: {', '.join(missing)}")
+        for field in _TEMPLATE_FIELDS:
+            setattr(self, field, np.broadcast_to(np.asarray(fields[field], dtype=np.float64),
+                                                 (n_templates,)).copy())
+        self.names = list(names) if names is not None else [feeder_name(j) for j in
+                                                             range(1, n_templates + 1)]
+
+    @property
+    def n_templates(self) -> int:
+        return self.week_shape.shape[1]
+
+    @classmethod
+    def default(cls, n_templates: int = 8, seed: int = RANDOM_STATE) -> 'ScadaProfile':
+        """
+        Hand-set profile: afternoon cooling peak plus an evening peak, a
+        lighter Friday/Saturday weekend, ~2.5% load per °C and 8% lower
+        load in Ramadan.
+        """
+        rng = np.random.default_rng(seed)
+        hour = np.arange(24)[:, None]
+        afternoon = rng.uniform(13, 16, n_templates)
+        evening = rng.uniform(19, 22, n_templates)
+        day = (0.75 + 0.3 * np.exp(-(hour - afternoon) ** 2 / 18)
+               + 0.2 * np.exp(-(hour - evening) ** 2 / 8))
+        weekend = np.isin(np.arange(7), [4, 5])[:, None, None]
+        shape = (day[None] * np.where(weekend, rng.uniform(0.88, 0.97, n_templates), 1.0)
+                 ).reshape(HOURS_PER_WEEK, n_templates)
+        level = np.exp(rng.normal(np.log(50), 0.5, n_templates))
+        return cls(shape / shape.mean(axis=0), level=level,
+                   temp_slope=rng.uniform(0.015, 0.035, n_templates),
+                   ramadan_effect=np.log(rng.uniform(0.88, 0.96, n_templates)),
+                   ar_coef=0.85, noise_sigma=0.04, missing_rate=0.02, mean_gap_hours=1.5,
+                   spike_rate=0.001, spike_scale=0.6, spike_up_share=0.5, spike_up_max=1.8,
+                   spike_down_max=1.8, peak_amps=3 * level)
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, feeder_cols: list = None,
+            time_column: str = TIME_COLUMN) -> 'ScadaProfile':
+        """
+        Estimate one template per feeder of merged readings.
+
+        Daily means give the temperature slope and Ramadan effect (a
+        log-linear fit per feeder), hourly readings divided by that
+        seasonal level give the hour-of-week shape, and what is left gives
+        the AR(1) noise. Spikes are Hampel outliers as in ``quality``, with
+        their direction and largest log ratio each way; gaps are the blank
+        readings on the complete hourly grid.
+        """
+        from .data import get_feeder_columns, reindex_hourly
+        from .quality import rolling_median_mad
+
+        df = reindex_hourly(df, time_column)
+        feeder_cols = get_feeder_columns(df) if feeder_cols is None else list(feeder_cols)
+        times = pd.DatetimeIndex(df[time_column])
+        values = df[feeder_cols].to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+
+        # Spikes and zero readings are kept out of the level/shape/noise fit
+        median, mad, count = rolling_median_mad(values)
+        sigma = np.maximum(1.4826 * mad, QUALITY_MAD_FLOOR_AMPS)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            spike = ((np.abs(values - median) > QUALITY_SPIKE_SIGMAS * sigma)
+                     & (count > QUALITY_SPIKE_HALF_WINDOW))
+            spike_log = np.log(values / median)
+        clean = np.where(spike | ~(values > 0), np.nan, values)
+        observed = (~missing).sum(axis=0)
+        spike_rate = spike.sum(axis=0) / np.maximum(observed, 1)
+        spike_log = np.where(spike & np.isfinite(spike_log), spike_log, np.nan)
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            spike_scale = np.nanmean(np.abs(spike_log), axis=0)
+            spike_up_share = (spike_log > 0).sum(axis=0) / np.isfinite(spike_log).sum(axis=0)
+            # A direction never seen gets a zero bound, so it is never generated
+            spike_up_max = np.nan_to_num(np.nanmax(np.maximum(spike_log, 0), axis=0))
+            spike_down_max = np.nan_to_num(np.nanmax(np.maximum(-spike_log, 0), axis=0))
+        spike_scale = np.where(np.isnan(spike_scale), 0.6, spike_scale)
+        spike_up_share = np.where(np.isnan(spike_up_share), 0.5, spike_up_share)
+        peak_amps = np.nanmax(values, axis=0) * SYNTH_PEAK_HEADROOM
+
+        # Seasonal level: log(daily mean / mean) ~ a + b (T - T_ref) + c Ramadan
+        level = np.nanmean(clean, axis=0)
+        codes, days = pd.factorize(times.normalize())
+        daily = pd.DataFrame(clean).groupby(codes).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            y = np.log(daily / level)
+        design = np.column_stack([np.ones(len(days)), monthly_temperature(days) - REFERENCE_TEMP_C,
+                                  ramadan_mask(days)])
+        weights = np.isfinite(y).astype(np.float64)
+        gram = np.einsum('df,di,dj->fij', weights, design, design) + 1e-6 * np.eye(3)
+        rhs = np.einsum('df,di,df->fi', weights, design, np.nan_to_num(y, posinf=0, neginf=0))
+        coef = np.linalg.solve(gram, rhs[..., None])[..., 0]
+        temp_slope, ramadan_effect = coef[:, 1], coef[:, 2]
+
+        temp, ramadan = monthly_temperature(times), ramadan_mask(times)
+        seasonal = np.exp(coef[:, 0] + np.outer(temp - REFERENCE_TEMP_C, temp_slope)
+                          + np.outer(ramadan, ramadan_effect))
+        ratio = clean / (level * seasonal)
+        how = _hour_of_week(times)
+        shape = pd.DataFrame(ratio).groupby(how).mean().reindex(range(HOURS_PER_WEEK))
+        shape = shape.fillna(shape.mean()).fillna(1.0).to_numpy()
+        scale = shape.mean(axis=0)
+        shape, level = shape / scale, level * np.exp(coef[:, 0]) * scale
+
+        residual = np.log(ratio / (shape[how] * scale))
+        residual -= np.nanmean(residual, axis=0)
+        lagged = residual[:-1] * residual[1:]
+        ar_coef = np.clip(np.nanmean(lagged, axis=0) / np.nanmean(residual ** 2, axis=0), 0, 0.99)
+        noise_sigma = np.nanstd(residual, axis=0) * np.sqrt(1 - ar_coef ** 2)
+
+        # Gaps: blank fraction and mean run length
+        starts = missing[0].astype(int) + (missing[1:] & ~missing[:-1]).sum(axis=0)
+        mean_gap = np.maximum(missing.sum(axis=0) / np.maximum(starts, 1), 1.0)
+
+        print(f"📐 Fitted {len(feeder_cols)} feeder templates on {len(df)} hours "
+              f"({times[0]:%Y-%m-%d} to {times[-1]:%Y-%m-%d})")
+        return cls(shape, feeder_cols, level=level, temp_slope=temp_slope,
+                   ramadan_effect=ramadan_effect, ar_coef=ar_coef, noise_sigma=noise_sigma,
+                   missing_rate=missing.mean(axis=0), mean_gap_hours=mean_gap,
+                   spike_rate=spike_rate, spike_scale=spike_scale,
+                   spike_up_share=spike_up_share, spike_up_max=spike_up_max,
+                   spike_down_max=spike_down_max, peak_amps=peak_amps)
+
+    def to_dict(self) -> dict:
+        templates = [{'name': name, **{field: round(float(getattr(self, field)[k]), 6)
+                                       for field in _TEMPLATE_FIELDS},
+                      'week_shape': np.round(self.week_shape[:, k], 5).tolist()}
+                     for k, name in enumerate(self.names)]
+        return {'format': PROFILE_FORMAT, 'version': PROFILE_VERSION,
+                'reference_temp_c': REFERENCE_TEMP_C, 'templates': templates}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ScadaProfile':
+        if data.get('format') != PROFILE_FORMAT:
+            raise ValueError("not a SCADA profile (python -m load_forecasting synth-profile "
+                             "writes one)")
+        templates = data['templates']
+        if data.get('version', 1) < 2:
+            # Version 1 profiles predate the spike bounds and the reading ceiling
+            templates = [{'spike_up_share': 0.5, 'spike_up_max': 3 * t['spike_scale'],
+                          'spike_down_max': 3 * t['spike_scale'], 'peak_amps': 3 * t['level'],
+                          **t} for t in templates]
+        return cls(np.array([t['week_shape'] for t in templates]).T,
+                   [t['name'] for t in templates],
+                   **{field: [t[field] for t in templates] for field in _TEMPLATE_FIELDS})
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScadaProfile':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def summary(self) -> pd.DataFrame:
+        """One row per template: level, per-°C and Ramadan load change, noise, gaps, spikes."""
+        return pd.DataFrame({
+            'Level_A': np.round(self.level, 2),
+            'Temp_Pct_per_C': np.round(100 * np.expm1(self.temp_slope), 2),
+            'Ramadan_Pct': np.round(100 * np.expm1(self.ramadan_effect), 1),
+            'AR1': np.round(self.ar_coef, 3),
+            'Noise_Sigma': np.round(self.noise_sigma, 4),
+            'Missing_Pct': np.round(100 * self.missing_rate, 2),
+            'Mean_Gap_h': np.round(self.mean_gap_hours, 2),
+            'Spikes_per_1000h': np.round(1000 * self.spike_rate, 2),
+            'Spike_Up_Pct': np.round(100 * self.spike_up_share, 1),
+            'Peak_A': np.round(self.peak_amps, 2),
+        }, index=pd.Index(self.names, name='Template'))
+
+
+# ------------------------------------------------------------
+# Generation
+# ------------------------------------------------------------
+
+def gap_start_probability(rate: np.ndarray, mean_length: np.ndarray) -> np.ndarray:
+    """
+    Hourly gap-start probability s at which independent gaps of geometric
+    length (mean ``mean_length``) blank a ``rate`` share of readings:
+    1 - prod_k (1 - s q^k) = rate with q = 1 - 1 / mean_length, by bisection.
+    """
+    q = 1 - 1 / np.asarray(mean_length, dtype=np.float64)
+    survive = q[None, :] ** np.arange(512)[:, None]
+    lo, hi = np.zeros_like(q), np.ones_like(q)
+    for _ in range(40):
+        mid = (lo + hi) / 2
+        low = 1 - np.prod(1 - mid * survive, axis=0) < rate
+        lo, hi = np.where(low, mid, lo), np.where(low, hi, mid)
+    return (lo + hi) / 2
+
+
+def ar1(innovations: np.ndarray, phi: np.ndarray, state: np.ndarray) -> np.ndarray:
+    """
+    ``y[t] = phi * y[t-1] + innovations[t]`` down every column, starting from
+    ``y[-1] = state``, as a log-depth scan: after the passes with offsets
+    1, 2, 4, ... each row holds its weighted sum of earlier innovations. The
+    passes stop once ``phi ** offset`` is below float32 resolution.
+    """
+    y = innovations.copy()
+    y[0] += phi * state
+    rows = len(y)
+    power = phi.copy()
+    offset = 1
+    while offset < rows and power.max() > 1e-7:
+        y[offset:] += power * y[:-offset]
+        power = power * power
+        offset *= 2
+    return y
+
+
+def iter_scada_chunks(profile: ScadaProfile, start: str, hours: int, n_feeders: int,
+                      seed: int = RANDOM_STATE, chunk_rows: int = None):
+    """
+    Yield ``(times, values)`` blocks covering ``hours`` hourly readings of
+    ``n_feeders`` feeders from ``start``; ``values`` is float32
+    (rows x feeders) with NaN for blank readings.
+    """
+    chunk_rows = chunk_rows or max(24, SYNTH_CHUNK_CELLS // n_feeders)
+    template = np.arange(n_feeders) % profile.n_templates
+    jitter = np.exp(np.random.default_rng([seed, 0]).normal(0, SYNTH_LEVEL_JITTER, n_feeders))
+    jitter[:profile.n_templates] = 1.0
+    level = (profile.level[template] * jitter).astype(np.float32)
+    slope = profile.temp_slope[template].astype(np.float32)
+    ramadan_effect = profile.ramadan_effect[template].astype(np.float32)
+    log_shape = np.log(np.maximum(profile.week_shape, 1e-3)).astype(np.float32)
+    sigma = profile.noise_sigma[template].astype(np.float32)
+    spike_rate = profile.spike_rate[template].astype(np.float32)
+    spike_scale = profile.spike_scale[template].astype(np.float32)
+    spike_up_share = profile.spike_up_share[template].astype(np.float32)
+    spike_up_max = profile.spike_up_max[template].astype(np.float32)
+    spike_down_max = profile.spike_down_max[template].astype(np.float32)
+    ceiling = np.minimum(profile.peak_amps[template] * jitter, MAX_AMPS).astype(np.float32)
+    # Gaps start independently every hour and overlapping gaps merge, so the
+    # geometric length is shortened to keep blank runs near ``mean_gap_hours``
+    rate = np.clip(profile.missing_rate, 0, 0.95)
+    length = np.maximum(profile.mean_gap_hours * (1 - rate), 1.0)
+    gap_start = gap_start_probability(rate, length)[template].astype(np.float32)
+    gap_p = (1 / length)[template]
+    phi = profile.ar_coef[template].astype(np.float32)
+
+    noise_state = np.zeros(n_feeders, dtype=np.float32)
+    gap_until = np.zeros(n_feeders, dtype=np.int64)
+    all_times = pd.date_range(start, periods=hours, freq='h')
+    for chunk, lo in enumerate(range(0, hours, chunk_rows)):
+        rng = np.random.default_rng([seed, 1, chunk])
+        times = all_times[lo:lo + chunk_rows]
+        rows = len(times)
+
+        log_mean = log_shape[_hour_of_week(times)][:, template]
+        log_mean += np.outer((monthly_temperature(times) - REFERENCE_TEMP_C).astype(np.float32),
+                             slope)
+        ramadan = ramadan_mask(times)
+        if ramadan.any():
+            log_mean[ramadan] += ramadan_effect
+
+        noise = ar1(rng.standard_normal((rows, n_feeders), dtype=np.float32) * sigma, phi,
+                    noise_state)
+        noise_state = noise[-1].copy()
+        log_mean += noise
+
+        # One uniform draw per reading decides spike (u < spike_rate) and
+        # gap start (spike_rate <= u < spike_rate + gap_start)
+        draw = rng.random((rows, n_feeders), dtype=np.float32)
+        spikes = draw < spike_rate
+        n_spikes = int(spikes.sum())
+        if n_spikes:
+            col = np.nonzero(spikes)[1]
+            up = rng.random(n_spikes) < spike_up_share[col]
+            size = rng.exponential(1.0, n_spikes) * spike_scale[col]
+            log_mean[spikes] += np.where(up, np.minimum(size, spike_up_max[col]),
+                                         -np.minimum(size, spike_down_max[col]))
+        values = level * np.exp(log_mean)
+
+        # A gap started at hour t blanks hours t .. t + length - 1
+        draw -= spike_rate
+        row_idx, col_idx = np.nonzero((draw >= 0) & (draw < gap_start))
+        ends = np.zeros((rows + 1, n_feeders), dtype=np.int32)
+        ends[0] = gap_until - lo
+        ends[row_idx + 1, col_idx] = row_idx + rng.geometric(gap_p[col_idx])
+        np.maximum.accumulate(ends, axis=0, out=ends)
+        gap_until = lo + ends[-1].astype(np.int64)
+        values[np.arange(rows, dtype=np.int32)[:, None] < ends[1:]] = np.nan
+
+        np.clip(values, 0, ceiling, out=values)
+        yield times, values
+
+
+def synthetic_readings(hours: int, n_feeders: int, start: str, profile: ScadaProfile = None,
+                       seed: int = RANDOM_STATE) -> pd.DataFrame:
+    """In-memory merged-readings frame (``Time`` + one float32 column per feeder)."""
+    profile = profile or ScadaProfile.default()
+    blocks = list(iter_scada_chunks(profile, start, hours, n_feeders, seed))
+    df = pd.DataFrame(np.round(np.concatenate([values for _, values in blocks]), 2),
+                      columns=[feeder_name(j) for j in range(1, n_feeders + 1)])
+    df.insert(0, TIME_COLUMN, np.concatenate([times.values for times, _ in blocks]))
+    return df
+
+
+@functools.lru_cache(maxsize=1)
+def _reading_fields():
+    """
+    8-byte CSV field of every reading in cents (``,`` then the value
+    right-aligned, e.g. ``,  123.45``) as uint64, with a matching uint64 of
+    0/1 keep-bytes marking the comma and the digits. The last entry is the
+    blank field of a missing reading.
+    """
+    cents = np.arange(_N_CENTS)
+    whole, frac = cents // 100, cents % 100
+    pow10 = 10 ** np.arange(3, -1, -1)
+    chars = np.empty((_N_CENTS + 1, 8), dtype=np.uint8)
+    chars[:, 0] = ord(',')
+    chars[:-1, 1:5] = (whole[:, None] // pow10) % 10 + ord('0')
+    chars[:-1, 5] = ord('.')
+    chars[:-1, 6] = frac // 10 + ord('0')
+    chars[:-1, 7] = frac % 10 + ord('0')
+    chars[-1, 1:] = ord(' ')
+    length = np.zeros(_N_CENTS + 1, dtype=np.int64)
+    length[:-1] = 4 + (whole[:, None] >= pow10[:-1]).sum(axis=1)
+    keep = (np.arange(8) == 0) | (np.arange(8) >= 8 - length[:, None])
+    return chars.view(np.uint64)[:, 0], keep.astype(np.uint8).view(np.uint64)[:, 0]
+
+
+def csv_rows(times, values: np.ndarray) -> np.ndarray:
+    """
+    ``%Y-%m-%d %H,v1,v2,...`` lines with 2-decimal readings and blanks for
+    NaN, as a uint8 array (bytes-like, for ``file.write``). Every line is
+    laid out as 8-byte words (time stamp, one looked-up field per reading,
+    newline) and compacted with the matching keep-bytes.
+    """
+    fields, keep_bytes = _reading_fields()
+    rows, n_feeders = values.shape
+    stamps = np.datetime_as_string(pd.DatetimeIndex(times).values.astype('datetime64[h]'),
+                                   unit='h').astype('S16')
+
+    cents = np.rint(values * np.float32(100))
+    cents[np.isnan(cents)] = _N_CENTS
+    cents = cents.astype(np.int32)
+
+    line = np.empty((rows, n_feeders + 3), dtype=np.uint64)
+    keep = np.zeros((rows, n_feeders + 3), dtype=np.uint64)
+    line[:, :2] = np.frombuffer(stamps.tobytes(), dtype=np.uint64).reshape(rows, 2)
+    line[:, 2:-1] = fields[cents]
+    keep[:, 2:-1] = keep_bytes[cents]
+    line_bytes, keep_view = line.view(np.uint8), keep.view(np.uint8)
+    line_bytes[:, 10] = ord(' ')
+    keep_view[:, :13] = 1
+    line_bytes[:, -8] = ord('\n')
+    keep_view[:, -8] = 1
+    return np.compress(keep_view.ravel().view(bool), line_bytes.ravel())
+
+
+def export_header(feeder_cols: list, station: str = SYNTH_STATION) -> bytes:
+    """Metadata row, header row and empty row of an NB 11kV export."""
+    n = len(feeder_cols)
+    return (',' + station + ',' * (n - 1) + '\n'
+            + ','.join([TIME_COLUMN] + list(feeder_cols)) + '\n'
+            + ',' * n + '\n').encode()
+
+
+def write_scada_exports(paths: list, hours: int, n_feeders: int, start: str,
+                        profile: ScadaProfile = None, seed: int = RANDOM_STATE,
+                        station: str = SYNTH_STATION) -> dict:
+    """
+    Stream ``hours`` of readings into the export files ``paths``, split into
+    consecutive periods of (nearly) equal length, like the quarterly
+    exports. Returns ``{'rows', 'bytes'}``.
+    """
+    profile = profile or ScadaProfile.default()
+    header = export_header([feeder_name(j) for j in range(1, n_feeders + 1)], station)
+    bounds = [hours * i // len(paths) for i in range(len(paths) + 1)]
+    written = 0
+    part, f = 0, open(paths[0], 'wb')
+    f.write(header)
+    written += len(header)
+    row = 0
+    try:
+        for times, values in iter_scada_chunks(profile, start, hours, n_feeders, seed):
+            lo = 0
+            while lo < len(times):
+                while row + lo >= bounds[part + 1]:
+                    f.close()
+                    part += 1
+                    f = open(paths[part], 'wb')
+                    f.write(header)
+                    written += len(header)
+                hi = min(len(times), bounds[part + 1] - row)
+                written += f.write(csv_rows(times[lo:hi], values[lo:hi]))
+                lo = hi
+            row += len(times)
+    finally:
+        f.close()
+    return {'rows': hours, 'bytes': written}
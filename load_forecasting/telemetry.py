@@ -0,0 +1,413 @@
+# ============================================================
+# STAGE TELEMETRY
+# ============================================================
+"""
+Structured spans for the pipeline stages, next to the progress prints.
+
+A span covers one stage call and records:
+
+* ``seconds`` - wall time
+* ``rows_in`` / ``cols_in`` and ``rows_out`` / ``cols_out`` - shape of the
+  first array-like argument and of the result
+* ``peak_mem_delta_mb`` - peak RSS during the span minus RSS at its start
+* ``fit_seconds`` - time spent in model fits (``fit`` spans) anywhere inside
+  the span
+* ``parent`` - the enclosing span, so a night's run reads as a tree
+* ``status`` - ``ok`` or ``error`` (with the exception)
+
+Telemetry is off by default. Stage functions are wrapped with ``traced``,
+which only checks a module flag while telemetry is off, so the cost is
+below a microsecond per call. ``configure`` turns it on with one or more
+sinks::
+
+    from load_forecasting import telemetry
+    sink = telemetry.MemorySink()
+    telemetry.configure([sink, telemetry.JsonLinesSink("telemetry.jsonl")])
+
+The CLI does this with ``--telemetry telemetry.jsonl``, and
+``python -m load_forecasting telemetry`` summarises that file per run and
+stage against ``STAGE_SLA_SECONDS``.
+
+With ``profile='cprofile'`` every span that is not already inside a
+profiled span (and not opened with ``profile=False``) runs under
+``cProfile``, and its stats are written to ``profile_dir`` (the span
+records the path). Any other callable ``profile(name)`` returning a context
+manager, such as a sampling profiler, is used the same way.
+
+Peak memory is the kernel's RSS high-water mark (Linux ``VmHWM``), reset at
+the start of every span and carried up to the parent when a child closes.
+Elsewhere it falls back to the process-wide ``ru_maxrss``.
+"""
+
+import contextlib
+import datetime
+import functools
+import itertools
+import json
+import os
+import platform
+import threading
+import time
+import traceback
+import uuid
+
+_config = {'enabled': False, 'sinks': [], 'profile': None, 'profile_dir': None, 'run': None}
+_local = threading.local()
+_ids = itertools.count(1)
+
+
+# ------------------------------------------------------------
+# Memory
+# ------------------------------------------------------------
+
+def _status_mb(field: str):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def rss_mb():
+    """Current resident set size in MB (None where /proc is unavailable)."""
+    return _status_mb('VmRSS')
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS mark to the current RSS (Linux); False if unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS in MB since the last ``reset_peak_rss`` (or process start)."""
+    peak = _status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak / 1024 ** 2 if platform.system() == 'Darwin' else peak / 1024
+
+
+# ------------------------------------------------------------
+# Sinks
+# ------------------------------------------------------------
+
+class MemorySink:
+    """Keeps span records in ``records`` (tests, notebooks)."""
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record: dict):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """Appends one JSON object per span to ``path``, flushed per record."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a')
+
+    def emit(self, record: dict):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+_SPAN_KEYS = ('run', 'span', 'name', 'start', 'seconds')
+
+
+def load_records(path: str) -> list:
+    """
+    Span records of a ``JsonLinesSink`` file. Lines that are not span
+    records (e.g. a line cut short by a crash) are skipped; a file with no
+    span records at all raises ValueError.
+    """
+    records, skipped = [], 0
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict) and all(key in record for key in _SPAN_KEYS):
+                records.append(record)
+            else:
+                skipped += 1
+    if skipped and not records:
+        raise ValueError(f"{path} is not a telemetry file (no span records); "
+                         f"--telemetry FILE writes one")
+    if skipped:
+        print(f"⚠️ Skipped {skipped} line(s) of {path} that are not span records")
+    return records
+
+
+# ------------------------------------------------------------
+# Configuration
+# ------------------------------------------------------------
+
+def configure(sinks: list, profile=None, profile_dir: str = None) -> str:
+    """
+    Enable telemetry with ``sinks`` (objects with ``emit(record)`` and
+    ``close()``). ``profile`` is ``'cprofile'`` or a callable
+    ``profile(name)`` returning a context manager. Returns the run id that
+    tags every record until ``disable``.
+    """
+    if profile == 'cprofile':
+        profile = _cprofile
+    if profile is not None and profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+    _config.update(sinks=list(sinks), profile=profile, profile_dir=profile_dir or os.curdir,
+                   run=uuid.uuid4().hex[:12], enabled=bool(sinks))
+    return _config['run']
+
+
+def disable():
+    """Turn telemetry off and close the sinks."""
+    for sink in _config['sinks']:
+        sink.close()
+    _config.update(enabled=False, sinks=[], profile=None, run=None)
+
+
+def enabled() -> bool:
+    return _config['enabled']
+
+
+@contextlib.contextmanager
+def _cprofile(name: str):
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path = os.path.join(_config['profile_dir'],
+                            f"{_config['run']}-{current().id:04d}-{name}.prof")
+        profiler.dump_stats(path)
+        current().profile = path
+
+
+# ------------------------------------------------------------
+# Spans
+# ------------------------------------------------------------
+
+def _shape(value):
+    """``(rows, cols)`` of an array-like, the first array-like of a tuple, else None."""
+    if isinstance(value, tuple):
+        for item in value:
+            shape = _shape(item)
+            if shape is not None:
+                return shape
+        return None
+    shape = getattr(value, 'shape', None)
+    if not isinstance(shape, tuple) or not shape:
+        return None
+    return int(shape[0]), int(shape[1]) if len(shape) > 1 else 1
+
+
+class Span:
+    """One timed stage; use through ``span`` or ``traced``."""
+
+    def __init__(self, name: str, parent, fit: bool, attrs: dict):
+        self.id = next(_ids)
+        self.name = name
+        self.parent = parent
+        self.fit = fit
+        self.attrs = attrs
+        self.rows_in = self.cols_in = self.rows_out = self.cols_out = None
+        self.fit_seconds = 0.0
+        self.profile = None
+        self.profiling = False
+        self.child_peak = 0.0
+
+    def inputs(self, *values):
+        """Record the shape of the first array-like in ``values``."""
+        for value in values:
+            shape = _shape(value)
+            if shape is not None:
+                self.rows_in, self.cols_in = shape
+                return
+
+    def output(self, value):
+        shape = _shape(value)
+        if shape is not None:
+            self.rows_out, self.cols_out = shape
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    """Stand-in yielded while telemetry is off."""
+
+    def inputs(self, *values):
+        pass
+
+    def output(self, value):
+        pass
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def current():
+    """The innermost open span of this thread, or None."""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+@contextlib.contextmanager
+def span(name: str, fit: bool = False, profile: bool = True, **attrs):
+    """
+    Time the enclosed block as span ``name`` with extra ``attrs``. A
+    ``fit=True`` span adds its duration to the ``fit_seconds`` of every
+    enclosing span;
+    ``profile=False`` leaves the span itself unprofiled, so that each of its
+    children is profiled separately.
+    """
+    if not _config['enabled']:
+        yield _NULL_SPAN
+        return
+
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    parent = stack[-1] if stack else None
+    current_span = Span(name, parent, fit, attrs)
+    profiler = _config['profile'] if profile else None
+    # Profilers do not nest: only the outermost profiled span is profiled
+    profiled = profiler is not None and not any(s.profiling for s in stack)
+    rss_start = rss_mb()
+    stage_scoped = reset_peak_rss()
+    started = datetime.datetime.now().isoformat(timespec='milliseconds')
+    stack.append(current_span)
+    status, error = 'ok', None
+    start = time.perf_counter()
+    try:
+        if profiled:
+            current_span.profiling = True
+            with profiler(name):
+                yield current_span
+        else:
+            yield current_span
+    except BaseException as exc:
+        status = 'error'
+        error = ''.join(traceback.format_exception_only(type(exc), exc)).strip()
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        peak = max(peak_rss_mb(), current_span.child_peak)
+        if parent is not None:
+            parent.child_peak = max(parent.child_peak, peak)
+            # Carried up like child_peak, so every ancestor counts nested fits
+            parent.fit_seconds += seconds if fit else current_span.fit_seconds
+        record = {
+            'run': _config['run'],
+            'span': current_span.id,
+            'parent': parent.id if parent is not None else None,
+            'name': name,
+            'start': started,
+            'seconds': round(seconds, 6),
+            'rows_in': current_span.rows_in,
+            'cols_in': current_span.cols_in,
+            'rows_out': current_span.rows_out,
+            'cols_out': current_span.cols_out,
+            'peak_mem_delta_mb': None if rss_start is None else round(peak - rss_start, 1),
+            'peak_rss_mb': round(peak, 1),
+            'peak_scope': 'span' if stage_scoped else 'process',
+            'fit_seconds': round(seconds if fit else current_span.fit_seconds, 6),
+            'status': status,
+            'error': error,
+            'pid': os.getpid(),
+            'attrs': current_span.attrs,
+        }
+        if current_span.profile is not None:
+            record['profile'] = current_span.profile
+        for sink in _config['sinks']:
+            sink.emit(record)
+
+
+def traced(name: str):
+    """
+    Decorator: run the function as span ``name``, recording the shape of
+    its first array-like argument and of its result.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _config['enabled']:
+                return fn(*args, **kwargs)
+            with span(name) as s:
+                s.inputs(*args, *kwargs.values())
+                result = fn(*args, **kwargs)
+                s.output(result)
+                return result
+        return wrapper
+    return decorate
+
+
+# ------------------------------------------------------------
+# Reports
+# ------------------------------------------------------------
+
+def summarize(records: list, sla: dict = None):
+    """
+    One row per (run, span name): calls, total / max seconds, fit seconds,
+    rows in/out of the slowest call, peak memory delta and errors. With
+    ``sla`` (name -> seconds) ``Over_SLA`` marks names whose slowest call
+    exceeded it.
+    """
+    import pandas as pd
+
+    columns = ['Run', 'Start', 'Name', 'Calls', 'Total_s', 'Max_s', 'Fit_s', 'Rows_In',
+               'Rows_Out', 'Peak_Mem_Delta_MB', 'Errors', 'SLA_s', 'Over_SLA']
+    if not records:
+        return pd.DataFrame(columns=columns)
+    sla = sla or {}
+    df = pd.DataFrame(records)
+    rows = []
+    for (run, name), group in df.groupby(['run', 'name'], sort=False):
+        slowest = group.loc[group['seconds'].idxmax()]
+        limit = sla.get(name)
+        rows.append({
+            'Run': run,
+            'Start': group['start'].min(),
+            'Name': name,
+            'Calls': len(group),
+            'Total_s': round(group['seconds'].sum(), 3),
+            'Max_s': round(slowest['seconds'], 3),
+            'Fit_s': round(group['fit_seconds'].sum(), 3),
+            'Rows_In': slowest['rows_in'],
+            'Rows_Out': slowest['rows_out'],
+            'Peak_Mem_Delta_MB': group['peak_mem_delta_mb'].max(),
+            'Errors': int((group['status'] == 'error').sum()),
+            'SLA_s': limit,
+            'Over_SLA': bool(limit is not None and slowest['seconds'] > limit),
+        })
+    return pd.DataFrame(rows, columns=columns).sort_values(['Start', 'Run'], kind='stable')
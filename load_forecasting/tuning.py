@@ -0,0 +1,304 @@
+# ============================================================
+# HYPERPARAMETER SEARCH (SUCCESSIVE HALVING)
+# ============================================================
+"""
+Successive-halving search for the XGBoost, LightGBM and Random Forest
+settings of ``models_dict`` / ``XGBOOST_PARAMS``.
+
+``TUNING_TRIALS`` configurations (trial 0 is the current hand-tuned one)
+start on a small estimator budget; after every rung only the best
+``1 / TUNING_ETA`` survive and the budget grows ``TUNING_ETA``-fold, up to
+``TUNING_MAX_ESTIMATORS``. A trial is scored by its mean MAE over
+``TUNING_FOLDS`` time-ordered folds of the training period. Boosters use
+native early stopping on the last ``EARLY_STOPPING_FRACTION`` of each
+fold's training rows, so the test split is never looked at and rounds past
+the validation optimum are not paid for. Random Forest has no early
+stopping and simply grows the rung's number of trees.
+
+Trials run on a loky process pool over memory-mapped X/y, each with a fixed
+thread budget. Every finished trial is appended to a JSON-lines file; an
+interrupted search started again with the same file and settings skips the
+trials already recorded.
+
+Trees are insensitive to feature scaling, so the search runs on the raw
+feature matrix.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .config import (EARLY_STOPPING_FRACTION, EARLY_STOPPING_ROUNDS, RANDOM_STATE, TUNING_ETA,
+                     TUNING_FOLDS, TUNING_MAX_ESTIMATORS, TUNING_MIN_ESTIMATORS, TUNING_TRIALS,
+                     TUNING_TRIALS_FILE, XGBOOST_PARAMS)
+from .telemetry import traced
+
+# (kind, ...) per hyperparameter: int low high | float low high | log low high | choice values
+SEARCH_SPACES = {
+    'XGBoost': {
+        'max_depth': ('int', 3, 10),
+        'learning_rate': ('log', 0.01, 0.3),
+        'subsample': ('float', 0.5, 1.0),
+        'colsample_bytree': ('float', 0.5, 1.0),
+        'min_child_weight': ('log', 1.0, 20.0),
+        'gamma': ('float', 0.0, 1.0),
+        'reg_alpha': ('log', 0.001, 10.0),
+        'reg_lambda': ('log', 0.01, 10.0),
+    },
+    'LightGBM': {
+        'num_leaves': ('int', 15, 127),
+        'max_depth': ('int', 3, 12),
+        'learning_rate': ('log', 0.01, 0.3),
+        'colsample_bytree': ('float', 0.5, 1.0),
+        'min_child_samples': ('int', 5, 100),
+        'reg_alpha': ('log', 0.001, 10.0),
+        'reg_lambda': ('log', 0.01, 10.0),
+    },
+    'Random Forest': {
+        'max_depth': ('choice', [8, 12, 15, 20, None]),
+        'min_samples_split': ('int', 2, 20),
+        'min_samples_leaf': ('int', 1, 10),
+        'max_features': ('choice', [1.0, 0.7, 0.5, 'sqrt']),
+    },
+}
+
+# Random Forest cost grows with every tree, so it gets a smaller budget range
+_BUDGETS = {'Random Forest': (25, 400)}
+
+
+def base_estimator(model_name: str):
+    """The estimator the search starts from (trial 0 uses its settings)."""
+    if model_name == 'XGBoost':
+        import xgboost as xgb
+        return xgb.XGBRegressor(**XGBOOST_PARAMS)
+    from .training import build_models_dict
+    return build_models_dict()[model_name]
+
+
+def sample_params(space: dict, rng: np.random.Generator) -> dict:
+    """Draw one configuration from a ``SEARCH_SPACES`` entry."""
+    params = {}
+    for name, (kind, *spec) in space.items():
+        if kind == 'int':
+            params[name] = int(rng.integers(spec[0], spec[1] + 1))
+        elif kind == 'float':
+            params[name] = round(float(rng.uniform(spec[0], spec[1])), 4)
+        elif kind == 'log':
+            params[name] = float(f"{np.exp(rng.uniform(np.log(spec[0]), np.log(spec[1]))):.4g}")
+        elif kind == 'choice':
+            params[name] = spec[0][int(rng.integers(len(spec[0])))]
+        else:
+            raise ValueError(f"unknown search space kind: {kind}")
+    return params
+
+
+def rung_schedule(n_trials: int, eta: int, min_budget: int, max_budget: int) -> list:
+    """``[(n_trials, budget), ...]`` per rung, ending at one trial or ``max_budget``."""
+    rungs = []
+    n, budget = n_trials, min_budget
+    while True:
+        rungs.append((n, min(budget, max_budget)))
+        if n <= 1 or budget >= max_budget:
+            return rungs
+        n, budget = max(1, n // eta), budget * eta
+
+
+def time_folds(n_rows: int, n_folds: int = TUNING_FOLDS,
+               stop_fraction: float = EARLY_STOPPING_FRACTION) -> list:
+    """
+    ``(fit_stop, stop_stop, val_stop)`` row bounds of TimeSeriesSplit folds:
+    fit on ``[0, fit_stop)``, early-stop on ``[fit_stop, stop_stop)`` and score
+    on ``[stop_stop, val_stop)``.
+    """
+    from sklearn.model_selection import TimeSeriesSplit
+
+    folds = []
+    for train_idx, val_idx in TimeSeriesSplit(n_splits=n_folds).split(np.empty((n_rows, 1))):
+        stop_stop = int(train_idx[-1]) + 1
+        fit_stop = stop_stop - max(1, int(stop_stop * stop_fraction))
+        folds.append((fit_stop, stop_stop, int(val_idx[-1]) + 1))
+    return folds
+
+
+def _fit_early_stopping(model, X, y, fit_stop: int, stop_stop: int):
+    """Fit with native early stopping; returns ``(best_n_estimators, rounds_trained)``."""
+    kind = type(model).__name__
+    if kind == 'XGBRegressor':
+        model.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+        model.fit(X[:fit_stop], y[:fit_stop], eval_set=[(X[fit_stop:stop_stop], y[fit_stop:stop_stop])],
+                  verbose=False)
+        return model.best_iteration + 1, model.get_booster().num_boosted_rounds()
+    if kind == 'LGBMRegressor':
+        import lightgbm as lgb
+        model.fit(X[:fit_stop], y[:fit_stop], eval_set=[(X[fit_stop:stop_stop], y[fit_stop:stop_stop])],
+                  callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)])
+        return model.best_iteration_ or model.n_estimators, model.booster_.current_iteration()
+    # No early stopping: train on the whole fold training period
+    model.fit(X[:stop_stop], y[:stop_stop])
+    return model.n_estimators, model.n_estimators
+
+
+def _trial_job(trial, rung, estimator, params, budget, X_path, y_path, folds, threads):
+    """Worker: score one configuration at one budget on every fold."""
+    from sklearn.base import clone
+    from threadpoolctl import threadpool_limits
+
+    X = np.load(X_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+
+    maes, best_n, rounds = [], [], 0
+    with threadpool_limits(limits=threads):
+        for fit_stop, stop_stop, val_stop in folds:
+            model = clone(estimator).set_params(**params, n_estimators=budget)
+            if 'n_jobs' in model.get_params():
+                model.set_params(n_jobs=threads)
+            n_best, n_trained = _fit_early_stopping(model, X, y, fit_stop, stop_stop)
+            y_pred = model.predict(X[stop_stop:val_stop])
+            maes.append(float(np.mean(np.abs(y[stop_stop:val_stop] - y_pred))))
+            best_n.append(int(n_best))
+            rounds += int(n_trained)
+
+    return {'trial': trial, 'rung': rung, 'budget': budget, 'params': params,
+            'mae': float(np.mean(maes)), 'mae_std': float(np.std(maes)),
+            'n_estimators': int(round(np.mean(best_n))), 'rounds': rounds}
+
+
+def _load_trials(path: str, search: dict) -> dict:
+    """
+    Recorded trials of ``path`` keyed by ``(trial, rung)``; starts the file
+    if absent. A last line cut short by an interrupted run is truncated, so
+    the records appended next start on a line of their own.
+    """
+    if not os.path.exists(path):
+        with open(path, 'w') as f:
+            f.write(json.dumps({'search': search}) + '\n')
+        return {}
+
+    records = {}
+    with open(path, 'rb+') as f:
+        header = f.readline()
+        if json.loads(header).get('search') != search:
+            raise ValueError(f"{path} records a different search (model, space, settings or data); "
+                             f"remove it or choose another trials file")
+        end = len(header)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # Line cut short by an interrupted run
+            end += len(line)
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[(record['trial'], record['rung'])] = record
+        f.truncate(end)
+    return records
+
+
+@traced('tuning.successive_halving')
+def successive_halving(X, y, model_name: str = 'XGBoost', n_trials: int = TUNING_TRIALS,
+                       eta: int = TUNING_ETA, n_folds: int = TUNING_FOLDS,
+                       min_budget: int = None, max_budget: int = None,
+                       trials_file: str = TUNING_TRIALS_FILE, n_workers: int = None,
+                       threads_per_trial: int = None, seed: int = RANDOM_STATE) -> dict:
+    """
+    Successive-halving search for ``model_name`` on the (training-period)
+    ``X`` / ``y``.
+
+    Returns a dict with ``best_params`` (the tuned settings plus the
+    early-stopped ``n_estimators``), ``best_mae``, the ``trials`` table and
+    the boosting rounds / trees trained versus an exhaustive search of the
+    same trials at the full budget.
+    """
+    from joblib import Parallel, delayed
+
+    space = SEARCH_SPACES[model_name]
+    default_min, default_max = _BUDGETS.get(model_name, (TUNING_MIN_ESTIMATORS, TUNING_MAX_ESTIMATORS))
+    schedule = rung_schedule(n_trials, eta, min_budget or default_min, max_budget or default_max)
+
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    folds = time_folds(len(X), n_folds)
+
+    estimator = base_estimator(model_name)
+    rng = np.random.default_rng(seed)
+    baseline = {name: estimator.get_params()[name] for name in space}
+    configs = [baseline] + [sample_params(space, rng) for _ in range(n_trials - 1)]
+
+    search = json.loads(json.dumps({
+        'model': model_name, 'space': space, 'n_trials': n_trials, 'eta': eta,
+        'schedule': schedule, 'folds': folds, 'seed': seed,
+        'early_stopping_rounds': EARLY_STOPPING_ROUNDS,
+        'data': hashlib.sha256(X.tobytes() + y.tobytes()).hexdigest(),
+    }))
+    records = _load_trials(trials_file, search)
+
+    n_cores = os.cpu_count() or 1
+    print("=" * 60)
+    print(f"🔎 SUCCESSIVE HALVING: {model_name}, {n_trials} trials, eta={eta}, {n_folds} folds")
+    print("=" * 60)
+
+    survivors = list(range(n_trials))
+    with tempfile.TemporaryDirectory(prefix='load_forecasting_tune_') as tmp:
+        X_path = os.path.join(tmp, 'X.npy')
+        y_path = os.path.join(tmp, 'y.npy')
+        np.save(X_path, X)
+        np.save(y_path, y)
+
+        for rung, (n_keep, budget) in enumerate(schedule):
+            survivors = survivors[:n_keep]
+            pending = [trial for trial in survivors if (trial, rung) not in records]
+            workers = max(1, min(len(pending), n_workers or n_cores))
+            threads = threads_per_trial or max(1, n_cores // workers)
+            print(f"\n   Rung {rung}: {len(survivors)} trials x {budget} estimators "
+                  f"({len(survivors) - len(pending)} resumed, {workers} workers x {threads} threads)")
+
+            if pending:
+                results = Parallel(n_jobs=workers, backend='loky', batch_size=1,
+                                   return_as='generator_unordered')(
+                    delayed(_trial_job)(trial, rung, estimator, configs[trial], budget,
+                                        X_path, y_path, folds, threads)
+                    for trial in pending)
+                with open(trials_file, 'a') as f:
+                    for record in results:
+                        f.write(json.dumps(record) + '\n')
+                        f.flush()
+                        records[(record['trial'], rung)] = record
+
+            survivors.sort(key=lambda trial: (records[(trial, rung)]['mae'], trial))
+            best = records[(survivors[0], rung)]
+            print(f"   ✅ Best so far: trial {best['trial']} MAE={best['mae']:.4f} "
+                  f"(n_estimators={best['n_estimators']})")
+
+    last_rung = len(schedule) - 1
+    best = records[(survivors[0], last_rung)]
+    trials = pd.DataFrame([
+        {'Trial': r['trial'], 'Rung': r['rung'], 'Budget': r['budget'], 'MAE': r['mae'],
+         'MAE_std': r['mae_std'], 'N_Estimators': r['n_estimators'], **r['params']}
+        for r in records.values()
+    ]).sort_values(['Rung', 'MAE'], ascending=[False, True]).reset_index(drop=True)
+
+    rounds_used = sum(r['rounds'] for r in records.values())
+    rounds_full = n_trials * schedule[-1][1] * len(folds)
+    baseline_mae = records[(0, 0)]['mae']
+
+    print("\n" + "=" * 60)
+    print("📊 TUNING SUMMARY")
+    print("=" * 60)
+    print(f"   ├── Best trial: {best['trial']} (MAE {best['mae']:.4f}; "
+          f"current settings at rung 0: {baseline_mae:.4f})")
+    print(f"   ├── n_estimators: {best['n_estimators']}")
+    print(f"   └── Estimators trained: {rounds_used:,} vs {rounds_full:,} for a full search "
+          f"({rounds_used / rounds_full:.1%})")
+
+    return {
+        'model': model_name,
+        'best_params': {**best['params'], 'n_estimators': best['n_estimators']},
+        'best_mae': best['mae'],
+        'trials': trials,
+        'rounds_used': rounds_used,
+        'rounds_full': rounds_full,
+    }
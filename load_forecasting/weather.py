@@ -0,0 +1,403 @@
+# ============================================================================
+# WEATHER & CONTEXTUAL FEATURES
+# Add Temperature, Humidity, Season, and Ramadan indicators
+# ============================================================================
+"""
+Weather and contextual features for Al-Khabourah: temperature, humidity,
+heat index, Oman seasons and Ramadan indicators.
+"""
+
+import math
+import random
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .config import TIME_COLUMN
+from .telemetry import traced
+
+# WeatherAPI Configuration
+LOCATION_LAT = 23.98
+LOCATION_LON = 57.1
+LOCATION_NAME = "Al-Khabourah"
+
+# ============================================================================
+# RAMADAN DATES (Hijri Calendar - approximate Gregorian dates)
+# Source: Wikipedia/Umm al-Qura Calendar of Saudi Arabia (validated Jan 2026)
+# ============================================================================
+# Ramadan dates vary each year based on lunar calendar
+RAMADAN_PERIODS = [
+    # (start_date, end_date) - official Gregorian dates
+    ("2024-03-11", "2024-04-09"),   # Ramadan 1445 AH
+    ("2025-03-01", "2025-03-29"),   # Ramadan 1446 AH (confirmed moon sighting Feb 28)
+    ("2026-02-18", "2026-03-19"),   # Ramadan 1447 AH
+    ("2027-02-08", "2027-03-08"),   # Ramadan 1448 AH
+]
+
+# Typical monthly temperature (°C) and humidity (%) for Al-Khabourah, Oman
+MONTHLY_WEATHER_OMAN = {
+    1:  {'temp_avg': 20.5, 'temp_min': 15, 'temp_max': 26, 'humidity': 65},
+    2:  {'temp_avg': 22.0, 'temp_min': 16, 'temp_max': 28, 'humidity': 60},
+    3:  {'temp_avg': 25.5, 'temp_min': 19, 'temp_max': 32, 'humidity': 55},
+    4:  {'temp_avg': 30.0, 'temp_min': 23, 'temp_max': 37, 'humidity': 45},
+    5:  {'temp_avg': 34.5, 'temp_min': 28, 'temp_max': 41, 'humidity': 40},
+    6:  {'temp_avg': 36.0, 'temp_min': 30, 'temp_max': 42, 'humidity': 45},
+    7:  {'temp_avg': 35.5, 'temp_min': 30, 'temp_max': 41, 'humidity': 55},
+    8:  {'temp_avg': 34.0, 'temp_min': 29, 'temp_max': 39, 'humidity': 60},
+    9:  {'temp_avg': 33.0, 'temp_min': 27, 'temp_max': 39, 'humidity': 55},
+    10: {'temp_avg': 30.5, 'temp_min': 24, 'temp_max': 37, 'humidity': 50},
+    11: {'temp_avg': 26.0, 'temp_min': 20, 'temp_max': 32, 'humidity': 55},
+    12: {'temp_avg': 22.0, 'temp_min': 16, 'temp_max': 28, 'humidity': 65},
+}
+
+
+def is_ramadan(date):
+    """Check if a given date falls within Ramadan period."""
+    date_str = date.strftime("%Y-%m-%d") if hasattr(date, 'strftime') else str(date)[:10]
+    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+
+    for start, end in RAMADAN_PERIODS:
+        start_date = datetime.strptime(start, "%Y-%m-%d")
+        end_date = datetime.strptime(end, "%Y-%m-%d")
+        if start_date <= date_obj <= end_date:
+            return 1
+    return 0
+
+
+# ============================================================================
+# SEASON CLASSIFICATION (Oman Climate)
+# ============================================================================
+def get_season_oman(month):
+    """
+    Get season for Oman based on month.
+    Oman has distinct seasons:
+    - Winter (Dec-Feb): Cool, pleasant
+    - Spring (Mar-Apr): Warming up
+    - Summer (May-Sep): Hot, humid (Khareef in south)
+    - Autumn (Oct-Nov): Cooling down
+    """
+    if month in [12, 1, 2]:
+        return 'Winter'
+    elif month in [3, 4]:
+        return 'Spring'
+    elif month in [5, 6, 7, 8, 9]:
+        return 'Summer'
+    else:  # 10, 11
+        return 'Autumn'
+
+
+def get_season_numeric(month):
+    """Get numeric season code for ML models."""
+    if month in [12, 1, 2]:
+        return 0  # Winter
+    elif month in [3, 4]:
+        return 1  # Spring
+    elif month in [5, 6, 7, 8, 9]:
+        return 2  # Summer
+    else:
+        return 3  # Autumn
+
+
+# ============================================================================
+# TEMPERATURE & HUMIDITY ESTIMATION
+# ============================================================================
+def estimate_temperature(timestamp):
+    """
+    Estimate temperature based on month and hour.
+    Adds diurnal variation (day/night temperature difference).
+    """
+    month = timestamp.month
+    hour = timestamp.hour
+
+    temp_min = MONTHLY_WEATHER_OMAN[month]['temp_min']
+    temp_max = MONTHLY_WEATHER_OMAN[month]['temp_max']
+
+    # Diurnal variation: coldest at 5-6 AM, hottest at 2-3 PM
+    # Peak at hour 14 (2 PM), minimum at hour 5 (5 AM)
+    hour_factor = math.sin((hour - 5) * math.pi / 12) if 5 <= hour <= 17 else -0.5
+
+    # Temperature varies between min and max based on hour
+    temp_range = temp_max - temp_min
+    estimated_temp = temp_min + (temp_range * (hour_factor + 0.5) / 1.5)
+
+    # Add small random variation (+/- 1.5°C)
+    random.seed(int(timestamp.timestamp()) if hasattr(timestamp, 'timestamp') else hash(str(timestamp)))
+    variation = random.uniform(-1.5, 1.5)
+
+    return round(estimated_temp + variation, 1)
+
+
+def estimate_humidity(timestamp):
+    """
+    Estimate humidity based on month and hour.
+    Humidity is typically higher at night and early morning.
+    """
+    month = timestamp.month
+    hour = timestamp.hour
+
+    base_humidity = MONTHLY_WEATHER_OMAN[month]['humidity']
+
+    # Humidity variation: higher early morning, lower afternoon
+    # Inverse of temperature pattern
+    if 6 <= hour <= 18:
+        hour_factor = -math.sin((hour - 6) * math.pi / 12) * 0.3
+    else:
+        hour_factor = 0.2
+
+    estimated_humidity = base_humidity * (1 + hour_factor)
+
+    # Add small random variation
+    random.seed(int(timestamp.timestamp()) + 1 if hasattr(timestamp, 'timestamp') else hash(str(timestamp)) + 1)
+    variation = random.uniform(-5, 5)
+
+    return round(min(100, max(20, estimated_humidity + variation)), 1)
+
+
+def calculate_heat_index(temp_c, humidity):
+    """Calculate heat index (feels like temperature) in Celsius."""
+    # Convert to Fahrenheit for calculation
+    temp_f = temp_c * 9/5 + 32
+
+    if temp_f < 80:
+        return temp_c  # No heat index adjustment needed
+
+    # Rothfusz regression equation
+    hi_f = (-42.379 + 2.04901523 * temp_f + 10.14333127 * humidity
+            - 0.22475541 * temp_f * humidity - 0.00683783 * temp_f**2
+            - 0.05481717 * humidity**2 + 0.00122874 * temp_f**2 * humidity
+            + 0.00085282 * temp_f * humidity**2 - 0.00000199 * temp_f**2 * humidity**2)
+
+    # Convert back to Celsius
+    hi_c = (hi_f - 32) * 5/9
+    return round(hi_c, 1)
+
+
+# ============================================================================
+# BATCHED (VECTORIZED) IMPLEMENTATIONS
+# ============================================================================
+# The scalar functions above are the reference definitions. The batched
+# versions below produce identical values over whole arrays of timestamps.
+
+SEASON_NAMES = np.array(['Winter', 'Spring', 'Summer', 'Autumn'])
+SEASON_CODE_BY_MONTH = np.array([-1] + [get_season_numeric(m) for m in range(1, 13)], dtype=np.int64)
+
+# Lookup tables indexed by month (index 0 unused)
+TEMP_MIN_BY_MONTH = np.array([np.nan] + [MONTHLY_WEATHER_OMAN[m]['temp_min'] for m in range(1, 13)])
+TEMP_MAX_BY_MONTH = np.array([np.nan] + [MONTHLY_WEATHER_OMAN[m]['temp_max'] for m in range(1, 13)])
+HUMIDITY_BY_MONTH = np.array([np.nan] + [MONTHLY_WEATHER_OMAN[m]['humidity'] for m in range(1, 13)])
+
+# Diurnal factors indexed by hour, evaluated with math.sin exactly as the scalar versions
+TEMP_HOUR_FACTOR = np.array([math.sin((h - 5) * math.pi / 12) if 5 <= h <= 17 else -0.5
+                             for h in range(24)])
+HUMIDITY_HOUR_FACTOR = np.array([-math.sin((h - 6) * math.pi / 12) * 0.3 if 6 <= h <= 18 else 0.2
+                                 for h in range(24)])
+
+RAMADAN_STARTS = np.array([start for start, _ in RAMADAN_PERIODS], dtype='datetime64[D]')
+RAMADAN_ENDS = np.array([end for _, end in RAMADAN_PERIODS], dtype='datetime64[D]')
+
+# Mersenne Twister (MT19937) constants, as used by Python's ``random`` module
+_MT_N = 624
+_MT_M = 397
+_MT_CHUNK = 8192
+
+
+def _mt_base_state() -> np.ndarray:
+    """State after init_genrand(19650218), the starting point of init_by_array."""
+    mt = [19650218]
+    for i in range(1, _MT_N):
+        mt.append((1812433253 * (mt[i - 1] ^ (mt[i - 1] >> 30)) + i) & 0xFFFFFFFF)
+    return np.array(mt, dtype=np.uint32)
+
+
+_MT_BASE = _mt_base_state()
+
+
+def _mt_temper(y: np.ndarray) -> np.ndarray:
+    y = y ^ (y >> np.uint32(11))
+    y = y ^ ((y << np.uint32(7)) & np.uint32(0x9D2C5680))
+    y = y ^ ((y << np.uint32(15)) & np.uint32(0xEFC60000))
+    return y ^ (y >> np.uint32(18))
+
+
+def _mt_first_random(keys: np.ndarray) -> np.ndarray:
+    """
+    First ``random.random()`` draw after ``random.seed(key)`` for every key.
+
+    Runs MT19937 init_by_array for a single 32-bit key word across all keys
+    at once (one pass of 1247 array steps instead of one per row), then
+    derives only the two state words needed for the first double.
+    """
+    keys = keys.astype(np.uint32)
+    mt = np.empty((_MT_N, len(keys)), dtype=np.uint32)
+    mult1 = np.uint32(1664525)
+    mult2 = np.uint32(1566083941)
+    shift = np.uint32(30)
+
+    # First loop: k = max(N, key_length) = N steps, j is always 0
+    mt[0] = _MT_BASE[0]
+    prev = mt[0]
+    for i in range(1, _MT_N):
+        prev = mt[i] = (_MT_BASE[i] ^ ((prev ^ (prev >> shift)) * mult1)) + keys
+    mt[0] = prev
+    prev = mt[1] = (mt[1] ^ ((prev ^ (prev >> shift)) * mult1)) + keys
+
+    # Second loop: N - 1 steps continuing from i = 2
+    for i in range(2, _MT_N):
+        prev = mt[i] = (mt[i] ^ ((prev ^ (prev >> shift)) * mult2)) - np.uint32(i)
+    mt[0] = prev
+    mt[1] = (mt[1] ^ ((prev ^ (prev >> shift)) * mult2)) - np.uint32(1)
+    mt[0] = 0x80000000
+
+    # First twist, restricted to output words 0 and 1
+    words = []
+    for i in (0, 1):
+        y = (mt[i] & np.uint32(0x80000000)) | (mt[i + 1] & np.uint32(0x7FFFFFFF))
+        mag = np.where(y & np.uint32(1), np.uint32(0x9908B0DF), np.uint32(0))
+        words.append(_mt_temper(mt[i + _MT_M] ^ (y >> np.uint32(1)) ^ mag))
+
+    a = (words[0] >> np.uint32(5)).astype(np.float64)
+    b = (words[1] >> np.uint32(6)).astype(np.float64)
+    return (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
+
+
+def seeded_uniform(seeds: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Vectorized ``random.seed(s); random.uniform(low, high)`` for each seed.
+
+    Deterministic noise keyed on the seed (the epoch second of the
+    timestamp). Seeds outside a single 32-bit word fall back to ``random``.
+    """
+    seeds = np.asarray(seeds, dtype=np.int64)
+    unique_seeds, inverse = np.unique(seeds, return_inverse=True)
+    draws = np.empty(len(unique_seeds), dtype=np.float64)
+
+    fast = (unique_seeds >= 0) & (unique_seeds <= 0xFFFFFFFF)
+    fast_idx = np.flatnonzero(fast)
+    for start in range(0, len(fast_idx), _MT_CHUNK):
+        idx = fast_idx[start:start + _MT_CHUNK]
+        draws[idx] = _mt_first_random(unique_seeds[idx])
+    for idx in np.flatnonzero(~fast):
+        random.seed(int(unique_seeds[idx]))
+        draws[idx] = random.random()
+
+    return (low + (high - low) * draws)[inverse]
+
+
+def round_half_even(values: np.ndarray, decimals: int = 1) -> np.ndarray:
+    """
+    ``round(x, decimals)`` with Python semantics over an array.
+
+    ``np.round`` scales before rounding and can disagree with Python's
+    correctly rounded ``round`` next to a tie, so those few values are
+    re-rounded with ``round``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, decimals)
+    scaled = values * 10 ** decimals
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    for idx in np.flatnonzero(near_tie):
+        rounded[idx] = round(float(values[idx]), decimals)
+    return rounded
+
+
+def _epoch_seconds(times) -> np.ndarray:
+    """``int(Timestamp.timestamp())`` for naive timestamps, as int64 seconds."""
+    times = pd.DatetimeIndex(times)
+    if times.tz is not None:
+        times = times.tz_convert('UTC').tz_localize(None)
+    return times.values.astype('datetime64[s]').astype(np.int64)
+
+
+def estimate_temperature_batch(times) -> np.ndarray:
+    """Batched ``estimate_temperature`` over an array of timestamps."""
+    times = pd.DatetimeIndex(times)
+    month = times.month.values
+    temp_min = TEMP_MIN_BY_MONTH[month]
+    temp_range = TEMP_MAX_BY_MONTH[month] - temp_min
+
+    estimated_temp = temp_min + (temp_range * (TEMP_HOUR_FACTOR[times.hour.values] + 0.5) / 1.5)
+    variation = seeded_uniform(_epoch_seconds(times), -1.5, 1.5)
+    return round_half_even(estimated_temp + variation, 1)
+
+
+def estimate_humidity_batch(times) -> np.ndarray:
+    """Batched ``estimate_humidity`` over an array of timestamps."""
+    times = pd.DatetimeIndex(times)
+    estimated_humidity = (HUMIDITY_BY_MONTH[times.month.values]
+                          * (1 + HUMIDITY_HOUR_FACTOR[times.hour.values]))
+    variation = seeded_uniform(_epoch_seconds(times) + 1, -5, 5)
+    return round_half_even(np.minimum(100, np.maximum(20, estimated_humidity + variation)), 1)
+
+
+def calculate_heat_index_batch(temp_c, humidity) -> np.ndarray:
+    """Vectorized Rothfusz heat index in Celsius (see ``calculate_heat_index``)."""
+    temp_c = np.asarray(temp_c, dtype=np.float64)
+    humidity = np.asarray(humidity, dtype=np.float64)
+    temp_f = temp_c * 9/5 + 32
+
+    hi_f = (-42.379 + 2.04901523 * temp_f + 10.14333127 * humidity
+            - 0.22475541 * temp_f * humidity - 0.00683783 * temp_f**2
+            - 0.05481717 * humidity**2 + 0.00122874 * temp_f**2 * humidity
+            + 0.00085282 * temp_f * humidity**2 - 0.00000199 * temp_f**2 * humidity**2)
+    hi_c = round_half_even((hi_f - 32) * 5/9, 1)
+
+    # No heat index adjustment below 80°F
+    return np.where(temp_f < 80, temp_c, hi_c)
+
+
+def is_ramadan_batch(times) -> np.ndarray:
+    """Batched ``is_ramadan`` using an interval search over ``RAMADAN_PERIODS``."""
+    days = pd.DatetimeIndex(times).values.astype('datetime64[D]')
+    order = np.argsort(RAMADAN_STARTS)
+    starts, ends = RAMADAN_STARTS[order], RAMADAN_ENDS[order]
+
+    idx = np.searchsorted(starts, days, side='right') - 1
+    inside = (idx >= 0) & (days <= ends[np.clip(idx, 0, None)])
+    return inside.astype(np.int64)
+
+
+def season_code_batch(months) -> np.ndarray:
+    """Batched ``get_season_numeric``."""
+    return SEASON_CODE_BY_MONTH[np.asarray(months)]
+
+
+# ============================================================================
+# ADD WEATHER & CONTEXTUAL FEATURES TO DATAFRAME
+# ============================================================================
+@traced('weather.add_weather_features')
+def add_weather_features(df: pd.DataFrame, time_col: str = TIME_COLUMN) -> pd.DataFrame:
+    """
+    Add Temperature_C, Humidity_Pct, Season (+ one-hot), Is_Ramadan and
+    Heat_Index_C columns to a copy of the merged readings.
+    """
+    df_weather = df.copy()
+
+    # Ensure Time column is datetime
+    if not pd.api.types.is_datetime64_any_dtype(df_weather[time_col]):
+        df_weather[time_col] = pd.to_datetime(df_weather[time_col])
+
+    times = df_weather[time_col].values
+    temperature = estimate_temperature_batch(times)
+    humidity = estimate_humidity_batch(times)
+    season_code = season_code_batch(df_weather[time_col].dt.month.values)
+
+    columns = {
+        'Temperature_C': temperature,
+        'Humidity_Pct': humidity,
+        'Season': SEASON_NAMES[season_code],
+        'Season_Code': season_code,
+    }
+    # One-hot encoding for seasons (present seasons only, as pd.get_dummies)
+    for name in sorted(SEASON_NAMES[np.unique(season_code)]):
+        columns[f'Season_{name}'] = season_code == np.flatnonzero(SEASON_NAMES == name)[0]
+    columns['Is_Ramadan'] = is_ramadan_batch(times)
+    columns['Heat_Index_C'] = calculate_heat_index_batch(temperature, humidity)
+
+    df_weather = pd.concat([df_weather, pd.DataFrame(columns, index=df_weather.index)], axis=1)
+
+    print(f"✅ Weather & contextual features added: {df_weather.shape}")
+    print(f"   ├── Temperature: {df_weather['Temperature_C'].min():.1f}°C - {df_weather['Temperature_C'].max():.1f}°C")
+    print(f"   ├── Humidity: {df_weather['Humidity_Pct'].min():.1f}% - {df_weather['Humidity_Pct'].max():.1f}%")
+    print(f"   └── Ramadan records: {int(df_weather['Is_Ramadan'].sum())}")
+    return df_weather
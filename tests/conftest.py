@@ -0,0 +1,26 @@
+"""Shared fixtures: a small synthetic merged-readings frame with gaps."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from load_forecasting.config import TIME_COLUMN
+
+FEEDERS = ['KHBR01_K_LN01_Q0_Y_PH_I', 'KHBR01_K_LN02_Q0_Y_PH_I']
+
+
+@pytest.fixture
+def readings():
+    """Five weeks of two feeders with short gaps, a long gap and dropped hours."""
+    rng = np.random.default_rng(0)
+    times = pd.date_range('2025-03-01', periods=5 * 168, freq='h')
+    hour = times.hour.to_numpy()
+    df = pd.DataFrame({TIME_COLUMN: times})
+    for k, col in enumerate(FEEDERS):
+        daily = 120 + 40 * np.sin(2 * np.pi * (hour - 6) / 24) + 10 * k
+        df[col] = np.round(daily + rng.normal(0, 5, len(times)), 2)
+
+    df.loc[rng.choice(len(df), 60, replace=False), FEEDERS[0]] = np.nan
+    df.loc[400:440, FEEDERS[1]] = np.nan            # longer than the carry limit
+    df.loc[:2, FEEDERS[1]] = np.nan                 # before the first reading
+    return df.drop(index=[100, 101, 102, 600]).reset_index(drop=True)
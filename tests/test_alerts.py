@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from load_forecasting.alerts import FeederLimits, overload_alerts
+from load_forecasting.config import TIME_COLUMN
+
+FEEDERS = ['LN01', 'LN02', 'LN03', 'LN04']
+
+
+def test_overload_alerts_on_a_small_plan():
+    times = pd.date_range('2025-07-01 01:00', periods=6, freq='h')
+    plan = pd.DataFrame({
+        TIME_COLUMN: times,
+        'LN01': [200, 250, 280, 310, 290, 260],   # warning at hour 3, overload at hour 4
+        'LN02': [100, 100, 272, 100, 100, 100],   # warning only, at hour 3
+        'LN03': [20, 20, 20, 20, 20, 20],         # never reaches a level
+        'LN04': [150, 150, 150, 150, 150, 150],
+    })
+    limits = FeederLimits({feeder: 300 for feeder in FEEDERS},
+                          {'LN01': ['LN04'], 'LN02': ['LN03']}, warn_fraction=0.9)
+
+    summary, alerts = overload_alerts(plan, limits)
+    summary = summary.set_index('Feeder')
+
+    assert str(summary['Hours_To_Overload'].dtype) == 'Int64'
+    assert summary['Hours_To_Overload'].tolist() == [4, pd.NA, pd.NA, pd.NA]
+    assert summary['Hours_To_Warning'].tolist() == [3, 3, pd.NA, pd.NA]
+    # LN01's load exceeds LN04's 150 A spare from the first hour; LN02 fits on LN03
+    assert summary['Hours_To_N1_Breach'].tolist() == [1, pd.NA, pd.NA, 1]
+    assert summary.loc['LN01', 'N1_Headroom_A'] == 150 - 310
+
+    assert alerts[['Level', 'Feeder', 'Hours']].values.tolist() == [
+        ['OVERLOAD', 'LN01', 4], ['N-1', 'LN01', 1], ['N-1', 'LN04', 1], ['WARNING', 'LN02', 3]]
+    assert alerts['From'].tolist() == [times[3], times[0], times[0], times[2]]
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from load_forecasting.config import DATE_FORMAT_INPUT, TIME_COLUMN
+from load_forecasting.data import (TimeSeriesDataLoader, load_and_merge_datasets,
+                                   stream_merge_readings)
+
+FEEDERS = ['KHBR01_K_LN01_Q0_Y_PH_I', 'KHBR01_K_LN02_Q0_Y_PH_I']
+
+
+def _write_export(path, times, offset):
+    rng = np.random.default_rng(len(times))
+    df = pd.DataFrame({TIME_COLUMN: times.strftime(DATE_FORMAT_INPUT)})
+    for col in FEEDERS:
+        df[col] = np.round(rng.uniform(20, 200, len(times)) + offset, 2)
+    with open(path, 'w') as f:
+        f.write(',PS:AL KHABOURAH 01,\n')
+        df.to_csv(f, index=False)
+
+
+def test_stream_merge_matches_in_memory_merge_on_overlap(tmp_path):
+    first, second = tmp_path / 'a.csv', tmp_path / 'b.csv'
+    _write_export(first, pd.date_range('2025-03-01', periods=1500, freq='h'), 0)
+    _write_export(second, pd.date_range('2025-04-12', periods=1500, freq='h'), 1000)
+
+    loader = TimeSeriesDataLoader(TIME_COLUMN, DATE_FORMAT_INPUT)
+    in_memory = load_and_merge_datasets(str(first), str(second), loader).reset_index(drop=True)
+    streamed = pd.concat(stream_merge_readings([str(first), str(second)], chunksize=128),
+                         ignore_index=True)
+
+    overlap = in_memory[TIME_COLUMN] < pd.Timestamp('2025-05-02 12:00')
+    assert (in_memory.loc[overlap, FEEDERS] < 1000).all().all()
+    pd.testing.assert_frame_equal(in_memory, streamed, check_dtype=False)
@@ -0,0 +1,108 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from load_forecasting.config import IMPUTE_MAX_CARRY_HOURS, TEMPORAL_FEATURES, TIME_COLUMN
+from load_forecasting.data import reindex_hourly
+from load_forecasting.features import (FeatureEngineer, OnlineFeatureState, build_feature_matrix,
+                                       feature_matrix_columns, impute_gaps)
+
+from conftest import FEEDERS
+
+LAGS = [1, 2, 24, 168]
+WINDOWS = [6, 24]
+
+
+def quietly(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def reference_gap_fill(times: pd.DatetimeIndex, values: np.ndarray) -> np.ndarray:
+    """impute_gaps written as a loop over every missing cell."""
+    filled = values.copy()
+    how = times.dayofweek * 24 + times.hour
+    for c in range(values.shape[1]):
+        last = None
+        for r in range(len(values)):
+            if not np.isnan(values[r, c]):
+                last = r
+                continue
+            if last is None:
+                continue
+            if r - last <= IMPUTE_MAX_CARRY_HOURS:
+                filled[r, c] = values[last, c]
+                continue
+            total, count = 0.0, 0
+            for k in range(r % 168, r, 168):
+                if how[k] == how[r] and not np.isnan(values[k, c]):
+                    total += values[k, c]
+                    count += 1
+            filled[r, c] = total / count if count else values[last, c]
+    return np.round(filled, 3)
+
+
+def test_impute_gaps_equals_a_per_gap_loop(readings):
+    df, mask = quietly(impute_gaps, readings, FEEDERS)
+    grid = reindex_hourly(readings)
+    values = grid[FEEDERS].to_numpy(dtype=np.float64)
+
+    expected = reference_gap_fill(pd.DatetimeIndex(grid[TIME_COLUMN]), values)
+    assert np.array_equal(df[FEEDERS].to_numpy(), expected, equal_nan=True)
+    assert np.array_equal(mask, np.isnan(values))
+
+
+def test_feature_matrix_equals_pandas_shift_and_rolling(readings):
+    values = readings[FEEDERS]
+    matrix, columns = build_feature_matrix(values.to_numpy(), FEEDERS, LAGS, WINDOWS,
+                                           dtype=np.float64)
+    assert columns == feature_matrix_columns(FEEDERS, LAGS, WINDOWS)
+
+    expected = {}
+    for col in FEEDERS:
+        for lag in LAGS:
+            expected[f'{col}_lag_{lag}'] = values[col].shift(lag)
+        for window in WINDOWS:
+            expected[f'{col}_rolling_mean_{window}'] = values[col].rolling(window).mean()
+            expected[f'{col}_rolling_std_{window}'] = values[col].rolling(window).std()
+    expected = pd.DataFrame(expected)[columns].to_numpy()
+
+    assert np.array_equal(np.isnan(matrix), np.isnan(expected))
+    lag_cols = [j for j, name in enumerate(columns) if '_lag_' in name]
+    assert np.array_equal(matrix[:, lag_cols], expected[:, lag_cols], equal_nan=True)
+    np.testing.assert_allclose(matrix, expected, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('warm_rows', [0, 500])
+def test_online_state_reproduces_the_batch_rows(readings, warm_rows):
+    grid = reindex_hourly(readings)
+    imputed, _ = quietly(impute_gaps, readings, FEEDERS)
+    matrix, columns = build_feature_matrix(imputed[FEEDERS].to_numpy(), FEEDERS, LAGS, WINDOWS,
+                                           dtype=np.float64)
+
+    if warm_rows:
+        history = grid.iloc[:warm_rows]
+        state = quietly(OnlineFeatureState.from_history, history, FEEDERS, LAGS, WINDOWS)
+        state = OnlineFeatureState.from_dict(state.to_dict())
+    else:
+        state = OnlineFeatureState(FEEDERS, LAGS, WINDOWS)
+    assert state.columns == TEMPORAL_FEATURES + columns
+
+    # The stream skips the hours dropped from the raw readings
+    stream = readings[pd.to_datetime(readings[TIME_COLUMN]) >= grid[TIME_COLUMN].iloc[warm_rows]]
+    rows = pd.Index(grid[TIME_COLUMN]).get_indexer(stream[TIME_COLUMN])
+    online = np.array([state.update(t, v) for t, v in
+                       zip(stream[TIME_COLUMN], stream[FEEDERS].to_numpy(dtype=np.float64))])
+
+    n_time = len(TEMPORAL_FEATURES)
+    calendar = FeatureEngineer.create_time_features(grid.iloc[rows], TIME_COLUMN)
+    assert np.array_equal(online[:, :n_time],
+                          calendar[TEMPORAL_FEATURES].to_numpy(dtype=np.float64))
+    lag_cols = [n_time + j for j, name in enumerate(columns) if '_lag_' in name]
+    assert np.array_equal(online[:, lag_cols], matrix[rows][:, [j - n_time for j in lag_cols]],
+                          equal_nan=True)
+    assert np.array_equal(np.isnan(online[:, n_time:]), np.isnan(matrix[rows]))
+    np.testing.assert_allclose(online[:, n_time:], matrix[rows], rtol=0, atol=1e-8)
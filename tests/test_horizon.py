@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from load_forecasting.data import reindex_hourly
+from load_forecasting.horizon import DirectMultiHorizonForecaster
+
+from conftest import FEEDERS
+
+PARAMS = {'n_estimators': 20, 'max_depth': 3, 'random_state': 42, 'n_jobs': 1}
+
+
+def test_plan_round_trip_and_training_fill(readings, tmp_path):
+    df = reindex_hourly(readings)
+    split = 3 * 168
+    forecaster = DirectMultiHorizonForecaster(params=PARAMS, imputation='mean')
+    forecaster.fit(df.iloc[:split], FEEDERS)
+
+    assert ((forecaster.model_weight >= 0) & (forecaster.model_weight <= 1)).all()
+    np.testing.assert_array_equal(
+        forecaster.fill_values, np.round(df.iloc[:split][FEEDERS].mean().to_numpy(), 3))
+
+    path = tmp_path / 'dayahead.json'
+    forecaster.save(str(path))
+    loaded = DirectMultiHorizonForecaster.load(str(path))
+    plan = forecaster.predict(df)
+    pd.testing.assert_frame_equal(plan, loaded.predict(df))
+    assert list(plan.columns) == ['Time', 'Horizon'] + FEEDERS and len(plan) == 24
+
+    origin = len(df) - 25
+    _, y_pred, y_model, y_naive = forecaster.predict_origins(df, np.array([origin]),
+                                                              components=True)
+    weight = forecaster.model_weight[None, :, None]
+    np.testing.assert_allclose(y_pred, weight * y_model + (1 - weight) * y_naive)
+    np.testing.assert_allclose(y_pred[0], forecaster.predict(df, origin=origin)[FEEDERS],
+                               atol=5e-4)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from load_forecasting.config import TIME_COLUMN
+from load_forecasting.matrix import FeatureMatrix
+
+FEATURES = ['hour', 'LN01_lag_1', 'LN01_rolling_mean_6']
+
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.feather', '.csv'])
+def test_observed_rows_are_dropped_while_loading(tmp_path, suffix):
+    rng = np.random.default_rng(5)
+    n = 1000
+    df = pd.DataFrame({TIME_COLUMN: pd.date_range('2025-03-01', periods=n, freq='h'),
+                       'LN01': rng.normal(100, 10, n)})
+    for col in FEATURES:
+        df[col] = rng.normal(0, 1, n)
+    df.loc[rng.random(n) < 0.2, 'LN01'] = np.nan
+
+    path = str(tmp_path / f'features{suffix}')
+    if suffix == '.parquet':
+        df.to_parquet(path, row_group_size=128)
+    elif suffix == '.feather':
+        df.to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+
+    expected = FeatureMatrix.from_file(path, 'LN01', FEATURES).observed()
+    fm = FeatureMatrix.from_file(path, 'LN01', FEATURES, observed=True)
+
+    assert fm.n_rows == df['LN01'].notna().sum()
+    np.testing.assert_array_equal(fm.X, expected.X)
+    np.testing.assert_array_equal(fm.y, expected.y)
+    assert fm.times.equals(expected.times)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from load_forecasting.quality import flatline_mask, low_level_mask, rolling_median_mad
+
+
+def test_rolling_median_mad_matches_pandas_and_a_mad_loop():
+    rng = np.random.default_rng(2)
+    values = rng.normal(100, 20, (300, 3)).astype(np.float32)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    half = 5
+
+    median, mad, count = rolling_median_mad(values, half, n_threads=2)
+
+    expected = (pd.DataFrame(values).rolling(2 * half + 1, center=True, min_periods=1)
+                .median().to_numpy())
+    np.testing.assert_allclose(median, expected, rtol=1e-6)
+    for i in range(len(values)):
+        window = values[max(0, i - half):i + half + 1]
+        for j in range(values.shape[1]):
+            observed = window[~np.isnan(window[:, j]), j]
+            assert count[i, j] == len(observed)
+            if len(observed):
+                assert mad[i, j] == np.median(np.abs(observed - median[i, j]))
+
+
+def test_flatline_mask_matches_a_run_loop():
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 3, (400, 2)).astype(float)
+    values[rng.random(values.shape) < 0.05] = np.nan
+    min_hours = 3
+
+    expected = np.zeros(values.shape, dtype=bool)
+    for j in range(values.shape[1]):
+        start = 0
+        for i in range(1, len(values) + 1):
+            if i == len(values) or not values[i, j] == values[i - 1, j]:
+                if i - start >= min_hours and not np.isnan(values[start, j]):
+                    expected[start:i, j] = True
+                start = i
+
+    np.testing.assert_array_equal(flatline_mask(values, min_hours), expected)
+
+
+def test_low_level_mask_flags_a_feeder_far_below_its_peers():
+    rng = np.random.default_rng(4)
+    values = rng.normal(60, 5, (600, 4))
+    values[:300, 3] = rng.normal(5, 1, 300)  # a few amps, then back at its peers' level
+    values[:300, 2] = rng.normal(30, 3, 300)  # low, but a plausible share of its peers
+
+    low = low_level_mask(values, half_window=24, ratio=0.2)
+
+    assert low[:276, 3].all() and not low[324:, 3].any()
+    assert not low[:, :3].any()
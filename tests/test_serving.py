@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from load_forecasting.config import TEMPORAL_FEATURES, TIME_COLUMN
+from load_forecasting.features import build_feature_matrix, build_features
+from load_forecasting.serving import LatestHourFeatures
+
+from conftest import FEEDERS
+
+LAGS = [1, 2, 24, 168]
+WINDOWS = [6, 24]
+
+
+@pytest.mark.parametrize('target', FEEDERS)
+def test_latest_hour_row_equals_batch_features(readings, target):
+    batch = build_features(readings, target, LAGS, WINDOWS)
+    _, columns = build_feature_matrix(np.empty((0, 1)), [target], LAGS, WINDOWS)
+    features = LatestHourFeatures(target, LAGS, WINDOWS, imputation='gap')
+
+    for end in [300, 450, len(readings) - 1]:
+        history = readings.iloc[:end + 1]
+        timestamp, row = features(history[TIME_COLUMN].astype(str).tolist(),
+                                  history[target].tolist())
+        expected = batch.loc[batch[TIME_COLUMN] == timestamp, TEMPORAL_FEATURES + columns]
+        np.testing.assert_array_equal(row, expected.to_numpy(dtype=np.float64)[0])
+
+
+def _bundle(feature_names, imputation=None):
+    from sklearn.linear_model import LinearRegression
+
+    from load_forecasting.bundle import ModelBundle
+
+    X = np.random.default_rng(0).normal(size=(50, len(feature_names)))
+    return ModelBundle(LinearRegression().fit(X, X.sum(axis=1)), feature_names, FEEDERS[0],
+                       imputation=imputation)
+
+
+def test_service_uses_the_bundle_imputation_and_checks_the_layout():
+    from load_forecasting.serving import InferenceService
+
+    _, columns = build_feature_matrix(np.empty((0, 1)), [FEEDERS[0]], LAGS, WINDOWS)
+    service = InferenceService(_bundle(TEMPORAL_FEATURES + columns, 'mean'))
+    assert service.features.imputation == 'mean'
+    assert InferenceService(_bundle(TEMPORAL_FEATURES + columns, 'mean'),
+                            imputation='gap').features.imputation == 'gap'
+
+    reordered = TEMPORAL_FEATURES + columns[1:] + columns[:1]
+    with pytest.raises(ValueError, match='do not match the served row'):
+        InferenceService(_bundle(reordered))
+    with pytest.raises(ValueError, match='not built by serve: Temperature_C'):
+        InferenceService(_bundle(TEMPORAL_FEATURES + columns + ['Temperature_C']))
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from load_forecasting.significance import adjust_pvalues, block_bootstrap_sums
+
+
+@pytest.mark.parametrize('block_length', [1, 24, 50])
+def test_block_bootstrap_sums_match_explicit_gathering(block_length):
+    values = np.random.default_rng(6).normal(size=(3, 230))
+    n = values.shape[1]
+    n_blocks = -(-n // block_length)
+
+    sums = block_bootstrap_sums(values, n_resamples=40, block_length=block_length, seed=11)
+
+    starts = np.random.default_rng(11).integers(0, n - block_length + 1, size=(40, n_blocks))
+    for r, row in enumerate(starts):
+        index = np.concatenate([np.arange(start, start + block_length) for start in row])[:n]
+        np.testing.assert_allclose(sums[:, r], values[:, index].sum(axis=1), rtol=1e-12)
+
+
+def test_adjust_pvalues_by_hand():
+    p = [0.01, 0.04, 0.03, 0.005]
+    # Holm: sorted 0.005, 0.01, 0.03, 0.04 times 4, 3, 2, 1, then running maximum
+    np.testing.assert_allclose(adjust_pvalues(p, 'holm'), [0.03, 0.06, 0.06, 0.02])
+    # BH: sorted p * 4 / rank = 0.02, 0.02, 0.04, 0.04, then running minimum from the top
+    np.testing.assert_allclose(adjust_pvalues(p, 'fdr_bh'), [0.02, 0.04, 0.04, 0.02])
+    np.testing.assert_allclose(adjust_pvalues(p, 'bonferroni'), [0.04, 0.16, 0.12, 0.02])
+    np.testing.assert_allclose(adjust_pvalues([0.5, 0.6], 'holm'), [1.0, 1.0])
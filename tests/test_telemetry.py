@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+
+from load_forecasting import telemetry
+
+
+@pytest.fixture
+def sink():
+    sink = telemetry.MemorySink()
+    telemetry.configure([sink])
+    yield sink
+    telemetry.disable()
+
+
+def test_fit_seconds_roll_up_to_every_ancestor(sink):
+    with telemetry.span('run'):
+        with telemetry.span('stage'):
+            with telemetry.span('fit', fit=True):
+                time.sleep(0.01)
+            with telemetry.span('fit', fit=True):
+                time.sleep(0.01)
+        with telemetry.span('other'):
+            pass
+
+    records = {record['name']: record for record in sink.records}
+    fits = [record for record in sink.records if record['name'] == 'fit']
+    fit_total = sum(record['seconds'] for record in fits)
+    assert len(fits) == 2
+    assert records['stage']['fit_seconds'] == pytest.approx(fit_total, abs=1e-5)
+    assert records['run']['fit_seconds'] == pytest.approx(fit_total, abs=1e-5)
+    assert records['other']['fit_seconds'] == 0
+    assert records['stage']['parent'] == records['run']['span']
+
+
+def test_traced_records_shapes_and_errors(sink):
+    import numpy as np
+
+    @telemetry.traced('double')
+    def double(values):
+        return np.concatenate([values, values])
+
+    @telemetry.traced('fail')
+    def fail():
+        raise ValueError("boom")
+
+    double(np.zeros((4, 3)))
+    with pytest.raises(ValueError):
+        fail()
+
+    first, second = sink.records
+    assert (first['rows_in'], first['cols_in'], first['rows_out']) == (4, 3, 8)
+    assert second['status'] == 'error' and 'boom' in second['error']
+
+
+def test_load_records_rejects_other_json_lines(tmp_path, sink):
+    with telemetry.span('run'):
+        pass
+    span_line = json.dumps(sink.records[0])
+
+    trials = tmp_path / 'trials.jsonl'
+    trials.write_text('{"search": {"model": "XGBoost"}}\n{"trial": 0, "rung": 0}\n')
+    with pytest.raises(ValueError, match='not a telemetry file'):
+        telemetry.load_records(str(trials))
+
+    mixed = tmp_path / 'telemetry.jsonl'
+    mixed.write_text(span_line + '\n{"trial": 0}\n' + span_line[:20])
+    assert telemetry.load_records(str(mixed)) == [sink.records[0]]
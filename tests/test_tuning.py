@@ -0,0 +1,17 @@
+import json
+
+from load_forecasting.tuning import _load_trials
+
+SEARCH = {'model': 'XGBoost', 'data': 'abc'}
+
+
+def test_resume_truncates_a_cut_short_line(tmp_path):
+    path = tmp_path / 'trials.jsonl'
+    record = {'trial': 0, 'rung': 0, 'mae': 4.2}
+    path.write_text(json.dumps({'search': SEARCH}) + '\n' + json.dumps(record) + '\n'
+                    + '{"trial": 1, "ru')
+
+    assert _load_trials(str(path), SEARCH) == {(0, 0): record}
+    with open(path, 'a') as f:
+        f.write(json.dumps({**record, 'trial': 1}) + '\n')
+    assert set(_load_trials(str(path), SEARCH)) == {(0, 0), (1, 0)}
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from load_forecasting.weather import (calculate_heat_index, calculate_heat_index_batch,
+                                      estimate_humidity, estimate_humidity_batch,
+                                      estimate_temperature, estimate_temperature_batch,
+                                      get_season_numeric, is_ramadan, is_ramadan_batch,
+                                      season_code_batch)
+
+
+def test_batch_weather_is_bit_identical_to_the_scalar_functions():
+    times = pd.date_range('2024-01-01', '2026-01-01', freq='h')
+    temperature = estimate_temperature_batch(times)
+    humidity = estimate_humidity_batch(times)
+
+    assert np.array_equal(temperature, [estimate_temperature(t) for t in times])
+    assert np.array_equal(humidity, [estimate_humidity(t) for t in times])
+    assert np.array_equal(calculate_heat_index_batch(temperature, humidity),
+                          [calculate_heat_index(t, h) for t, h in zip(temperature, humidity)])
+    assert np.array_equal(is_ramadan_batch(times), [is_ramadan(t) for t in times])
+    assert np.array_equal(season_code_batch(times.month),
+                          [get_season_numeric(m) for m in times.month])